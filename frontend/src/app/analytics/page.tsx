@@ -3,11 +3,15 @@
 import { AreaChart, Card } from "@tremor/react";
 import { useEffect, useMemo, useState } from "react";
 import { PageHeader } from "@/components/ui/page-header";
+import { fetchGraphQL } from "@/lib/graphql";
 
 type MonthlyTotal = {
   month: string;
   total: number;
   percentage: number;
+  runningTotal: number;
+  inflow: number;
+  outflow: number;
 };
 
 type BankTransaction = {
@@ -19,11 +23,17 @@ type BankTransaction = {
 };
 
 const ANALYTICS_QUERY = `
-  query Analytics($startDate: Date) {
-    monthlyTotals {
-      month
+  query Analytics($startDate: Date, $seriesStart: Date) {
+    volume: timeSeries(granularity: MONTH, startDate: $seriesStart) {
+      period
+      total
+      share
+      runningTotal
+    }
+    flows: timeSeries(granularity: MONTH, startDate: $seriesStart, splitDirection: true) {
+      period
+      direction
       total
-      percentage
     }
     bankTransactions(startDate: $startDate) {
       accountName
@@ -87,12 +97,17 @@ const normalizeDirection = (
   return 0;
 };
 
-type GraphQLMonthlyTotal = {
-  month?: string | null;
+type GraphQLTimeSeriesPoint = {
+  period?: string | null;
+  direction?: number | null;
   total?: number | string | null;
-  percentage?: number | string | null;
+  share?: number | string | null;
+  runningTotal?: number | string | null;
 };
 
+const toNumber = (value: number | string | null | undefined) =>
+  typeof value === "number" ? value : parseFloat(value ?? "0");
+
 type GraphQLTransaction = {
   accountName?: string | null;
   textCreditor?: string | null;
@@ -132,15 +147,15 @@ export default function AnalyticsPage() {
         startDate.setMonth(startDate.getMonth() - 3);
         const startDateFormatted = startDate.toISOString().split("T")[0];
 
-        const response = await fetch("http://127.0.0.1:8000/graphql/", {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-          },
-          body: JSON.stringify({
-            query: ANALYTICS_QUERY,
-            variables: { startDate: startDateFormatted },
-          }),
+        // Twelve whole months, the current one included
+        const seriesStart = new Date();
+        seriesStart.setDate(1);
+        seriesStart.setMonth(seriesStart.getMonth() - 11);
+        const seriesStartFormatted = seriesStart.toISOString().split("T")[0];
+
+        const response = await fetchGraphQL(ANALYTICS_QUERY, {
+          startDate: startDateFormatted,
+          seriesStart: seriesStartFormatted,
         });
 
         if (!response.ok) {
@@ -155,24 +170,34 @@ export default function AnalyticsPage() {
           );
         }
 
-        const rawMonthly = Array.isArray(result.data?.monthlyTotals)
-          ? result.data.monthlyTotals
+        const rawVolume: GraphQLTimeSeriesPoint[] = Array.isArray(result.data?.volume)
+          ? result.data.volume
+          : [];
+        const rawFlows: GraphQLTimeSeriesPoint[] = Array.isArray(result.data?.flows)
+          ? result.data.flows
           : [];
         const rawTransactions = Array.isArray(result.data?.bankTransactions)
           ? result.data.bankTransactions
           : [];
 
-        const normalizedMonthly: MonthlyTotal[] = rawMonthly
-          .map((item: GraphQLMonthlyTotal) => ({
-            month: item?.month ?? "",
-            total:
-              typeof item?.total === "number"
-                ? item.total
-                : parseFloat(item?.total ?? "0"),
-            percentage:
-              typeof item?.percentage === "number"
-                ? item.percentage
-                : parseFloat(item?.percentage ?? "0"),
+        // Both series are zero-filled per month, so they line up by period
+        const flowsByPeriod = new Map<string, { inflow: number; outflow: number }>();
+        rawFlows.forEach((item) => {
+          if (!item?.period) return;
+          const flow = flowsByPeriod.get(item.period) ?? { inflow: 0, outflow: 0 };
+          if (item.direction === 1) flow.inflow = toNumber(item.total);
+          if (item.direction === 2) flow.outflow = toNumber(item.total);
+          flowsByPeriod.set(item.period, flow);
+        });
+
+        const normalizedMonthly: MonthlyTotal[] = rawVolume
+          .map((item) => ({
+            month: item?.period ?? "",
+            total: toNumber(item?.total),
+            percentage: toNumber(item?.share),
+            runningTotal: toNumber(item?.runningTotal),
+            inflow: flowsByPeriod.get(item?.period ?? "")?.inflow ?? 0,
+            outflow: flowsByPeriod.get(item?.period ?? "")?.outflow ?? 0,
           }))
           .filter((item) => item.month && Number.isFinite(item.total));
 
@@ -220,7 +245,8 @@ export default function AnalyticsPage() {
     () =>
       monthlyTotals.map((item) => ({
         month: formatMonthLabel(item.month),
-        total: item.total,
+        Inflow: item.inflow,
+        Outflow: item.outflow,
       })),
     [monthlyTotals],
   );
@@ -645,7 +671,7 @@ export default function AnalyticsPage() {
                     Monthly trend
                   </h2>
                   <p className="text-sm text-gray-500">
-                    Rolling volume for the past periods
+                    Inflows and outflows over the past twelve months
                   </p>
                 </div>
               </div>
@@ -653,9 +679,8 @@ export default function AnalyticsPage() {
                 className="mt-6 h-64"
                 data={chartData}
                 index="month"
-                categories={["total"]}
-                colors={["#628447"]}
-                showLegend={false}
+                categories={["Inflow", "Outflow"]}
+                colors={["#628447", "#b45309"]}
                 valueFormatter={(value) => formatCurrency(value)}
                 startEndOnly
                 showYAxis={false}
@@ -679,6 +704,7 @@ export default function AnalyticsPage() {
                       <th className="px-4 py-2">Month</th>
                       <th className="px-4 py-2 text-right">Volume</th>
                       <th className="px-4 py-2 text-right">Share</th>
+                      <th className="px-4 py-2 text-right">Cumulative</th>
                     </tr>
                   </thead>
                   <tbody className="divide-y divide-gray-200">
@@ -693,12 +719,15 @@ export default function AnalyticsPage() {
                         <td className="px-4 py-2 text-right text-gray-500">
                           {item.percentage.toFixed(1)}%
                         </td>
+                        <td className="px-4 py-2 text-right text-gray-500">
+                          {formatCurrency(item.runningTotal)}
+                        </td>
                       </tr>
                     ))}
                     {!monthlyTotals.length && (
                       <tr>
                         <td
-                          colSpan={3}
+                          colSpan={4}
                           className="px-4 py-6 text-center text-gray-500"
                         >
                           No monthly data available yet.
@@ -5,6 +5,7 @@ import { PageHeader } from "@/components/ui/page-header";
 import PieChart from "@/components/ui/pie-chart";
 import StatsCard from "@/components/ui/stats-card";
 import WorldMap from "@/components/ui/world-map";
+import { fetchGraphQL } from "@/lib/graphql";
 
 const COUNTRIES_QUERY = `
   query countries {
@@ -46,15 +47,7 @@ export default function Home() {
   useEffect(() => {
     const fetchCountryData = async () => {
       try {
-        const response = await fetch("http://127.0.0.1:8000/graphql/", {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-          },
-          body: JSON.stringify({
-            query: COUNTRIES_QUERY,
-          }),
-        });
+        const response = await fetchGraphQL(COUNTRIES_QUERY);
 
         if (!response.ok) {
           throw new Error("Failed to fetch country data");
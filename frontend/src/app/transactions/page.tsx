@@ -29,10 +29,18 @@ interface GraphQLBankTransaction {
 
 interface GraphQLResponse {
   data?: {
-    bankTransactions: GraphQLBankTransaction[]
+    bankTransactionsConnection: {
+      edges: { node: GraphQLBankTransaction }[]
+      pageInfo: {
+        hasNextPage: boolean
+        endCursor: string | null
+      }
+    }
   }
 }
 
+const PAGE_SIZE = 50
+
 const getInitials = (value: string) => {
   const trimmed = value.trim()
   if (!trimmed) return '?'
@@ -44,79 +52,100 @@ export default function TransactionsPage() {
   const [transactions, setTransactions] = useState<BankTransaction[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
-
-  useEffect(() => {
-    const fetchTransactions = async () => {
-      try {
-        const response = await fetch('http://127.0.0.1:8000/graphql/', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            query: `
-              query Transaction {
-                bankTransactions(accountName: "") {
-                  accountName
-                  textCreditor
-                  amount
-                  valDate
-                  direction
-                  logo {
-                    url
-                    name
+  const [endCursor, setEndCursor] = useState<string | null>(null)
+  const [hasNextPage, setHasNextPage] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
+
+  const fetchTransactions = async (after: string | null) => {
+    try {
+      const response = await fetch('http://127.0.0.1:8000/graphql/', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+          query: `
+            query Transaction($first: Int, $after: String) {
+              bankTransactionsConnection(first: $first, after: $after) {
+                edges {
+                  node {
+                    accountName
+                    textCreditor
+                    amount
+                    valDate
+                    direction
+                    logo {
+                      url
+                      name
+                    }
                   }
                 }
+                pageInfo {
+                  hasNextPage
+                  endCursor
+                }
               }
-            `
-          })
+            }
+          `,
+          variables: { first: PAGE_SIZE, after },
         })
+      })
 
-        if (!response.ok) {
-          throw new Error('Failed to fetch transactions')
-        }
-
-        const payload: GraphQLResponse = await response.json()
-
-        const mappedTransactions: BankTransaction[] = (payload.data?.bankTransactions ?? [])
-          .map((transaction) => {
-            const direction = transaction.direction
-            const amount = transaction.amount
-
-            return {
-              accountName: transaction.accountName?.trim() ?? '',
-              textCreditor: transaction.textCreditor?.trim() ?? '',
-              amount:
-                typeof amount === 'number'
-                  ? amount.toString()
-                  : (amount ?? ''),
-              valDate: transaction.valDate ?? '',
-              direction: direction !== undefined && direction !== null
-                ? String(direction)
-                : '',
-              logoUrl: transaction.logo?.url ?? null,
-              logoName: transaction.logo?.name ?? null,
-            }
-          })
-          .filter(transaction =>
-            transaction.accountName &&
-            transaction.textCreditor &&
-            transaction.amount &&
-            transaction.valDate &&
-            transaction.direction
-          )
-
-        setTransactions(mappedTransactions)
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Unknown error')
-      } finally {
-        setLoading(false)
+      if (!response.ok) {
+        throw new Error('Failed to fetch transactions')
       }
+
+      const payload: GraphQLResponse = await response.json()
+
+      const connection = payload.data?.bankTransactionsConnection
+      const mappedTransactions: BankTransaction[] = (connection?.edges ?? [])
+        .map(({ node: transaction }) => {
+          const direction = transaction.direction
+          const amount = transaction.amount
+
+          return {
+            accountName: transaction.accountName?.trim() ?? '',
+            textCreditor: transaction.textCreditor?.trim() ?? '',
+            amount:
+              typeof amount === 'number'
+                ? amount.toString()
+                : (amount ?? ''),
+            valDate: transaction.valDate ?? '',
+            direction: direction !== undefined && direction !== null
+              ? String(direction)
+              : '',
+            logoUrl: transaction.logo?.url ?? null,
+            logoName: transaction.logo?.name ?? null,
+          }
+        })
+        .filter(transaction =>
+          transaction.accountName &&
+          transaction.textCreditor &&
+          transaction.amount &&
+          transaction.valDate &&
+          transaction.direction
+        )
+
+      setTransactions((previous) => after ? [...previous, ...mappedTransactions] : mappedTransactions)
+      setEndCursor(connection?.pageInfo.endCursor ?? null)
+      setHasNextPage(connection?.pageInfo.hasNextPage ?? false)
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Unknown error')
+    } finally {
+      setLoading(false)
+      setLoadingMore(false)
     }
+  }
 
-    fetchTransactions()
+  useEffect(() => {
+    fetchTransactions(null)
   }, [])
 
+  const loadMore = () => {
+    setLoadingMore(true)
+    fetchTransactions(endCursor)
+  }
+
   return (
     <div className="space-y-8 px-6 py-8">
       <PageHeader
@@ -178,6 +207,16 @@ export default function TransactionsPage() {
               </div>
             </div>
           ))}
+          {hasNextPage && (
+            <button
+              type="button"
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="rounded-lg border bg-white px-4 py-2 text-sm font-semibold text-gray-700 shadow-sm disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -4,6 +4,7 @@ import { useState, useEffect } from 'react';
 import { Card, DonutChart, List, ListItem } from "@tremor/react";
 
 import { cn } from "@/lib/utils";
+import { fetchGraphQL } from '@/lib/graphql';
 
 export interface ExpenseCategory {
   name: string;
@@ -56,15 +57,7 @@ export default function PieChart({
   useEffect(() => {
     const fetchCategoryData = async () => {
       try {
-        const response = await fetch('http://127.0.0.1:8000/graphql/', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            query: TOTAL_CATEGORY_QUERY,
-          }),
-        });
+        const response = await fetchGraphQL(TOTAL_CATEGORY_QUERY);
         
         const result = await response.json();
         
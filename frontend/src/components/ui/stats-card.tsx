@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import { AreaChart, Card } from '@tremor/react';
+import { fetchGraphQL } from '@/lib/graphql';
 
 function classNames(...classes) {
   return classes.filter(Boolean).join(' ');
@@ -48,15 +49,7 @@ export default function StatsCard() {
   useEffect(() => {
     const fetchMonthlyData = async () => {
       try {
-        const response = await fetch('http://127.0.0.1:8000/graphql/', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            query: MONTHLY_QUERY,
-          }),
-        });
+        const response = await fetchGraphQL(MONTHLY_QUERY);
         
         const result = await response.json();
         
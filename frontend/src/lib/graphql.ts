@@ -0,0 +1,100 @@
+export const GRAPHQL_URL = 'http://127.0.0.1:8000/graphql/'
+
+// Requests issued within this window are sent together as one batch
+const BATCH_WINDOW_MS = 10
+
+type Operation = {
+  query: string
+  variables?: Record<string, unknown>
+  resolve: (response: Response) => void
+  reject: (error: unknown) => void
+}
+
+type OperationResult = {
+  status?: number
+  errors?: { extensions?: { code?: string } }[]
+}
+
+let queue: Operation[] = []
+
+const sha256 = async (text: string) => {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text))
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('')
+}
+
+const post = (body: unknown) =>
+  fetch(GRAPHQL_URL, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(body),
+  })
+
+const isPersistedQueryNotFound = (result: OperationResult) =>
+  result.errors?.some((error) => error.extensions?.code === 'PERSISTED_QUERY_NOT_FOUND') ?? false
+
+// Sends the operations as one array; each one gets its own Response back
+const sendBatch = async (
+  bodies: Record<string, unknown>[],
+): Promise<{ result: OperationResult | null; response: Response }[]> => {
+  const response = await post(bodies)
+  const results = await response.clone().json().catch(() => null)
+  if (!Array.isArray(results)) {
+    // The whole batch was refused (e.g. too many operations)
+    return bodies.map(() => ({ result: null, response: response.clone() }))
+  }
+  return results.map((result: OperationResult) => ({
+    result,
+    response: new Response(JSON.stringify(result), {
+      status: result.status ?? response.status,
+      headers: { 'Content-Type': 'application/json' },
+    }),
+  }))
+}
+
+const flush = async () => {
+  const operations = queue
+  queue = []
+
+  try {
+    // Only hashes are sent first (persisted queries); unknown ones are resent with their text
+    const hashes = globalThis.crypto?.subtle
+      ? await Promise.all(operations.map(({ query }) => sha256(query)))
+      : null
+    const bodies = operations.map(({ query, variables }, index) =>
+      hashes
+        ? { variables, extensions: { persistedQuery: { version: 1, sha256Hash: hashes[index] } } }
+        : { query, variables },
+    )
+
+    const first = await sendBatch(bodies)
+    const retry = first.flatMap(({ result }, index) =>
+      result && isPersistedQueryNotFound(result) ? [index] : [],
+    )
+    const second = retry.length
+      ? await sendBatch(retry.map((index) => ({ ...bodies[index], query: operations[index].query })))
+      : []
+
+    operations.forEach((operation, index) => {
+      const retried = retry.indexOf(index)
+      const entry = retried === -1 ? first[index] : second[retried]
+      operation.resolve(entry.response)
+    })
+  } catch (error) {
+    operations.forEach((operation) => operation.reject(error))
+  }
+}
+
+// Widgets on the same page call this independently; their requests are
+// coalesced into one batched POST that the server answers with an array.
+export function fetchGraphQL(query: string, variables?: Record<string, unknown>): Promise<Response> {
+  return new Promise((resolve, reject) => {
+    queue.push({ query, variables, resolve, reject })
+    if (queue.length === 1) {
+      setTimeout(flush, BATCH_WINDOW_MS)
+    }
+  })
+}
@@ -1,8 +1,11 @@
 import graphene
 from graphene_django import DjangoObjectType
 from ai_manager.models import Preference
+from sgkb.graphql.loaders import related_resolver
 
 class PreferenceType(DjangoObjectType):
     class Meta:
         model = Preference
 
+    resolve_category = related_resolver("category")
+
@@ -3,6 +3,7 @@ from collections import defaultdict
 from typing import Any
 from agents import function_tool, RunContextWrapper
 from finance.utils import TransactionFilter
+from finance.utils.query_plans import hot_query
 from asgiref.sync import sync_to_async
 from decimal import Decimal
 from finance.models import BankTransaction, Partners, Recommendation
@@ -16,6 +17,7 @@ from ai_manager.models import Preference
 @function_tool
 async def get_transactions(
     ctx: RunContextWrapper[Any],
+    search: str | None = None,
     start_date: str | None = None,
     end_date: str | None = None,
     payment_method: str | None = None,
@@ -38,12 +40,13 @@ async def get_transactions(
     cred_info: str | None = None,
     category: str | None = None
 ) -> list[dict]:
-    """Fetch filtered bank transactions."""
+    """Fetch filtered bank transactions. ``search`` finds words in all text fields (merchant, creditor, debitor, location)."""
 
     def run_query():
         qs = BankTransaction.objects.all()
         qs = TransactionFilter.apply(
             qs,
+            search=search,
             start_date=start_date,
             end_date=end_date,
             payment_method=payment_method,
@@ -92,6 +95,14 @@ async def count_all_transactions() -> str:
 
 
 
+@hot_query("outgoing payments for recurring payment detection")
+def outgoing_payments():
+    return (
+        BankTransaction.objects.filter(direction=2)  # only outgoing
+        .values("text_creditor", "amount", "val_date")
+    )
+
+
 @function_tool
 async def detect_recurring_payments(
     ctx: RunContextWrapper,
@@ -104,10 +115,7 @@ async def detect_recurring_payments(
     """Detect recurring outgoing payments (subscriptions, rent, utilities)."""
 
     def run_query():
-        qs = (
-            BankTransaction.objects.filter(direction=2)  # only outgoing
-            .values("text_creditor", "amount", "val_date")
-        )
+        qs = outgoing_payments()
 
         groups = defaultdict(list)
         for tx in qs:
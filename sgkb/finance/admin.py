@@ -1,27 +1,36 @@
-import pandas as pd
-from decimal import Decimal, InvalidOperation
-from django.contrib import admin, messages
+from django.contrib import admin
 from django import forms
-from django.shortcuts import redirect, render
-
-from .models import BankTransaction, Partners, Recommendation, Catagory
-
-def safe_int(value):
-    try:
-        return int(value)
-    except (ValueError, TypeError):
-        return None
-
-
-def safe_decimal(value):
-    try:
-        return Decimal(str(value).replace(",", "."))  # handle comma decimals
-    except (InvalidOperation, ValueError, TypeError):
-        return None
+from django.db.models import Q
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 
+from .models import BankTransaction, Catagory, ExportJob, ImportJob, ImportWatermark, Partners, Recommendation
+from .tasks import import_transactions_file
+from .utils.importer import spool_upload
+from .utils.search import SEARCH_FIELDS, search_q
 
 class UploadCSVForm(forms.Form):
-    csv_file = forms.FileField()
+    csv_file = forms.FileField(help_text="SGKB export as CSV, Parquet (.parquet) or Arrow IPC (.arrow).")
+    mode = forms.ChoiceField(
+        choices=ImportJob.MODE_CHOICES,
+        initial=ImportJob.MODE_SKIP,
+        help_text=(
+            "Known transactions are matched on TRX_ID plus a content hash, so re-uploading an overlapping export is safe. "
+            "In skip mode a row whose TRX_ID is stored with different content is rejected; use update mode to apply corrections."
+        ),
+    )
+    incremental = forms.BooleanField(
+        required=False,
+        label="Incremental",
+        help_text="Drop rows at or below the last imported TRX_DATE/TRX_ID per account. For cumulative extracts.",
+    )
+    background = forms.BooleanField(
+        required=False,
+        initial=True,
+        label="Run as background job",
+        help_text="Spool the file to disk and import it with Celery. Recommended for large exports.",
+    )
 
 @admin.register(BankTransaction)
 class BankTransactionAdmin(admin.ModelAdmin):
@@ -42,23 +51,30 @@ class BankTransactionAdmin(admin.ModelAdmin):
         "trx_curry_name",
         "trx_type_short",
         "buchungs_art_short",
-        "acquirer_country_name",
+        "acquirer_country_code",
         "trx_date",
         "val_date",
         "catagory",  # ✅ filter by category
     )
-    search_fields = (
-        "trx_id",
-        "customer_name",
-        "account_name",
-        "text_creditor",
-        "text_debitor",
-        "cred_iban",
-        "cred_ref_nr",
-        "catagory__name",  # ✅ allow searching by category name
-    )
+    # Searched by get_search_results: the text columns through the full-text index
+    search_fields = ("trx_id", "catagory__name", *SEARCH_FIELDS)
     ordering = ("-trx_date",)
     date_hierarchy = "trx_date"
+    readonly_fields = ("acquirer_country_code",)  # derived from the country name on save
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Words matched in the full-text index, an exact category name or a
+        TRX_ID; every branch uses an index instead of LIKE '%…%'.
+        """
+        term = search_term.strip()
+        q = search_q(term)
+        if q is None:
+            return queryset, False
+        q |= Q(catagory__in=Catagory.objects.filter(name__iexact=term))  # ✅ allow searching by category name
+        if term.isdigit():
+            q |= Q(trx_id=int(term))
+        return queryset.filter(q), False
 
     fieldsets = (
         ("General Info", {
@@ -74,7 +90,7 @@ class BankTransactionAdmin(admin.ModelAdmin):
             "fields": ("text_short_creditor", "text_creditor", "text_short_debitor", "text_debitor")
         }),
         ("POS & Acquirer", {
-            "fields": ("point_of_sale_and_location", "acquirer_country_id", "acquirer_country_name", "card_id")
+            "fields": ("point_of_sale_and_location", "acquirer_country_id", "acquirer_country_name", "acquirer_country_code", "card_id")
         }),
         ("Creditor Info", {
             "fields": ("cred_acc_text", "cred_iban", "cred_addr_text", "cred_ref_nr", "cred_info")
@@ -93,6 +109,9 @@ class BankTransactionAdmin(admin.ModelAdmin):
         urls = super().get_urls()
         custom_urls = [
             path("upload-csv/", self.admin_site.admin_view(self.upload_csv), name="banktransaction_upload_csv"),
+            path("upload-csv/<int:job_id>/", self.admin_site.admin_view(self.import_job), name="banktransaction_import_job"),
+            path("upload-csv/<int:job_id>/status/", self.admin_site.admin_view(self.import_job_status), name="banktransaction_import_job_status"),
+            path("upload-csv/<int:job_id>/rejects/", self.admin_site.admin_view(self.import_job_rejects), name="banktransaction_import_job_rejects"),
         ]
         return custom_urls + urls
 
@@ -103,65 +122,76 @@ class BankTransactionAdmin(admin.ModelAdmin):
             if form.is_valid():
                 csv_file = request.FILES["csv_file"]
 
-                try:
-                    df = pd.read_csv(csv_file, sep=",")
-                    df = df.fillna("")  # Replace NaN with empty string
-
-                    for _, row in df.iterrows():
-                        # Handle category (create if it doesn't exist)
-                        category_name = row.get("category", "").strip()
-                        cat_obj = None
-                        if category_name:
-                            cat_obj, _ = Catagory.objects.get_or_create(name=category_name)
-
-                        BankTransaction.objects.create(
-                            account_name=row.get("MONEY_ACCOUNT_NAME", ""),
-                            currency_type=row.get("MAC_CURRY_NAME", ""),
-                            macc_type=row.get("MACC_TYPE", ""),
-                            produkt=row.get("PRODUKT", ""),
-                            customer_name=row.get("KUNDEN_NAME", ""),
-                            trx_id=safe_int(row.get("TRX_ID")),
-                            trx_type_id=safe_int(row.get("TRX_TYPE_ID")),
-                            trx_type_short=row.get("TRX_TYPE_SHORT", ""),
-                            trx_type_name=row.get("TRX_TYPE_NAME", ""),
-                            buchungs_art_short=row.get("BUCHUNGS_ART_SHORT", ""),
-                            buchungs_art_name=row.get("BUCHUNGS_ART_NAME", ""),
-                            val_date=pd.to_datetime(row.get("VAL_DATE"), errors="coerce").date()
-                                    if row.get("VAL_DATE") else None,
-                            trx_date=pd.to_datetime(row.get("TRX_DATE"), errors="coerce").date()
-                                    if row.get("TRX_DATE") else None,
-                            direction=safe_int(row.get("DIRECTION")),
-                            amount=safe_decimal(row.get("AMOUNT")),
-                            trx_curry_id=safe_int(row.get("TRX_CURRY_ID")),
-                            trx_curry_name=row.get("TRX_CURRY_NAME", ""),
-                            text_short_creditor=row.get("TEXT_SHORT_CREDITOR", ""),
-                            text_creditor=row.get("TEXT_CREDITOR", ""),
-                            text_short_debitor=row.get("TEXT_SHORT_DEBITOR", ""),
-                            text_debitor=row.get("TEXT_DEBITOR", ""),
-                            point_of_sale_and_location=row.get("POINT_OF_SALE_AND_LOCATION", ""),
-                            acquirer_country_id=safe_int(row.get("ACQUIRER_COUNTRY_ID")),
-                            acquirer_country_name=row.get("ACQUIRER_COUNTRY_NAME", ""),
-                            card_id=row.get("CARD_ID", ""),
-                            cred_acc_text=row.get("CRED_ACC_TEXT", ""),
-                            cred_iban=row.get("CRED_IBAN", ""),
-                            cred_addr_text=row.get("CRED_ADDR_TEXT", ""),
-                            cred_ref_nr=row.get("CRED_REF_NR", ""),
-                            cred_info=row.get("CRED_INFO", ""),
-                            catagory=cat_obj,  # assign category here
-                        )
-
-                    self.message_user(request, "CSV file uploaded and transactions imported successfully!", level=messages.SUCCESS)
-
-                except Exception as e:
-                    self.message_user(request, f"Error while processing CSV: {e}", level=messages.ERROR)
-
-                return redirect("..")
+                path = spool_upload(csv_file)
+                job = ImportJob.objects.create(
+                    file_name=csv_file.name,
+                    file_path=str(path),
+                    file_size=path.stat().st_size,
+                    mode=form.cleaned_data["mode"],
+                    incremental=form.cleaned_data["incremental"],
+                )
+                if form.cleaned_data["background"]:
+                    import_transactions_file.delay(job.pk)
+                else:
+                    import_transactions_file(job.pk)
+                return redirect(reverse("admin:banktransaction_import_job", args=[job.pk]))
 
         else:
             form = UploadCSVForm()
 
         return render(request, "admin/csv_upload.html", {"form": form})
 
+    def import_job(self, request, job_id):
+        job = get_object_or_404(ImportJob, pk=job_id)
+        return render(request, "admin/import_job.html", {"job": job, "opts": self.model._meta})
+
+    def import_job_status(self, request, job_id):
+        job = get_object_or_404(ImportJob, pk=job_id)
+        return JsonResponse({
+            "status": job.status,
+            "progress": round(job.progress, 4),
+            "rows_done": job.rows_done,
+            "rows_rejected": job.rows_rejected,
+            "rows_skipped": job.rows_skipped,
+            "eta_seconds": round(job.eta_seconds) if job.eta_seconds is not None else None,
+            "rows_per_second": round(job.rows_per_second) if job.rows_per_second is not None else None,
+            "error": job.error,
+            "rejects_url": reverse("admin:banktransaction_import_job_rejects", args=[job.pk]) if job.has_rejects else None,
+        })
+
+    def import_job_rejects(self, request, job_id):
+        job = get_object_or_404(ImportJob, pk=job_id)
+        if not job.has_rejects:
+            raise Http404("This import has no rejected rows.")
+        return FileResponse(open(job.rejects_file, "rb"), as_attachment=True, filename=f"{job.file_name}.rejects.csv")
+
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "file_name", "mode", "incremental", "status", "rows_done", "rows_skipped", "rows_rejected", "created_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = [field.name for field in ImportJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "file_name", "status", "rows_done", "rows_total", "created_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = [field.name for field in ExportJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ImportWatermark)
+class ImportWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("source", "account_name", "max_trx_date", "max_trx_id", "updated_at")
+    list_filter = ("source",)
+    search_fields = ("account_name",)
 
 
 @admin.register(Partners)
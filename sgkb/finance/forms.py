@@ -0,0 +1,56 @@
+from django import forms
+from graphene.utils.str_converters import to_snake_case
+
+from .models import BankTransaction
+from .utils import TransactionFilter
+from .utils.export import EXPORT_COLUMNS, select_columns
+
+
+class ExportFilterForm(forms.Form):
+    """
+    Query-string filters for the export views: the arguments of the
+    ``bankTransactions`` GraphQL field, in camelCase or snake_case, plus
+    ``columns``, a comma-separated list of export headers.
+    """
+
+    search = forms.CharField(required=False)
+    start_date = forms.DateField(required=False)
+    end_date = forms.DateField(required=False)
+    payment_method = forms.CharField(required=False)
+    min_amount = forms.DecimalField(required=False)
+    max_amount = forms.DecimalField(required=False)
+    country = forms.CharField(required=False)
+    country_code = forms.CharField(required=False, max_length=2)
+    direction = forms.IntegerField(required=False)
+    produkt = forms.CharField(required=False)
+    account_name = forms.CharField(required=False)
+    customer_name = forms.CharField(required=False)
+    buchungs_art_name = forms.CharField(required=False)
+    text_short_creditor = forms.CharField(required=False)
+    text_creditor = forms.CharField(required=False)
+    text_debitor = forms.CharField(required=False)
+    point_of_sale_and_location = forms.CharField(required=False)
+    acquirer_country_name = forms.CharField(required=False)
+    cred_iban = forms.CharField(required=False)
+    cred_addr_text = forms.CharField(required=False)
+    cred_ref_nr = forms.CharField(required=False)
+    cred_info = forms.CharField(required=False)
+    columns = forms.CharField(required=False)
+
+    def __init__(self, data=None, *args, **kwargs):
+        if data is not None:
+            data = {to_snake_case(key): value for key, value in data.items()}
+        super().__init__(data, *args, **kwargs)
+
+    def clean_columns(self):
+        headers = [header.strip() for header in self.cleaned_data["columns"].split(",") if header.strip()]
+        known = {header for header, _ in EXPORT_COLUMNS}
+        unknown = [header for header in headers if header not in known]
+        if unknown:
+            raise forms.ValidationError(f"Unknown columns: {', '.join(unknown)}")
+        return select_columns(headers)
+
+    def queryset(self):
+        """BankTransactions narrowed by the submitted filters; call after ``is_valid``."""
+        filters = {name: value for name, value in self.cleaned_data.items() if name != "columns"}
+        return TransactionFilter.apply(BankTransaction.objects.all(), **filters)
@@ -0,0 +1,73 @@
+"""
+Narrow querysets to what a GraphQL request actually selects.
+
+The selection set of the resolved field is walked (fragments included), the
+selected model fields go into ``only()`` and selected foreign keys into
+``select_related()``, so a list resolver runs one query with just the
+columns the client asked for.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from graphene.utils.str_converters import to_snake_case
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+
+def _field_nodes(info, selection_set):
+    """Field nodes of a selection set, with fragment spreads and inline fragments expanded."""
+    if selection_set is None:
+        return
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+        elif isinstance(selection, FragmentSpreadNode):
+            yield from _field_nodes(info, info.fragments[selection.name.value].selection_set)
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _field_nodes(info, selection.selection_set)
+
+
+def selected_fields(info, path=()):
+    """
+    snake_case names selected below the resolved field, after descending
+    through ``path`` (e.g. ``("edges", "node")`` for a connection).
+    """
+    nodes = list(info.field_nodes)
+    for name in path:
+        nodes = [
+            child
+            for node in nodes
+            for child in _field_nodes(info, node.selection_set)
+            if child.name.value == name
+        ]
+    return {
+        to_snake_case(child.name.value)
+        for node in nodes
+        for child in _field_nodes(info, node.selection_set)
+    }
+
+
+def project_queryset(queryset, info, path=(), dependencies=None, required=()):
+    """
+    Apply ``only()`` and ``select_related()`` for the selected fields.
+
+    ``dependencies`` maps computed GraphQL fields to the model fields they
+    read (e.g. ``{"logo_url": ("logo",)}``); ``required`` lists model fields
+    the resolver itself needs. Unknown names such as ``__typename`` are ignored.
+    """
+    opts = queryset.model._meta
+    names = set(required)
+    for name in selected_fields(info, path):
+        names.update((dependencies or {}).get(name, (name,)))
+
+    only, related = set(), set()
+    for name in names:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.concrete and (field.many_to_one or field.one_to_one):
+            # the related row comes from the same query
+            related.add(name)
+            only.add(name)
+        elif field.concrete and not field.is_relation:
+            only.add(name)
+
+    return queryset.select_related(*related).only(*only or {opts.pk.name})
@@ -1,33 +1,18 @@
 import graphene
+from graphql import GraphQLError
+from graphql_relay.utils import base64, unbase64
+from .projection import project_queryset
 from .types import BankTransactionType
 from finance.models import BankTransaction
 from finance.utils import TransactionFilter
+from finance.utils.aggregate import aggregate_transactions
+from finance.utils.cache import versioned_cache
+from finance.utils.countries import country_name
+from finance.utils.query_plans import hot_query
+from finance.utils.timeseries import time_series
 from django.utils.timezone import now
-from django.db.models.functions import TruncMonth
-from django.db.models import Sum
-from datetime import timedelta
-
-
-GERMAN_COUNTRY_MAP = {
-    "Schweiz": "CH",
-    "Deutschland": "DE",
-    "Österreich": "AT",
-    "Frankreich": "FR",
-    "Italien": "IT",
-    "Spanien": "ES",
-    "Portugal": "PT",
-    "Niederlande": "NL",
-    "Belgien": "BE",
-    "Luxemburg": "LU",
-    "Grossbritannien": "GB",   # UK
-    "Irland": "IE",
-    "Dänemark": "DK",
-    "Norwegen": "NO",
-    "Schweden": "SE",
-    "Kroatien": "HR",
-    "Vereinigte Staaten": "US",
-    "Kanada": "CA",
-}
+from django.db.models import Q, Sum
+from datetime import date, timedelta
 
 
 class MonthlyTotalType(graphene.ObjectType):
@@ -36,6 +21,24 @@ class MonthlyTotalType(graphene.ObjectType):
     percentage = graphene.Float()
 
 
+class TimeGranularity(graphene.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+
+class TimeSeriesPointType(graphene.ObjectType):
+    """One period of a time series; ``direction`` is only set when the series is split."""
+    period = graphene.Date()
+    direction = graphene.Int()
+    total = graphene.Decimal()
+    count = graphene.Int()
+    share = graphene.Float(description="Percent of the series total")
+    running_total = graphene.Decimal()
+
+
 class CountryTotalType(graphene.ObjectType):
     country = graphene.String()
     total = graphene.Decimal()
@@ -46,15 +49,61 @@ class CategoryTotalType(graphene.ObjectType):
     total = graphene.Decimal()
 
 
-class Query(graphene.ObjectType):
-    bank_transactions = graphene.List(
-        BankTransactionType,
+class AggregateDimension(graphene.Enum):
+    COUNTRY = "country"
+    COUNTRY_CODE = "country_code"
+    CATEGORY = "category"
+    MONTH = "month"
+    WEEK = "week"
+    MERCHANT = "merchant"
+    DIRECTION = "direction"
+    CURRENCY = "currency"
+
+
+class AggregateMeasure(graphene.Enum):
+    SUM = "sum"
+    COUNT = "count"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+
+
+class AggregateRowType(graphene.ObjectType):
+    """One group of an aggregate query; only the requested dimensions and measures are set."""
+    country = graphene.String()
+    country_code = graphene.String()
+    category = graphene.String()
+    month = graphene.Date()
+    week = graphene.Date()
+    merchant = graphene.String()
+    direction = graphene.Int()
+    currency = graphene.String()
+    sum = graphene.Decimal()
+    count = graphene.Int()
+    avg = graphene.Decimal()
+    min = graphene.Decimal()
+    max = graphene.Decimal()
+
+
+# Page size limits for bankTransactionsConnection
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Longest zero-filled series timeSeries returns (about ten years of days)
+MAX_TIME_SERIES_POINTS = 3660
+
+
+def transaction_filter_arguments():
+    """GraphQL arguments accepted by TransactionFilter.apply."""
+    return dict(
+        search=graphene.String(description="Words that must all appear in the transaction texts (prefix match)"),
         start_date=graphene.Date(),
         end_date=graphene.Date(),
         payment_method=graphene.String(),
         min_amount=graphene.Decimal(),
         max_amount=graphene.Decimal(),
-        country=graphene.String(),
+        country=graphene.String(description="Part of the acquirer country name"),
+        country_code=graphene.String(description="ISO 3166-1 alpha-2 code of the acquirer country"),
         direction=graphene.Int(),
         produkt=graphene.String(),
         account_name=graphene.String(),
@@ -72,44 +121,192 @@ class Query(graphene.ObjectType):
     )
 
 
-    monthly_totals = graphene.List(MonthlyTotalType)
+def encode_cursor(transaction):
+    return base64(f"{transaction.val_date.isoformat()}:{transaction.pk}")
 
-    def resolve_monthly_totals(self, info):
-        twelve_months_ago = now().date().replace(day=1) - timedelta(days=365)
 
-        qs = (
-            BankTransaction.objects
-            .filter(val_date__gte=twelve_months_ago)
-            .annotate(month=TruncMonth("val_date"))
-            .values("month")
-            .annotate(total=Sum("amount"))
-            .order_by("month")
-        )
+def decode_cursor(cursor):
+    """(val_date, id) of the row a cursor points at."""
+    try:
+        val_date, pk = unbase64(cursor).split(":")
+        return date.fromisoformat(val_date), int(pk)
+    except ValueError:
+        raise GraphQLError(f"Invalid cursor: {cursor}")
 
-        total_sum = sum(row["total"] or 0 for row in qs)
 
-        results = []
-        for row in qs:
-            percentage = (float(row["total"]) / float(total_sum) * 100) if total_sum else 0.0
-            results.append(
-                MonthlyTotalType(
-                    month=row["month"],
-                    total=row["total"],
-                    percentage=round(percentage, 2)
-                )
+# The aggregates below return plain rows so they can be cached per data version.
+# They run on the async ORM, so the event loop serves other requests meanwhile.
+
+@versioned_cache("time_series")
+async def time_series_rows(granularity, split_direction, **filters):
+    qs = TransactionFilter.apply(BankTransaction.objects.all(), **filters)
+    return await time_series(
+        qs,
+        granularity,
+        split_direction,
+        start=filters.get("start_date"),
+        end=filters.get("end_date"),
+        max_points=MAX_TIME_SERIES_POINTS,
+    )
+
+
+@hot_query("totals by country code")
+def country_code_totals():
+    return (
+        BankTransaction.objects
+        .filter(acquirer_country_code__isnull=False)
+        .values("acquirer_country_code")
+        .annotate(total=Sum("amount"))
+    )
+
+
+@hot_query("totals of country names without a code")
+def unknown_country_totals():
+    return (
+        BankTransaction.objects
+        .filter(acquirer_country_code__isnull=True)
+        .exclude(acquirer_country_name__isnull=True)
+        .exclude(acquirer_country_name="")
+        .values("acquirer_country_name")
+        .annotate(total=Sum("amount"))
+    )
+
+
+@versioned_cache("totals_by_country")
+async def country_total_rows():
+    # Grouped on the indexed code; names the lookup table does not know are grouped as they are
+    rows = [
+        {"country_code": row["acquirer_country_code"], "country": country_name(row["acquirer_country_code"]), "total": row["total"]}
+        async for row in country_code_totals()
+    ] + [
+        {"country_code": None, "country": row["acquirer_country_name"], "total": row["total"]}
+        async for row in unknown_country_totals()
+    ]
+    # Sum() is NULL for groups whose amounts are all NULL
+    return sorted(rows, key=lambda row: row["total"] or 0, reverse=True)
+
+
+@hot_query("totals by category")
+def category_totals():
+    return (
+        BankTransaction.objects
+        .filter(direction=2)  # ✅ only outgoing
+        .values("catagory__name")
+        .annotate(total=Sum("amount"))
+        .order_by("-total")
+    )
+
+
+@versioned_cache("totals_by_category")
+async def category_total_rows():
+    return [row async for row in category_totals()]
+
+
+@versioned_cache("aggregate")
+async def aggregate_rows(dimensions, measures, **filters):
+    qs = TransactionFilter.apply(BankTransaction.objects.all(), **filters)
+    return await aggregate_transactions(qs, dimensions, measures)
+
+
+# Synchronous: the cost analyser runs before execution, outside the event loop.
+# A real COUNT rather than a guess per argument, so arguments that do not narrow
+# the query (a search without words, an open date range) cannot lower the cost.
+@versioned_cache("transaction_count")
+def filtered_transaction_count(**filters):
+    return TransactionFilter.apply(BankTransaction.objects.all(), **filters).count()
+
+
+def estimate_transaction_rows(args):
+    filters = {name: args[name] for name in transaction_filter_arguments() if args.get(name) is not None}
+    return filtered_transaction_count(**filters)
+
+
+# Rows per parent row for the cost analyser in sgkb.graphql.schema
+ROW_ESTIMATORS = {
+    ("Query", "bankTransactions"): estimate_transaction_rows,
+    ("Query", "bankTransactionsConnection"): lambda args: args["first"],
+    # the connection above already multiplies by the page size
+    ("BankTransactionConnection", "edges"): lambda args: 1,
+}
+
+
+class BankTransactionConnection(graphene.relay.Connection):
+    class Meta:
+        node = BankTransactionType
+
+    total_count = graphene.Int()
+
+    async def resolve_total_count(root, info):
+        # Only counted when the client asks for it
+        return await root.queryset.acount()
+
+
+class Query(graphene.ObjectType):
+    bank_transactions_connection = graphene.Field(
+        BankTransactionConnection,
+        first=graphene.Int(default_value=DEFAULT_PAGE_SIZE),
+        after=graphene.String(),
+        **transaction_filter_arguments(),
+    )
+
+    bank_transactions = graphene.List(BankTransactionType, **transaction_filter_arguments())
+
+    aggregate = graphene.List(
+        AggregateRowType,
+        dimensions=graphene.List(graphene.NonNull(AggregateDimension), default_value=[]),
+        measures=graphene.List(graphene.NonNull(AggregateMeasure), default_value=[AggregateMeasure.SUM.value]),
+        **transaction_filter_arguments(),
+    )
+
+
+    time_series = graphene.List(
+        TimeSeriesPointType,
+        granularity=TimeGranularity(default_value=TimeGranularity.MONTH.value),
+        split_direction=graphene.Boolean(default_value=False),
+        **transaction_filter_arguments(),
+    )
+
+    monthly_totals = graphene.List(
+        MonthlyTotalType,
+        deprecation_reason="Use timeSeries, which also splits by direction and takes a date range.",
+    )
+
+    async def resolve_time_series(root, info, granularity, split_direction, **filters):
+        """
+        Zero-filled totals per period between startDate and endDate, with
+        shares and running totals computed in the same query.
+        """
+        try:
+            rows = await time_series_rows(
+                granularity=getattr(granularity, "value", granularity),
+                split_direction=split_direction,
+                **filters,
             )
-        return results
+        except ValueError as e:
+            raise GraphQLError(str(e))
+        return [TimeSeriesPointType(**row) for row in rows]
+
+    async def resolve_monthly_totals(self, info):
+        twelve_months_ago = now().date().replace(day=1) - timedelta(days=365)
+
+        rows = await time_series_rows(granularity="month", split_direction=False, start_date=twelve_months_ago)
+        return [
+            MonthlyTotalType(month=row["period"], total=row["total"], percentage=round(row["share"], 2))
+            for row in rows
+        ]
 
 
-    def resolve_bank_transactions(
+    async def resolve_bank_transactions(
         root,
         info,
+        search=None,
         start_date=None,
         end_date=None,
         payment_method=None,
         min_amount=None,
         max_amount=None,
         country=None,
+        country_code=None,
         direction=None,
         produkt=None,
         account_name=None,
@@ -125,15 +322,19 @@ class Query(graphene.ObjectType):
         cred_ref_nr=None,
         cred_info=None,
     ):
-        qs = BankTransaction.objects.all()
+        qs = project_queryset(
+            BankTransaction.objects.all(), info, dependencies=BankTransactionType.field_dependencies
+        )
         qs = TransactionFilter.apply(
             qs,
+            search=search,
             start_date=start_date,
             end_date=end_date,
             payment_method=payment_method,
             min_amount=min_amount,
             max_amount=max_amount,
             country=country,
+            country_code=country_code,
             direction=direction,
             produkt=produkt,
             account_name=account_name,
@@ -149,45 +350,66 @@ class Query(graphene.ObjectType):
             cred_ref_nr=cred_ref_nr,
             cred_info=cred_info,
         )
-        return qs
+        return [row async for row in qs.aiterator()]
 
-    totals_by_country = graphene.List(CountryTotalType)
+    async def resolve_bank_transactions_connection(root, info, first=DEFAULT_PAGE_SIZE, after=None, **filters):
+        """
+        Newest transactions first, paged with keyset cursors on (val_date, id):
+        each page is a range scan on the index, however deep into the history.
+        """
+        if not 0 < first <= MAX_PAGE_SIZE:
+            raise GraphQLError(f"first must be between 1 and {MAX_PAGE_SIZE}.")
 
-    def resolve_totals_by_country(self, info):
-        qs = (
-            BankTransaction.objects
-            .values("acquirer_country_name")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
+        qs = TransactionFilter.apply(BankTransaction.objects.all(), **filters)
+        page = project_queryset(
+            qs.order_by("-val_date", "-id"),
+            info,
+            path=("edges", "node"),
+            dependencies=BankTransactionType.field_dependencies,
+            required=("val_date",),
         )
+        if after:
+            val_date, pk = decode_cursor(after)
+            page = page.filter(Q(val_date__lt=val_date) | Q(val_date=val_date, id__lt=pk))
 
-        results = []
-        for row in qs:
-            country = row["acquirer_country_name"]
-            if not country:
-                continue
+        # One extra row tells whether another page follows
+        rows = [row async for row in page[:first + 1]]
+        edges = [
+            BankTransactionConnection.Edge(node=row, cursor=encode_cursor(row))
+            for row in rows[:first]
+        ]
+        connection = BankTransactionConnection(
+            edges=edges,
+            page_info=graphene.relay.PageInfo(
+                has_next_page=len(rows) > first,
+                has_previous_page=bool(after),
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None,
+            ),
+        )
+        connection.queryset = qs
+        return connection
 
-            iso_code = GERMAN_COUNTRY_MAP.get(country)
+    async def resolve_aggregate(root, info, dimensions, measures, **filters):
+        """Filtered transactions grouped by ``dimensions``, computed in one GROUP BY."""
+        if not measures:
+            raise GraphQLError("At least one measure is required.")
+        rows = await aggregate_rows(
+            dimensions=[getattr(name, "value", name) for name in dimensions],
+            measures=[getattr(name, "value", name) for name in measures],
+            **filters,
+        )
+        return [AggregateRowType(**row) for row in rows]
 
-            results.append(
-                CountryTotalType(
-                    country=country,
-                    country_code=iso_code,
-                    total=row["total"],
-                )
-            )
-        return results
+    totals_by_country = graphene.List(CountryTotalType)
+
+    async def resolve_totals_by_country(self, info):
+        return [CountryTotalType(**row) for row in await country_total_rows()]
 
     totals_by_category = graphene.List(CategoryTotalType)
 
-    def resolve_totals_by_category(self, info):
-        qs = (
-            BankTransaction.objects
-            .filter(direction=2)  # ✅ only outgoing
-            .values("catagory__name")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
-        )
+    async def resolve_totals_by_category(self, info):
+        qs = await category_total_rows()
 
         results = []
         for row in qs:
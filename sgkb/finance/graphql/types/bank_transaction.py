@@ -1,15 +1,31 @@
 import graphene
 from graphene_django import DjangoObjectType
-from finance.models import BankTransaction, Logo
+from finance.models import BankTransaction, Catagory, Logo
+from sgkb.graphql.loaders import load_related, related_resolver, reverse_resolver
 
 class LogoType(DjangoObjectType):
     class Meta:
         model = Logo
 
+    resolve_banktransaction_set = reverse_resolver(BankTransaction, "logo")
+
+class CatagoryType(DjangoObjectType):
+    class Meta:
+        model = Catagory
+
+    resolve_banktransaction_set = reverse_resolver(BankTransaction, "catagory")
+
 class BankTransactionType(DjangoObjectType):
     class Meta:
         model = BankTransaction
     logo_url = graphene.String()
 
-    def resolve_logo_url(self, info):
-        return self.logo.url if self.logo else None
\ No newline at end of file
+    # model fields read by the computed fields above, for project_queryset
+    field_dependencies = {"logo_url": ("logo",)}
+
+    resolve_logo = related_resolver("logo")
+    resolve_catagory = related_resolver("catagory")
+
+    async def resolve_logo_url(self, info):
+        logo = await load_related(info, self, "logo")
+        return logo.url if logo else None
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from finance.models import BankTransaction
+from finance.utils.cache import bump_data_version
+from finance.utils.countries import country_code
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill acquirer_country_code from acquirer_country_name for existing transactions. "
+        "Issues one UPDATE per distinct country name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recompute every row, not only rows without a code.")
+
+    def handle(self, *args, **options):
+        rows = BankTransaction.objects.exclude(acquirer_country_name__isnull=True).exclude(acquirer_country_name="")
+        if not options["all"]:
+            rows = rows.filter(acquirer_country_code__isnull=True)
+        names = rows.values_list("acquirer_country_name", flat=True).distinct().order_by()
+
+        updated = 0
+        unknown = []
+        with transaction.atomic():
+            for name in names:
+                code = country_code(name)
+                if code is None:
+                    unknown.append(name)
+                    if not options["all"]:
+                        continue
+                updated += rows.filter(acquirer_country_name=name).update(acquirer_country_code=code)
+            if updated:
+                transaction.on_commit(bump_data_version)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} rows updated"))
+        if unknown:
+            self.stdout.write(self.style.WARNING(
+                f"{len(unknown)} country names without a code: {', '.join(sorted(unknown))}"
+            ))
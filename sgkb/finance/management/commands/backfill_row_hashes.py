@@ -0,0 +1,58 @@
+import pandas as pd
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from finance.models import BankTransaction
+from finance.utils.importer import CATEGORY_COLUMN, COLUMN_MAP, HASH_COLUMN, row_hashes
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill row_hash for transactions imported before content hashes existed, "
+        "so skip and update imports recognise them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows hashed and written per transaction.")
+
+    def handle(self, *args, **options):
+        fields = list(COLUMN_MAP.values())
+        rows = BankTransaction.objects.filter(row_hash__isnull=True).order_by("pk")
+
+        updated = 0
+        duplicates = 0
+        last_pk = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last_pk).values("pk", *fields, "catagory__name")[:options["batch_size"]])
+            if not batch:
+                break
+            last_pk = batch[-1]["pk"]
+
+            # object dtype keeps integer columns with NULLs as ints, as the importer hashes them
+            frame = pd.DataFrame(batch, dtype=object)
+            frame[CATEGORY_COLUMN] = frame["catagory__name"].fillna("")
+            frame[HASH_COLUMN] = row_hashes(frame)
+
+            # (trx_id, row_hash) is unique: a duplicate of an already hashed row keeps its NULL hash
+            taken = set(
+                BankTransaction.objects
+                .filter(trx_id__in=set(frame["trx_id"]), row_hash__in=set(frame[HASH_COLUMN]))
+                .values_list("trx_id", HASH_COLUMN)
+            )
+            objs = []
+            for pk, trx_id, row_hash in zip(frame["pk"], frame["trx_id"], frame[HASH_COLUMN]):
+                if (trx_id, row_hash) in taken:
+                    duplicates += 1
+                    continue
+                taken.add((trx_id, row_hash))
+                objs.append(BankTransaction(pk=pk, row_hash=row_hash))
+
+            with transaction.atomic():
+                BankTransaction.objects.bulk_update(objs, [HASH_COLUMN])
+            updated += len(objs)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} rows hashed"))
+        if duplicates:
+            self.stdout.write(self.style.WARNING(
+                f"{duplicates} rows duplicate another transaction's TRX_ID and content and were left without a hash"
+            ))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.utils.query_plans import check_query_plans, load_hot_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the registered hot transaction queries and fail when one of them "
+        "reads a whole table. Meant for CI, against a migrated database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="Hot queries to check (default: all).")
+        parser.add_argument("--list", action="store_true", help="List the registered hot queries and exit.")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for name in load_hot_queries():
+                self.stdout.write(name)
+            return
+
+        try:
+            results = check_query_plans(options["names"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for result in results:
+            if result.ok:
+                self.stdout.write(self.style.SUCCESS(f"ok    {result.name}"))
+            else:
+                self.stdout.write(self.style.ERROR(f"SCAN  {result.name}: full scan of {', '.join(result.full_scans)}"))
+            if not result.ok or options["verbosity"] > 1:
+                for line in result.plan.splitlines():
+                    self.stdout.write(f"      {line}")
+
+        failed = [result.name for result in results if not result.ok]
+        if failed:
+            raise CommandError(f"{len(failed)} of {len(results)} hot queries use a full table scan.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} hot queries use an index."))
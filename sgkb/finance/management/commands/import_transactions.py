@@ -0,0 +1,117 @@
+import argparse
+import glob
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.models import ImportJob
+from finance.utils.importer import (
+    DEFAULT_BATCH_SIZE,
+    RejectsWriter,
+    TransactionImporter,
+    is_arrow_source,
+    iter_arrow_frames,
+    iter_csv_blocks,
+    parse_block,
+)
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+class Command(BaseCommand):
+    help = (
+        "Import SGKB transaction exports (CSV, Parquet or Arrow IPC). CSV blocks are "
+        "parsed and normalized in worker processes; this process is the single database writer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Files or glob patterns, e.g. 'exports/*.csv' or 'exports/*.parquet'.")
+        parser.add_argument("--mode", choices=[value for value, _ in ImportJob.MODE_CHOICES], default=ImportJob.MODE_SKIP)
+        parser.add_argument("--incremental", action="store_true", help="Drop rows at or below the per-account watermark.")
+        parser.add_argument("--source", default="default", help="Watermark namespace for --incremental.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parser processes (default: all cores).")
+        parser.add_argument("--block-size", type=positive_int, default=16, help="Bytes per parse block, in MB.")
+        parser.add_argument("--batch-size", type=positive_int, default=DEFAULT_BATCH_SIZE)
+
+    def _expand(self, patterns):
+        paths = []
+        for pattern in patterns:
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise CommandError(f"No files match {pattern!r}")
+            paths.extend(matches)
+        return paths
+
+    def handle(self, *args, **options):
+        paths = self._expand(options["paths"])
+        block_size = options["block_size"] * 1024 * 1024
+        workers = max(options["workers"], 1)
+
+        importer = TransactionImporter(
+            batch_size=options["batch_size"],
+            mode=options["mode"],
+            incremental=options["incremental"],
+            source=options["source"],
+        )
+        timings = {"parse": 0.0, "coerce": 0.0, "write": 0.0}
+        started = time.perf_counter()
+
+        # initializer: spawn-based platforms need the app registry in each worker
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            for path in paths:
+                self.stdout.write(f"Importing {path} ...")
+                importer.rejects = RejectsWriter(f"{path}.rejects.csv")
+                if is_arrow_source(path):
+                    self._import_arrow(importer, path, timings)
+                else:
+                    self._import_csv(pool, workers, importer, path, block_size, timings)
+
+                if importer.rejects.rows:
+                    self.stdout.write(self.style.WARNING(
+                        f"{importer.rejects.rows} rejected rows written to {importer.rejects.path}"
+                    ))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"parse {timings['parse']:.1f}s, coerce {timings['coerce']:.1f}s (CPU time across workers), "
+            f"write {timings['write']:.1f}s, wall {elapsed:.1f}s"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{importer.result} — {importer.result.rows / elapsed if elapsed else 0:,.0f} rows/s wall clock"
+        ))
+
+    def _import_csv(self, pool, workers, importer, path, block_size, timings):
+        pending = deque()
+
+        # Keep at most two blocks per worker in flight so memory stays bounded
+        for header, block in iter_csv_blocks(path, block_size):
+            pending.append(pool.submit(parse_block, header, block))
+            if len(pending) >= workers * 2:
+                self._write(importer, pending.popleft().result(), timings)
+        while pending:
+            self._write(importer, pending.popleft().result(), timings)
+
+    def _write(self, importer, parsed, timings):
+        frame, rejects, parse_seconds, coerce_seconds = parsed
+        timings["parse"] += parse_seconds
+        timings["coerce"] += coerce_seconds
+
+        started = time.perf_counter()
+        importer.write_frame(frame, rejects)
+        timings["write"] += time.perf_counter() - started
+
+    def _import_arrow(self, importer, path, timings):
+        # Already typed: row groups are read and cast here, nothing to coerce
+        started = time.perf_counter()
+        for frame, rejects in iter_arrow_frames(path):
+            self._write(importer, (frame, rejects, time.perf_counter() - started, 0.0), timings)
+            started = time.perf_counter()
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0007_partners_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=255, verbose_name='File Name')),
+                ('file_path', models.CharField(max_length=500, verbose_name='Spooled File')),
+                ('file_size', models.BigIntegerField(default=0, verbose_name='File Size')),
+                ('bytes_done', models.BigIntegerField(default=0, verbose_name='Bytes Read')),
+                ('rows_done', models.BigIntegerField(default=0, verbose_name='Rows Imported')),
+                ('rows_rejected', models.BigIntegerField(default=0, verbose_name='Rows Rejected')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20, verbose_name='Status')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Import Job',
+                'verbose_name_plural': 'Import Jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
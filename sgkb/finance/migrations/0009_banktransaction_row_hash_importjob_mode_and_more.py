@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0008_importjob_alter_banktransaction_catagory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banktransaction',
+            name='row_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True, verbose_name='Row Hash'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='mode',
+            field=models.CharField(choices=[('insert', 'Insert all rows'), ('skip', 'Skip known transactions'), ('update', 'Update changed transactions')], default='skip', max_length=20, verbose_name='Mode'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='rows_skipped',
+            field=models.BigIntegerField(default=0, verbose_name='Rows Skipped'),
+        ),
+        migrations.AddConstraint(
+            model_name='banktransaction',
+            constraint=models.UniqueConstraint(fields=('trx_id', 'row_hash'), name='finance_banktransaction_trx_row_hash_uniq'),
+        ),
+    ]
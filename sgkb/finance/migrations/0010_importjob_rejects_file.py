@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0009_banktransaction_row_hash_importjob_mode_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='rejects_file',
+            field=models.CharField(blank=True, default='', max_length=500, verbose_name='Rejected Rows File'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0010_importjob_rejects_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='incremental',
+            field=models.BooleanField(default=False, verbose_name='Incremental'),
+        ),
+        migrations.CreateModel(
+            name='ImportWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(default='default', max_length=100, verbose_name='Source')),
+                ('account_name', models.CharField(max_length=255, verbose_name='Money Account Name')),
+                ('max_trx_date', models.DateField(verbose_name='Max Transaction Date')),
+                ('max_trx_id', models.BigIntegerField(verbose_name='Max Transaction ID')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Import Watermark',
+                'verbose_name_plural': 'Import Watermarks',
+                'constraints': [models.UniqueConstraint(fields=('source', 'account_name'), name='finance_importwatermark_source_account_uniq')],
+            },
+        ),
+    ]
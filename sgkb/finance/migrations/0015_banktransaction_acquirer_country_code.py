@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0014_banktransaction_val_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banktransaction',
+            name='acquirer_country_code',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=2, null=True, verbose_name='Acquirer Country Code'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0015_banktransaction_acquirer_country_code'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['direction', 'val_date'], name='finance_bt_dir_val_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['direction', 'catagory', 'amount'], name='finance_bt_dir_cat_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['catagory', 'val_date'], name='finance_bt_cat_val_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['acquirer_country_code', 'val_date'], name='finance_bt_ctry_val_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='banktransaction',
+            index=models.Index(fields=['logo', 'val_date'], name='finance_bt_logo_val_date_idx'),
+        ),
+        # The composite indexes above start with these columns
+        migrations.AlterField(
+            model_name='banktransaction',
+            name='acquirer_country_code',
+            field=models.CharField(blank=True, editable=False, max_length=2, null=True, verbose_name='Acquirer Country Code'),
+        ),
+        # Also catches the migration state up with the 'category' verbose name the model already had
+        migrations.AlterField(
+            model_name='banktransaction',
+            name='catagory',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='finance.catagory', verbose_name='category'),
+        ),
+        migrations.AlterField(
+            model_name='banktransaction',
+            name='logo',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='finance.logo', verbose_name='URL'),
+        ),
+    ]
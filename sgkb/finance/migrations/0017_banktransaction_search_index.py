@@ -0,0 +1,132 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:30
+
+from django.db import migrations
+
+# The SQL is spelled out here rather than imported from finance.utils.search,
+# so later changes to that module cannot change what this migration does.
+
+SQLITE_INSTALL = [
+    # External content: the FTS table stores only the index, the text stays in the transactions table
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS finance_banktransaction_fts USING fts5(
+        text_short_creditor, text_creditor, text_short_debitor, text_debitor, point_of_sale_and_location,
+        customer_name, account_name, cred_acc_text, cred_iban, cred_addr_text, cred_ref_nr, cred_info,
+        content='finance_banktransaction', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS finance_banktransaction_fts_insert AFTER INSERT ON finance_banktransaction BEGIN
+        INSERT INTO finance_banktransaction_fts (
+            rowid, text_short_creditor, text_creditor, text_short_debitor, text_debitor, point_of_sale_and_location,
+            customer_name, account_name, cred_acc_text, cred_iban, cred_addr_text, cred_ref_nr, cred_info
+        ) VALUES (
+            new.id, new.text_short_creditor, new.text_creditor, new.text_short_debitor, new.text_debitor,
+            new.point_of_sale_and_location, new.customer_name, new.account_name, new.cred_acc_text, new.cred_iban,
+            new.cred_addr_text, new.cred_ref_nr, new.cred_info
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS finance_banktransaction_fts_delete AFTER DELETE ON finance_banktransaction BEGIN
+        INSERT INTO finance_banktransaction_fts (
+            finance_banktransaction_fts, rowid, text_short_creditor, text_creditor, text_short_debitor, text_debitor,
+            point_of_sale_and_location, customer_name, account_name, cred_acc_text, cred_iban, cred_addr_text,
+            cred_ref_nr, cred_info
+        ) VALUES (
+            'delete', old.id, old.text_short_creditor, old.text_creditor, old.text_short_debitor, old.text_debitor,
+            old.point_of_sale_and_location, old.customer_name, old.account_name, old.cred_acc_text, old.cred_iban,
+            old.cred_addr_text, old.cred_ref_nr, old.cred_info
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS finance_banktransaction_fts_update AFTER UPDATE OF
+        text_short_creditor, text_creditor, text_short_debitor, text_debitor, point_of_sale_and_location,
+        customer_name, account_name, cred_acc_text, cred_iban, cred_addr_text, cred_ref_nr, cred_info
+    ON finance_banktransaction BEGIN
+        INSERT INTO finance_banktransaction_fts (
+            finance_banktransaction_fts, rowid, text_short_creditor, text_creditor, text_short_debitor, text_debitor,
+            point_of_sale_and_location, customer_name, account_name, cred_acc_text, cred_iban, cred_addr_text,
+            cred_ref_nr, cred_info
+        ) VALUES (
+            'delete', old.id, old.text_short_creditor, old.text_creditor, old.text_short_debitor, old.text_debitor,
+            old.point_of_sale_and_location, old.customer_name, old.account_name, old.cred_acc_text, old.cred_iban,
+            old.cred_addr_text, old.cred_ref_nr, old.cred_info
+        );
+        INSERT INTO finance_banktransaction_fts (
+            rowid, text_short_creditor, text_creditor, text_short_debitor, text_debitor, point_of_sale_and_location,
+            customer_name, account_name, cred_acc_text, cred_iban, cred_addr_text, cred_ref_nr, cred_info
+        ) VALUES (
+            new.id, new.text_short_creditor, new.text_creditor, new.text_short_debitor, new.text_debitor,
+            new.point_of_sale_and_location, new.customer_name, new.account_name, new.cred_acc_text, new.cred_iban,
+            new.cred_addr_text, new.cred_ref_nr, new.cred_info
+        );
+    END
+    """,
+    "INSERT INTO finance_banktransaction_fts (finance_banktransaction_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS finance_banktransaction_fts_insert",
+    "DROP TRIGGER IF EXISTS finance_banktransaction_fts_delete",
+    "DROP TRIGGER IF EXISTS finance_banktransaction_fts_update",
+    "DROP TABLE IF EXISTS finance_banktransaction_fts",
+]
+
+TRIGRAM_FIELDS = ("text_short_creditor", "text_creditor", "text_debitor", "cred_addr_text", "cred_info")
+
+POSTGRESQL_INSTALL = [
+    # The search query repeats this expression exactly, so PostgreSQL can use the index
+    """
+    CREATE INDEX IF NOT EXISTS finance_bt_search_idx ON finance_banktransaction USING gin ((
+        to_tsvector('simple', coalesce(text_short_creditor, '') || ' ' || coalesce(text_creditor, '') || ' ' ||
+        coalesce(text_short_debitor, '') || ' ' || coalesce(text_debitor, '') || ' ' ||
+        coalesce(point_of_sale_and_location, '') || ' ' || coalesce(customer_name, '') || ' ' ||
+        coalesce(account_name, '') || ' ' || coalesce(cred_acc_text, '') || ' ' || coalesce(cred_iban, '') || ' ' ||
+        coalesce(cred_addr_text, '') || ' ' || coalesce(cred_ref_nr, '') || ' ' || coalesce(cred_info, ''))
+    ))
+    """,
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+] + [
+    # Same expression as Django's icontains: UPPER(column::text) LIKE UPPER('%…%')
+    f"CREATE INDEX IF NOT EXISTS finance_bt_{field}_trgm ON finance_banktransaction "
+    f"USING gin ((UPPER({field}::text)) gin_trgm_ops)"
+    for field in TRIGRAM_FIELDS
+]
+
+POSTGRESQL_UNINSTALL = ["DROP INDEX IF EXISTS finance_bt_search_idx"] + [
+    f"DROP INDEX IF EXISTS finance_bt_{field}_trgm" for field in TRIGRAM_FIELDS
+]
+
+STATEMENTS = {
+    "sqlite": (SQLITE_INSTALL, SQLITE_UNINSTALL),
+    "postgresql": (POSTGRESQL_INSTALL, POSTGRESQL_UNINSTALL),
+}
+
+
+def _run(schema_editor, install):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for sql in statements[0 if install else 1]:
+        schema_editor.execute(sql, params=None)
+
+
+def install_search_index(apps, schema_editor):
+    _run(schema_editor, install=True)
+
+
+def uninstall_search_index(apps, schema_editor):
+    _run(schema_editor, install=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0016_banktransaction_hot_query_indexes'),
+    ]
+
+    operations = [
+        # FTS5 table and triggers on SQLite, GIN tsvector and trigram indexes on PostgreSQL
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -1,4 +1,7 @@
+from pathlib import Path
+
 from django.db import models
+from django.utils import timezone
 
 class Logo(models.Model):
     name = models.CharField(max_length=255, unique=True)  # e.g. "COOP"
@@ -45,6 +48,7 @@ class BankTransaction(models.Model):
     point_of_sale_and_location = models.CharField(max_length=255, blank=True, null=True, verbose_name="POS & Location")  # POINT_OF_SALE_AND_LOCATION
     acquirer_country_id = models.IntegerField(blank=True, null=True, verbose_name="Acquirer Country ID")  # ACQUIRER_COUNTRY_ID
     acquirer_country_name = models.CharField(max_length=100, blank=True, null=True, verbose_name="Acquirer Country")  # ACQUIRER_COUNTRY_NAME
+    acquirer_country_code = models.CharField(max_length=2, blank=True, null=True, editable=False, verbose_name="Acquirer Country Code")  # ISO alpha-2, derived from ACQUIRER_COUNTRY_NAME
 
     card_id = models.CharField(max_length=50, blank=True, null=True, verbose_name="Card ID")  # CARD_ID
 
@@ -54,12 +58,33 @@ class BankTransaction(models.Model):
     cred_ref_nr = models.CharField(max_length=100, blank=True, null=True, verbose_name="Creditor Reference Number")  # CRED_REF_NR
     cred_info = models.TextField(blank=True, null=True, verbose_name="Creditor Info")  # CRED_INFO
 
-    logo = models.ForeignKey(Logo, verbose_name='URL', blank=True, null=True, on_delete=models.SET_NULL)
-    catagory = models.ForeignKey(Catagory, verbose_name='category', blank=True, null=True, on_delete=models.SET_NULL)
+    # db_index=False: the composite indexes below start with these columns
+    logo = models.ForeignKey(Logo, verbose_name='URL', blank=True, null=True, on_delete=models.SET_NULL, db_index=False)
+    catagory = models.ForeignKey(Catagory, verbose_name='category', blank=True, null=True, on_delete=models.SET_NULL, db_index=False)
+
+    row_hash = models.CharField(max_length=32, blank=True, null=True, editable=False, verbose_name="Row Hash")  # content hash set by the importer
     class Meta:
         verbose_name = "Bank Transaction"
         verbose_name_plural = "Bank Transactions"
         ordering = ['-val_date']
+        constraints = [
+            models.UniqueConstraint(fields=["trx_id", "row_hash"], name="finance_banktransaction_trx_row_hash_uniq"),
+        ]
+        # Matched to the access paths registered in finance.utils.query_plans;
+        # `manage.py check_query_plans` fails when one of them scans the table
+        indexes = [
+            # keyset pagination in bankTransactionsConnection walks (val_date, id) backwards
+            models.Index(fields=["val_date", "id"], name="finance_bt_val_date_id_idx"),
+            # direction filters with date ranges and the default ordering; recurring payment detection
+            models.Index(fields=["direction", "val_date"], name="finance_bt_dir_val_date_idx"),
+            # totalsByCategory (outgoing only) reads nothing but this index
+            models.Index(fields=["direction", "catagory", "amount"], name="finance_bt_dir_cat_amount_idx"),
+            # category and country filters, newest first
+            models.Index(fields=["catagory", "val_date"], name="finance_bt_cat_val_date_idx"),
+            models.Index(fields=["acquirer_country_code", "val_date"], name="finance_bt_ctry_val_date_idx"),
+            # transactions still waiting for logo enrichment, newest first
+            models.Index(fields=["logo", "val_date"], name="finance_bt_logo_val_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.trx_id} - {self.customer_name} - {self.amount} {self.trx_curry_name}"
@@ -71,4 +96,142 @@ class Partners(models.Model):
 
 class Recommendation(models.Model):
     name = models.CharField(max_length=255, verbose_name="Partner Name")
-    description = models.TextField(max_length=255, verbose_name="Description")
\ No newline at end of file
+    description = models.TextField(max_length=255, verbose_name="Description")
+
+class ImportWatermark(models.Model):
+    """
+    Highest (trx_date, trx_id) imported per source and account.
+    Incremental imports drop every row at or below it before touching the database.
+    """
+    source = models.CharField(max_length=100, default="default", verbose_name="Source")
+    account_name = models.CharField(max_length=255, verbose_name="Money Account Name")
+    max_trx_date = models.DateField(verbose_name="Max Transaction Date")
+    max_trx_id = models.BigIntegerField(verbose_name="Max Transaction ID")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Import Watermark"
+        verbose_name_plural = "Import Watermarks"
+        constraints = [
+            models.UniqueConstraint(fields=["source", "account_name"], name="finance_importwatermark_source_account_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.source}/{self.account_name}: {self.max_trx_date} #{self.max_trx_id}"
+
+
+class ImportJob(models.Model):
+    MODE_INSERT = "insert"
+    MODE_SKIP = "skip"
+    MODE_UPDATE = "update"
+    MODE_CHOICES = [
+        (MODE_INSERT, "Insert all rows"),
+        (MODE_SKIP, "Skip known transactions"),
+        (MODE_UPDATE, "Update changed transactions"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    file_name = models.CharField(max_length=255, verbose_name="File Name")
+    file_path = models.CharField(max_length=500, verbose_name="Spooled File")
+    file_size = models.BigIntegerField(default=0, verbose_name="File Size")
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default=MODE_SKIP, verbose_name="Mode")
+    incremental = models.BooleanField(default=False, verbose_name="Incremental")
+    bytes_done = models.BigIntegerField(default=0, verbose_name="Bytes Read")
+    rows_done = models.BigIntegerField(default=0, verbose_name="Rows Imported")
+    rows_rejected = models.BigIntegerField(default=0, verbose_name="Rows Rejected")
+    rows_skipped = models.BigIntegerField(default=0, verbose_name="Rows Skipped")
+    rejects_file = models.CharField(max_length=500, blank=True, default="", verbose_name="Rejected Rows File")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Status")
+    error = models.TextField(blank=True, default="", verbose_name="Error")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Import Job"
+        verbose_name_plural = "Import Jobs"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+    @property
+    def progress(self):
+        """Share of the spooled file read so far, between 0 and 1."""
+        if self.status == self.STATUS_DONE:
+            return 1.0
+        return min(self.bytes_done / self.file_size, 1.0) if self.file_size else 0.0
+
+    @property
+    def has_rejects(self):
+        return bool(self.rows_rejected and self.rejects_file and Path(self.rejects_file).exists())
+
+    @property
+    def rows_per_second(self):
+        """Rows processed (imported, skipped or rejected) per second since the job started."""
+        if not self.started_at:
+            return None
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        rows = self.rows_done + self.rows_skipped + self.rows_rejected
+        return rows / elapsed if elapsed > 0 else None
+
+    @property
+    def eta_seconds(self):
+        """Remaining seconds, extrapolated from the bytes read so far."""
+        if self.status != self.STATUS_RUNNING or not self.started_at or not self.bytes_done:
+            return None
+        elapsed = (timezone.now() - self.started_at).total_seconds()
+        return elapsed / self.bytes_done * max(self.file_size - self.bytes_done, 0)
+
+
+class ExportJob(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    file_name = models.CharField(max_length=255, verbose_name="File Name")
+    file_path = models.CharField(max_length=500, blank=True, default="", verbose_name="Export File")
+    params = models.JSONField(default=dict, blank=True, verbose_name="Filters and Columns")
+    rows_total = models.BigIntegerField(default=0, verbose_name="Rows to Export")
+    rows_done = models.BigIntegerField(default=0, verbose_name="Rows Written")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Status")
+    error = models.TextField(blank=True, default="", verbose_name="Error")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Export Job"
+        verbose_name_plural = "Export Jobs"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+    @property
+    def progress(self):
+        """Share of the rows written so far, between 0 and 1."""
+        if self.status == self.STATUS_DONE:
+            return 1.0
+        return min(self.rows_done / self.rows_total, 1.0) if self.rows_total else 0.0
+
+    @property
+    def is_ready(self):
+        return self.status == self.STATUS_DONE and bool(self.file_path) and Path(self.file_path).exists()
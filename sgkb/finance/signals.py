@@ -0,0 +1,29 @@
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import BankTransaction, Catagory, Logo
+from .utils import search
+from .utils.cache import bump_data_version
+from .utils.countries import country_code
+
+
+@receiver(pre_save, sender=BankTransaction)
+def set_country_code(sender, instance, **kwargs):
+    """Single-row saves (admin, shell) keep the code in step with the country name, as the importer does."""
+    instance.acquirer_country_code = country_code(instance.acquirer_country_name)
+
+
+@receiver([post_save, post_delete], sender=BankTransaction)
+@receiver([post_save, post_delete], sender=Catagory)
+@receiver([post_save, post_delete], sender=Logo)
+def invalidate_cached_results(sender, **kwargs):
+    """Admin edits, logo enrichment and other single-row writes invalidate the aggregate cache."""
+    transaction.on_commit(bump_data_version)
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, using, **kwargs):
+    """Migrations that rebuild the transactions table on SQLite drop the search triggers."""
+    if sender.name == "finance":
+        search.repair(connections[using])
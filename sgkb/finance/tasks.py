@@ -1,8 +1,15 @@
 from celery import shared_task
 import time
+from pathlib import Path
 
+from django.conf import settings
+from django.utils import timezone
+
+from .forms import ExportFilterForm
+from .utils.export import export_rows, write_xlsx
+from .utils.importer import TransactionImporter
 from .utils.logo import search_logo, extract_company_name
-from finance.models import BankTransaction, Logo
+from finance.models import BankTransaction, ExportJob, ImportJob, Logo
 
 
 @shared_task
@@ -21,10 +28,8 @@ def enrich_transaction_logos():
 
     count_new, count_linked = 0, 0
 
-    for tx in BankTransaction.objects.all()[:10]:
-        if tx.logo:  # already linked
-            continue
-
+    # Unlinked transactions only, newest first (finance_bt_logo_val_date_idx)
+    for tx in BankTransaction.objects.filter(logo__isnull=True)[:10]:
         company = extract_company_name(tx)
         if not company:
             continue
@@ -53,4 +58,76 @@ def enrich_transaction_logos():
         else:
             print(f"⚠️ No logo found for {company}")
 
-    print(f"Done. Linked {count_linked}, created {count_new} new logos.")
\ No newline at end of file
+    print(f"Done. Linked {count_linked}, created {count_new} new logos.")
+
+
+@shared_task
+def import_transactions_file(job_id):
+    """
+    Stream a spooled export into BankTransactions and keep the
+    ImportJob progress record up to date after every chunk.
+    Rejected rows are collected in a CSV next to the spooled file.
+    """
+    job = ImportJob.objects.get(pk=job_id)
+    jobs = ImportJob.objects.filter(pk=job.pk)
+    rejects_file = f"{job.file_path}.rejects.csv"
+    jobs.update(status=ImportJob.STATUS_RUNNING, started_at=timezone.now(), rejects_file=rejects_file)
+
+    try:
+        with open(job.file_path, "rb") as fh:
+            def on_chunk(result):
+                jobs.update(
+                    bytes_done=fh.tell(),
+                    rows_done=result.inserted + result.updated,
+                    rows_rejected=result.rejected,
+                    rows_skipped=result.skipped,
+                )
+
+            importer = TransactionImporter(mode=job.mode, rejects_path=rejects_file, incremental=job.incremental)
+            result = importer.import_file(fh, on_chunk=on_chunk)
+    except Exception as e:
+        jobs.update(status=ImportJob.STATUS_FAILED, error=str(e), finished_at=timezone.now())
+        print(f"⚠️ Import job {job.pk} failed: {e}")
+    else:
+        jobs.update(
+            status=ImportJob.STATUS_DONE,
+            bytes_done=job.file_size,
+            rows_done=result.inserted + result.updated,
+            rows_rejected=result.rejected,
+            rows_skipped=result.skipped,
+            finished_at=timezone.now(),
+        )
+        print(f"✅ Import job {job.pk}: {result}")
+    finally:
+        Path(job.file_path).unlink(missing_ok=True)
+
+
+@shared_task
+def export_transactions_excel(job_id):
+    """
+    Write the filtered transactions into an .xlsx file in EXPORT_DIR with
+    a write-only workbook, so memory use does not grow with the table.
+    Sheets are split at Excel's row limit.
+    """
+    job = ExportJob.objects.get(pk=job_id)
+    jobs = ExportJob.objects.filter(pk=job.pk)
+    export_dir = Path(settings.EXPORT_DIR)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    path = export_dir / f"export-{job.pk}-{job.file_name}"
+    jobs.update(status=ExportJob.STATUS_RUNNING, started_at=timezone.now(), file_path=str(path))
+
+    try:
+        # params were validated by the view already; a failure here means the form changed
+        form = ExportFilterForm(job.params)
+        if not form.is_valid():
+            raise ValueError(f"Invalid export parameters: {form.errors.as_text()}")
+        columns = form.cleaned_data["columns"]
+        rows = export_rows(form.queryset(), columns)
+        count = write_xlsx(rows, path, columns, on_progress=lambda done: jobs.update(rows_done=done))
+    except Exception as e:
+        path.unlink(missing_ok=True)
+        jobs.update(status=ExportJob.STATUS_FAILED, error=str(e), finished_at=timezone.now())
+        print(f"⚠️ Export job {job.pk} failed: {e}")
+    else:
+        jobs.update(status=ExportJob.STATUS_DONE, rows_done=count, finished_at=timezone.now())
+        print(f"✅ Export job {job.pk}: {count} rows written to {path}")
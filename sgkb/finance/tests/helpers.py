@@ -0,0 +1,81 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from graphene_django.utils.testing import GraphQLTestCase
+
+from finance.models import BankTransaction
+
+HEADERS = ("TRX_ID", "MONEY_ACCOUNT_NAME", "VAL_DATE", "TRX_DATE", "DIRECTION", "AMOUNT", "TRX_CURRY_NAME", "TEXT_SHORT_CREDITOR")
+
+
+def export_row(trx_id, **values):
+    """One row of an SGKB export, as text."""
+    row = {
+        "TRX_ID": str(trx_id),
+        "MONEY_ACCOUNT_NAME": "Privatkonto",
+        "VAL_DATE": "2025-01-15",
+        "TRX_DATE": "2025-01-15",
+        "DIRECTION": "2",
+        "AMOUNT": "10.50",
+        "TRX_CURRY_NAME": "CHF",
+        "TEXT_SHORT_CREDITOR": f"Merchant {trx_id}",
+    }
+    row.update(values)
+    return row
+
+
+def export_csv(rows):
+    """An in-memory CSV export with the headers of every row."""
+    headers = list(HEADERS) + sorted({key for row in rows for key in row} - set(HEADERS))
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=headers)
+    writer.writeheader()
+    writer.writerows(rows)
+    return io.BytesIO(text.getvalue().encode())
+
+
+def create_transaction(trx_id, **values):
+    fields = {
+        "account_name": "Privatkonto",
+        "currency_type": "CHF",
+        "macc_type": "PK",
+        "produkt": "Privatkonto",
+        "customer_name": "Muster",
+        "trx_id": trx_id,
+        "trx_type_short": "K",
+        "trx_type_name": "Karte",
+        "buchungs_art_short": "B",
+        "buchungs_art_name": "Belastung",
+        "val_date": date(2025, 1, 15),
+        "trx_date": date(2025, 1, 15),
+        "direction": 2,
+        "amount": Decimal("10.00"),
+        "trx_curry_name": "CHF",
+    }
+    fields.update(values)
+    return BankTransaction.objects.create(**fields)
+
+
+class GraphQLCase(GraphQLTestCase):
+    """
+    Posts operations to the GraphQL endpoint. The cache is cleared first:
+    data version bumps run on commit, which never happens inside a TestCase.
+    """
+
+    GRAPHQL_URL = "/graphql/"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def execute(self, query, **variables):
+        """The ``data`` of a successful operation."""
+        response = self.query(query, variables=variables)
+        self.assertResponseNoErrors(response)
+        return response.json()["data"]
+
+    def errors(self, query, **variables):
+        return self.query(query, variables=variables).json()["errors"]
@@ -0,0 +1,63 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from finance.models import BankTransaction, Catagory, Partners
+from finance.utils.dimensions import DimensionCache
+from finance.utils.importer import TransactionImporter
+
+from .helpers import export_csv, export_row
+
+
+class DimensionCacheTests(TestCase):
+    def test_a_batch_of_new_and_known_keys_takes_three_queries(self):
+        Catagory.objects.create(name="Groceries")
+        cache = DimensionCache(Catagory)
+
+        # one IN query, one bulk insert of the missing names, one IN query for their ids
+        with self.assertNumQueries(3):
+            resolved = cache.resolve(["Groceries", "Travel", "Rent", "", "Travel"])
+
+        self.assertEqual(set(resolved), {"Groceries", "Travel", "Rent"})
+        self.assertTrue(all(category.pk for category in resolved.values()))
+        self.assertEqual(Catagory.objects.count(), 3)
+
+    def test_cached_keys_cost_no_queries(self):
+        cache = DimensionCache(Catagory)
+        cache.resolve(["Groceries", "Travel"])
+
+        with self.assertNumQueries(0):
+            cache.resolve(["Travel", "Groceries"])
+        with self.assertNumQueries(3):
+            cache.resolve(["Travel", "Rent"])
+
+    def test_lookup_without_create(self):
+        Partners.objects.create(name="Migros", customer_benifits="Cumulus")
+        cache = DimensionCache(Partners, create=False)
+
+        with self.assertNumQueries(1):
+            resolved = cache.resolve(["Migros", "Coop"])
+
+        self.assertEqual(set(resolved), {"Migros"})
+        self.assertFalse(Partners.objects.filter(name="Coop").exists())
+
+    def test_preload_fills_the_cache_with_one_query(self):
+        Catagory.objects.bulk_create([Catagory(name="Groceries"), Catagory(name="Travel")])
+        cache = DimensionCache(Catagory)
+
+        with self.assertNumQueries(1):
+            cache.preload()
+        with self.assertNumQueries(0):
+            cache.resolve(["Groceries", "Travel"])
+
+    def test_later_chunks_do_not_query_known_categories(self):
+        rows = [export_row(trx_id, category=["Groceries", "Travel"][trx_id % 2]) for trx_id in range(1, 7)]
+
+        with CaptureQueriesContext(connection) as queries:
+            TransactionImporter().import_file(export_csv(rows), chunksize=2)
+
+        category_queries = [query["sql"] for query in queries if '"finance_catagory"' in query["sql"]]
+        # The first chunk fetches, inserts and re-fetches both names; the other two chunks hit the cache
+        self.assertEqual(len(category_queries), 3)
+        self.assertEqual(Catagory.objects.count(), 2)
+        self.assertEqual(BankTransaction.objects.filter(catagory__name="Groceries").count(), 3)
@@ -0,0 +1,135 @@
+import csv
+import io
+import tempfile
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import openpyxl
+from django.test import TestCase, override_settings
+
+from finance.models import ExportJob
+from finance.tasks import export_transactions_excel
+from finance.utils.export import write_xlsx
+
+from .helpers import create_transaction
+
+
+class CSVExportTests(TestCase):
+    def export(self, **params):
+        response = self.client.get("/export/csv/", params)
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_streams_one_line_per_transaction(self):
+        for trx_id in range(1, 1201):
+            create_transaction(trx_id)
+
+        rows = self.export()
+
+        self.assertEqual(rows[0][:2], ["ZEILEN_NR", "MONEY_ACCOUNT_NAME"])
+        self.assertEqual(len(rows), 1201)
+        self.assertEqual([row[0] for row in rows[1:]], [str(number) for number in range(1, 1201)])
+
+    def test_empty_export_has_the_header_only(self):
+        self.assertEqual(len(self.export()), 1)
+
+
+class ExcelExportTests(TestCase):
+    def test_sheets_are_split_with_a_header_each(self):
+        rows = ([number, f"row {number}"] for number in range(1, 6))
+        columns = [("MONEY_ACCOUNT_NAME", "account_name")]
+        target = io.BytesIO()
+
+        count = write_xlsx(rows, target, columns, sheet_rows=2)
+
+        workbook = openpyxl.load_workbook(target, read_only=True)
+        sheets = [list(sheet.values) for sheet in workbook.worksheets]
+        self.assertEqual(count, 5)
+        self.assertEqual(workbook.sheetnames, ["Transactions", "Transactions (2)", "Transactions (3)"])
+        self.assertEqual([len(sheet) for sheet in sheets], [3, 3, 2])
+        self.assertTrue(all(sheet[0] == ("ZEILEN_NR", "MONEY_ACCOUNT_NAME") for sheet in sheets))
+        self.assertEqual(sheets[2][1], (5, "row 5"))
+
+    def test_small_exports_are_returned_directly(self):
+        create_transaction(1)
+
+        response = self.client.get("/export/excel/")
+
+        workbook = openpyxl.load_workbook(io.BytesIO(b"".join(response.streaming_content)), read_only=True)
+        self.assertEqual(len(list(workbook.active.values)), 2)
+
+    @override_settings(EXCEL_EXPORT_SYNC_LIMIT=1)
+    def test_large_exports_run_as_a_job(self):
+        create_transaction(1)
+        create_transaction(2)
+
+        with patch("finance.views.export_transactions_excel.delay") as delay:
+            response = self.client.get("/export/excel/", {"direction": 2})
+
+        job = ExportJob.objects.get()
+        delay.assert_called_once_with(job.pk)
+        self.assertRedirects(response, f"/export/jobs/{job.pk}/", fetch_redirect_response=False)
+        self.assertEqual((job.rows_total, job.params), (2, {"direction": "2"}))
+
+    def test_export_job_writes_the_workbook(self):
+        create_transaction(1)
+        job = ExportJob.objects.create(file_name="transactions.xlsx", params={}, rows_total=1)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(EXPORT_DIR=directory):
+            export_transactions_excel(job.pk)
+            job.refresh_from_db()
+            workbook = openpyxl.load_workbook(job.file_path, read_only=True)
+            lines = len(list(workbook.active.values))
+            workbook.close()
+
+        self.assertEqual((job.status, job.rows_done, lines), (ExportJob.STATUS_DONE, 1, 2))
+
+
+class FilteredExportTests(TestCase):
+    def test_filters_and_columns_apply_to_the_export(self):
+        create_transaction(1, direction=1, amount=Decimal("500.00"))
+        create_transaction(2, direction=2, amount=Decimal("12.00"))
+        create_transaction(3, direction=2, amount=Decimal("80.00"))
+
+        response = self.client.get("/export/csv/", {"direction": 2, "maxAmount": "50", "columns": "AMOUNT,TRX_ID"})
+
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        # columns keep the export order, whatever order they were requested in
+        self.assertEqual(rows, [["ZEILEN_NR", "TRX_ID", "AMOUNT"], ["1", "2", "12.00"]])
+
+    def test_invalid_parameters_are_rejected(self):
+        response = self.client.get("/export/csv/", {"columns": "TRX_ID,NOPE", "startDate": "yesterday"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"columns", "start_date"})
+
+
+class ArrowExportTests(TestCase):
+    def test_parquet_export_keeps_the_column_types(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        create_transaction(12345678901234567, amount=Decimal("-3.25"))
+
+        response = self.client.get("/export/parquet/", {"columns": "TRX_ID,VAL_DATE,AMOUNT"})
+
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(table.schema.field("AMOUNT").type, pa.decimal128(12, 2))
+        self.assertEqual(table.schema.field("VAL_DATE").type, pa.date32())
+        self.assertEqual(
+            table.to_pylist(),
+            [{"ZEILEN_NR": 1, "TRX_ID": 12345678901234567, "VAL_DATE": date(2025, 1, 15), "AMOUNT": Decimal("-3.25")}],
+        )
+
+    def test_arrow_export_reads_back(self):
+        import pyarrow as pa
+
+        create_transaction(1)
+        create_transaction(2)
+
+        response = self.client.get("/export/arrow/", {"columns": "TRX_ID"})
+
+        table = pa.ipc.open_file(pa.BufferReader(b"".join(response.streaming_content))).read_all()
+        self.assertEqual(sorted(table.column("TRX_ID").to_pylist()), [1, 2])
@@ -0,0 +1,460 @@
+import asyncio
+from contextlib import ExitStack, contextmanager
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from finance.models import BankTransaction, Catagory, Logo
+from finance.utils.cache import data_version
+from sgkb.graphql.view import query_hash
+
+from .helpers import GraphQLCase, create_transaction
+
+CONNECTION_QUERY = """
+    query ($first: Int, $after: String) {
+        bankTransactionsConnection(first: $first, after: $after) {
+            totalCount
+            edges { node { trxId } }
+            pageInfo { hasNextPage hasPreviousPage endCursor }
+        }
+    }
+"""
+
+
+def amounts(rows, *names):
+    """Rows with the Decimal fields ``names`` parsed; the scale of summed decimals differs per database."""
+    return [{**row, **{name: Decimal(row[name]) for name in names}} for row in rows]
+
+
+class ConnectionTests(GraphQLCase):
+    def setUp(self):
+        super().setUp()
+        # Two transactions per day: ties on val_date are broken by id
+        for trx_id in range(1, 6):
+            create_transaction(trx_id, val_date=date(2025, 1, 10 + trx_id // 2))
+
+    def page(self, first, after=None):
+        return self.execute(CONNECTION_QUERY, first=first, after=after)["bankTransactionsConnection"]
+
+    def test_pages_follow_each_other_newest_first(self):
+        seen, after, pages = [], None, 0
+        while True:
+            page = self.page(2, after)
+            seen += [edge["node"]["trxId"] for edge in page["edges"]]
+            self.assertEqual(page["pageInfo"]["hasPreviousPage"], after is not None)
+            self.assertEqual(page["totalCount"], 5)
+            pages += 1
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            after = page["pageInfo"]["endCursor"]
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [5, 4, 3, 2, 1])
+
+    def test_bad_cursors_are_reported(self):
+        errors = self.errors(CONNECTION_QUERY, first=2, after="not a cursor")
+
+        self.assertEqual(errors[0]["message"], "Invalid cursor: not a cursor")
+
+    def test_page_size_is_limited(self):
+        for first in (0, 501):
+            errors = self.errors(CONNECTION_QUERY, first=first)
+            self.assertEqual(errors[0]["message"], "first must be between 1 and 500.")
+
+
+class PersistedQueryTests(GraphQLCase):
+    QUERY = "{ bankTransactionsConnection(first: 1) { totalCount } }"
+
+    def post(self, **body):
+        return self.client.post(self.GRAPHQL_URL, body, content_type="application/json").json()
+
+    def persisted(self, sha256):
+        return {"persistedQuery": {"version": 1, "sha256Hash": sha256}}
+
+    def test_unknown_hash_is_registered_with_the_query(self):
+        sha256 = query_hash(self.QUERY)
+
+        missing = self.post(extensions=self.persisted(sha256))
+        registered = self.post(query=self.QUERY, extensions=self.persisted(sha256))
+        by_hash = self.post(extensions=self.persisted(sha256))
+
+        self.assertEqual(missing["errors"][0]["extensions"]["code"], "PERSISTED_QUERY_NOT_FOUND")
+        self.assertEqual(registered["data"], by_hash["data"])
+        self.assertEqual(by_hash["data"], {"bankTransactionsConnection": {"totalCount": 0}})
+
+    def test_hash_must_match_the_query(self):
+        response = self.post(query=self.QUERY, extensions=self.persisted("0" * 64))
+
+        self.assertEqual(response["errors"][0]["extensions"]["code"], "INVALID_PERSISTED_QUERY")
+
+
+class AggregateTests(GraphQLCase):
+    def setUp(self):
+        super().setUp()
+        groceries = Catagory.objects.create(name="Groceries")
+        create_transaction(1, catagory=groceries, amount=Decimal("10.00"), val_date=date(2025, 1, 5))
+        create_transaction(2, catagory=groceries, amount=Decimal("30.00"), val_date=date(2025, 2, 5))
+        create_transaction(3, amount=Decimal("5.00"), val_date=date(2025, 2, 6))
+        create_transaction(4, catagory=groceries, amount=Decimal("100.00"), direction=1, val_date=date(2025, 2, 7))
+
+    def test_groups_by_dimensions_with_the_requested_measures(self):
+        data = self.execute("""
+            {
+                aggregate(dimensions: [CATEGORY, MONTH], measures: [SUM, COUNT, MAX], direction: 2) {
+                    category month sum count max avg
+                }
+            }
+        """)
+
+        self.assertEqual(amounts(data["aggregate"], "sum", "max"), [
+            {"category": None, "month": "2025-02-01", "sum": Decimal(5), "count": 1, "max": Decimal(5), "avg": None},
+            {"category": "Groceries", "month": "2025-01-01", "sum": Decimal(10), "count": 1, "max": Decimal(10), "avg": None},
+            {"category": "Groceries", "month": "2025-02-01", "sum": Decimal(30), "count": 1, "max": Decimal(30), "avg": None},
+        ])
+
+    def test_without_dimensions_returns_one_row(self):
+        data = self.execute("{ aggregate(measures: [SUM, COUNT]) { sum count category } }")
+
+        self.assertEqual(amounts(data["aggregate"], "sum"), [{"sum": Decimal(145), "count": 4, "category": None}])
+
+    def test_measures_are_required(self):
+        errors = self.errors("{ aggregate(measures: []) { sum } }")
+
+        self.assertEqual(errors[0]["message"], "At least one measure is required.")
+
+
+class QueryCostTests(GraphQLCase):
+    QUERY = "{ bankTransactions { trxId amount } }"
+
+    def setUp(self):
+        super().setUp()
+        for trx_id in range(1, 11):
+            create_transaction(trx_id)
+
+    def test_cost_is_reported_with_the_result(self):
+        response = self.query(self.QUERY)
+
+        self.assertResponseNoErrors(response)
+        self.assertEqual(response.json()["extensions"]["cost"]["budget"], settings.GRAPHQL_MAX_COST)
+
+    def test_operations_over_the_budget_are_refused(self):
+        with override_settings(GRAPHQL_MAX_COST=5):
+            response = self.query(self.QUERY)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("data", response.json())
+        extensions = response.json()["errors"][0]["extensions"]
+        self.assertEqual(extensions["code"], "QUERY_TOO_EXPENSIVE")
+        self.assertEqual(extensions["budget"], 5)
+        self.assertGreater(extensions["cost"], 5)
+
+    def estimate(self, arguments=None):
+        arguments = f"({arguments})" if arguments else ""
+        response = self.query(f"{{ bankTransactions{arguments} {{ trxId amount }} }}")
+        self.assertResponseNoErrors(response)
+        return response.json()["extensions"]["cost"]["estimated"]
+
+    def test_filters_that_match_every_row_do_not_lower_the_estimate(self):
+        unfiltered = self.estimate()
+
+        for arguments in ('search: " -- "', 'startDate: "1900-01-01"', 'minAmount: "-1000000000000"', "direction: 0"):
+            with self.subTest(arguments):
+                self.assertEqual(self.estimate(arguments), unfiltered)
+
+    def test_filters_lower_the_estimate(self):
+        unfiltered = self.query(self.QUERY).json()["extensions"]["cost"]["estimated"]
+        filtered = self.query('{ bankTransactions(direction: 2, country: "CH") { trxId amount } }')
+
+        self.assertLess(filtered.json()["extensions"]["cost"]["estimated"], unfiltered)
+
+
+class BatchTests(GraphQLCase):
+    def post(self, body):
+        return self.client.post(self.GRAPHQL_URL, body, content_type="application/json")
+
+    def test_operations_are_answered_in_order(self):
+        create_transaction(1)
+
+        response = self.post([
+            {"id": 1, "query": "{ bankTransactionsConnection(first: 1) { totalCount } }"},
+            {"id": 2, "query": "{ nope }"},
+            {"id": 3, "query": "{ aggregate(measures: [COUNT]) { count } }"},
+        ])
+
+        results = response.json()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result["id"] for result in results], [1, 2, 3])
+        self.assertEqual([result["status"] for result in results], [200, 400, 200])
+        self.assertEqual(results[0]["data"], {"bankTransactionsConnection": {"totalCount": 1}})
+        self.assertEqual(results[2]["data"], {"aggregate": [{"count": 1}]})
+
+    @override_settings(GRAPHQL_MAX_BATCH_SIZE=2)
+    def test_batch_size_is_limited(self):
+        response = self.post([{"query": "{ aggregate { count } }"}] * 3)
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TimeSeriesTests(GraphQLCase):
+    QUERY = """
+        query ($granularity: TimeGranularity, $split: Boolean, $start: Date, $end: Date) {
+            timeSeries(granularity: $granularity, splitDirection: $split, startDate: $start, endDate: $end) {
+                period direction total count share runningTotal
+            }
+        }
+    """
+
+    def setUp(self):
+        super().setUp()
+        create_transaction(1, amount=Decimal("30.00"), val_date=date(2025, 1, 10))
+        create_transaction(2, amount=Decimal("10.00"), val_date=date(2025, 1, 20))
+        create_transaction(3, amount=Decimal("60.00"), val_date=date(2025, 3, 5))
+        create_transaction(4, amount=Decimal("200.00"), direction=1, val_date=date(2025, 2, 1))
+
+    def series(self, **variables):
+        return self.execute(self.QUERY, **variables)["timeSeries"]
+
+    def test_months_without_transactions_are_zero_filled(self):
+        series = self.series(granularity="MONTH", split=True, start="2024-12-01", end="2025-03-31")
+        outgoing = [point for point in series if point["direction"] == 2]
+
+        self.assertEqual([point["period"] for point in outgoing], ["2024-12-01", "2025-01-01", "2025-02-01", "2025-03-01"])
+        self.assertEqual([point["count"] for point in outgoing], [0, 2, 0, 1])
+        self.assertEqual([Decimal(point["total"]) for point in outgoing], [0, 40, 0, 60])
+        self.assertEqual([point["share"] for point in outgoing], [0.0, 40.0, 0.0, 60.0])
+        self.assertEqual([Decimal(point["runningTotal"]) for point in outgoing], [0, 40, 40, 100])
+        self.assertEqual(len(series), 8)
+
+    def test_range_defaults_to_the_periods_with_transactions(self):
+        series = self.series(granularity="QUARTER")
+
+        self.assertEqual(
+            [(point["period"], point["direction"], Decimal(point["total"])) for point in series],
+            [("2025-01-01", None, Decimal(300))],
+        )
+
+    def test_long_series_are_refused(self):
+        errors = self.errors(self.QUERY, granularity="DAY", start="2000-01-01", end="2025-01-01")
+
+        self.assertIn("more than 3660 points", errors[0]["message"])
+
+
+class CountryTests(GraphQLCase):
+    def setUp(self):
+        super().setUp()
+        create_transaction(1, acquirer_country_name="Schweiz", amount=Decimal("20.00"))
+        create_transaction(2, acquirer_country_name="Switzerland", amount=Decimal("5.00"))
+        create_transaction(3, acquirer_country_name="Deutschland", amount=None)
+        create_transaction(4, acquirer_country_name="Atlantis", amount=Decimal("7.00"))
+
+    def trx_ids(self, **filters):
+        query = """
+            query ($country: String, $countryCode: String) {
+                bankTransactions(country: $country, countryCode: $countryCode) { trxId }
+            }
+        """
+        return sorted(row["trxId"] for row in self.execute(query, **filters)["bankTransactions"])
+
+    def test_country_matches_part_of_the_name(self):
+        self.assertEqual(self.trx_ids(country="schwei"), [1])
+
+    def test_country_code_matches_every_spelling(self):
+        self.assertEqual(self.trx_ids(countryCode="ch"), [1, 2])
+
+    def test_totals_by_country_include_groups_without_amounts(self):
+        data = self.execute("{ totalsByCountry { country countryCode total } }")
+
+        self.assertEqual(
+            [(row["countryCode"], row["country"], row["total"] and Decimal(row["total"])) for row in data["totalsByCountry"]],
+            [("CH", "Schweiz", Decimal(25)), (None, "Atlantis", Decimal(7)), ("DE", "Deutschland", None)],
+        )
+
+
+class ProjectionTests(GraphQLCase):
+    def setUp(self):
+        super().setUp()
+        for trx_id in range(1, 6):
+            create_transaction(
+                trx_id,
+                catagory=Catagory.objects.create(name=f"Category {trx_id}"),
+                logo=Logo.objects.create(name=f"Merchant {trx_id}", url=f"https://logos.example/{trx_id}.png"),
+            )
+
+    def test_nested_foreign_keys_come_from_the_same_query(self):
+        query = "{ bankTransactions { trxId catagory { name } logo { name } logoUrl } }"
+
+        self.execute(query)  # fills the cached row count of the cost estimate
+        with CaptureQueriesContext(connection) as queries:
+            data = self.execute(query)
+
+        self.assertEqual(len(queries), 1)
+        self.assertIn("JOIN", queries[0]["sql"])
+        self.assertNotIn("cred_info", queries[0]["sql"])
+        self.assertEqual(
+            sorted((row["trxId"], row["catagory"]["name"], row["logoUrl"]) for row in data["bankTransactions"])[0],
+            (1, "Category 1", "https://logos.example/1.png"),
+        )
+
+    def test_connection_pages_select_the_node_fields_only(self):
+        query = "{ bankTransactionsConnection(first: 3) { edges { node { trxId catagory { name } } } } }"
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.execute(query)
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("cred_info", queries[0]["sql"])
+        self.assertEqual(len(data["bankTransactionsConnection"]["edges"]), 3)
+
+
+class LoaderTests(GraphQLCase):
+    def setUp(self):
+        super().setUp()
+        groceries, travel = Catagory.objects.create(name="Groceries"), Catagory.objects.create(name="Travel")
+        coop = Logo.objects.create(name="Coop", url="https://logos.example/coop.png")
+        sbb = Logo.objects.create(name="SBB", url="https://logos.example/sbb.png")
+        for trx_id in range(1, 7):
+            create_transaction(trx_id, catagory=[groceries, travel][trx_id % 2], logo=[coop, sbb][trx_id % 2])
+
+    def test_sibling_foreign_keys_are_loaded_in_one_query(self):
+        # The transactions below catagory are not projected, so their logos go through the loader
+        query = "{ bankTransactions { catagory { name banktransactionSet { trxId logo { name } } } } }"
+
+        self.execute(query)  # fills the cached row count of the cost estimate
+        with CaptureQueriesContext(connection) as queries:
+            data = self.execute(query)
+
+        tables = [
+            next(table for table in ("finance_logo", "finance_banktransaction") if f'FROM "{table}"' in query["sql"])
+            for query in queries
+        ]
+        # the transactions (joined with their categories), every category's transactions, every logo
+        self.assertEqual(tables, ["finance_banktransaction", "finance_banktransaction", "finance_logo"])
+        groups = {row["catagory"]["name"]: row["catagory"]["banktransactionSet"] for row in data["bankTransactions"]}
+        self.assertEqual(sorted(row["trxId"] for row in groups["Groceries"]), [2, 4, 6])
+        self.assertEqual({row["logo"]["name"] for row in groups["Travel"]}, {"SBB"})
+
+    def test_reverse_relations_are_loaded_in_one_query(self):
+        query = "{ bankTransactions { trxId catagory { banktransactionSet { trxId } } } }"
+
+        self.execute(query)
+        with self.assertNumQueries(2):
+            data = self.execute(query)
+
+        for row in data["bankTransactions"]:
+            siblings = [sibling["trxId"] for sibling in row["catagory"]["banktransactionSet"]]
+            self.assertIn(row["trxId"], siblings)
+            self.assertEqual(len(siblings), 3)
+
+
+class ResultCacheTests(GraphQLCase):
+    QUERY = "{ aggregate(measures: [SUM, COUNT]) { sum count } }"
+
+    def totals(self):
+        row = self.execute(self.QUERY)["aggregate"][0]
+        return Decimal(row["sum"] or 0), row["count"]
+
+    def test_results_are_cached_until_a_write_commits(self):
+        create_transaction(1, amount=Decimal("10.00"))
+        self.assertEqual(self.totals(), (Decimal(10), 1))
+
+        # Written without signals: the cached result is served, not recomputed
+        BankTransaction.objects.filter(trx_id=1).update(amount=Decimal("99.00"))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.totals(), (Decimal(10), 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_transaction(2, amount=Decimal("5.00"))
+
+        self.assertEqual(self.totals(), (Decimal(104), 2))
+
+    def test_a_write_bumps_the_data_version(self):
+        version = data_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_transaction(1)
+
+        self.assertNotEqual(data_version(), version)
+
+
+def on_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class AsyncViewTests(GraphQLCase):
+    """The view through the async client: the cache must not block the event loop."""
+
+    QUERY = "{ aggregate(measures: [COUNT]) { count } }"
+
+    def setUp(self):
+        super().setUp()
+        create_transaction(1)
+        create_transaction(2)
+
+    async def post(self, body):
+        response = await self.async_client.post(self.GRAPHQL_URL, body, content_type="application/json")
+        return response.json()
+
+    async def persisted(self, query=None):
+        body = {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": query_hash(self.QUERY)}}}
+        if query:
+            body["query"] = query
+        return await self.post(body)
+
+    @contextmanager
+    def sync_cache_calls(self):
+        """Records, per sync cache call, whether it ran on the event loop thread."""
+        calls = []
+        backend = type(caches["default"])
+
+        def watched(name):
+            method = getattr(backend, name)
+
+            def wrapper(self, *args, **kwargs):
+                calls.append((name, on_event_loop()))
+                return method(self, *args, **kwargs)
+
+            return wrapper
+
+        with ExitStack() as stack:
+            for name in ("get", "set", "add"):
+                stack.enter_context(patch.object(backend, name, watched(name)))
+            yield calls
+
+    async def test_cache_is_used_off_the_event_loop(self):
+        with self.sync_cache_calls() as calls:
+            registered = await self.persisted(self.QUERY)
+            by_hash = await self.persisted()
+
+        self.assertEqual(registered["data"], {"aggregate": [{"count": 2}]})
+        self.assertEqual(by_hash["data"], registered["data"])
+        # the persisted query, the data version and the cached result were all read or written
+        self.assertTrue(calls)
+        self.assertEqual([name for name, blocking in calls if blocking], [])
+
+    async def test_batched_operations_run_concurrently(self):
+        results = await self.post([
+            {"id": 1, "query": self.QUERY},
+            {"id": 2, "query": "{ bankTransactionsConnection(first: 1) { totalCount } }"},
+        ])
+
+        self.assertEqual([result["id"] for result in results], [1, 2])
+        self.assertEqual(results[0]["data"], {"aggregate": [{"count": 2}]})
+        self.assertEqual(results[1]["data"], {"bankTransactionsConnection": {"totalCount": 2}})
+
+    async def test_parsed_documents_are_reused(self):
+        first = await self.persisted(self.QUERY)
+
+        with patch("sgkb.graphql.view.parse", side_effect=AssertionError("parsed again")):
+            second = await self.persisted()
+
+        self.assertEqual(second["data"], first["data"])
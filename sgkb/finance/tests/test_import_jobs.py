@@ -0,0 +1,83 @@
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from finance.models import BankTransaction, ImportJob
+
+from .helpers import export_csv, export_row
+
+
+class ImportJobTests(TestCase):
+    def setUp(self):
+        spool = tempfile.TemporaryDirectory()
+        self.addCleanup(spool.cleanup)
+        self.enterContext(override_settings(IMPORT_SPOOL_DIR=spool.name))
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "secret"))
+
+    def upload(self, rows):
+        """Upload through the admin form without the background option, so the task runs in the request."""
+        upload = SimpleUploadedFile("export.csv", export_csv(rows).getvalue(), content_type="text/csv")
+        response = self.client.post(
+            "/admin/finance/banktransaction/upload-csv/", {"csv_file": upload, "mode": ImportJob.MODE_SKIP}
+        )
+        job = ImportJob.objects.get()
+        self.assertRedirects(response, f"/admin/finance/banktransaction/upload-csv/{job.pk}/")
+        return job
+
+    def status(self, job):
+        return self.client.get(f"/admin/finance/banktransaction/upload-csv/{job.pk}/status/").json()
+
+    def test_job_records_the_result(self):
+        job = self.upload([export_row(1), export_row(2), export_row(3, DIRECTION="9")])
+
+        self.assertEqual(
+            (job.status, job.rows_done, job.rows_rejected, job.rows_skipped, job.progress),
+            (ImportJob.STATUS_DONE, 2, 1, 0, 1.0),
+        )
+        self.assertEqual(BankTransaction.objects.count(), 2)
+
+        status = self.status(job)
+        self.assertEqual(
+            {key: status[key] for key in ("status", "progress", "rows_done", "rows_rejected", "rows_skipped", "eta_seconds", "error")},
+            {"status": "done", "progress": 1.0, "rows_done": 2, "rows_rejected": 1, "rows_skipped": 0, "eta_seconds": None, "error": ""},
+        )
+        self.assertGreater(status["rows_per_second"], 0)
+
+        response = self.client.get(status["rejects_url"])
+        rejects = b"".join(response.streaming_content).decode()
+        self.assertIn("DIRECTION must be 1 or 2", rejects)
+
+    def test_rejects_are_missing_without_rejected_rows(self):
+        job = self.upload([export_row(1)])
+
+        self.assertIsNone(self.status(job)["rejects_url"])
+        response = self.client.get(f"/admin/finance/banktransaction/upload-csv/{job.pk}/rejects/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_reupload_counts_known_rows(self):
+        self.upload([export_row(1)])
+        ImportJob.objects.all().delete()
+
+        job = self.upload([export_row(1), export_row(2)])
+
+        self.assertEqual((job.rows_done, job.rows_skipped), (1, 1))
+
+    def test_running_job_reports_progress_and_eta(self):
+        job = ImportJob.objects.create(
+            file_name="export.csv",
+            file_size=1000,
+            bytes_done=250,
+            rows_done=300,
+            status=ImportJob.STATUS_RUNNING,
+            started_at=timezone.now() - timedelta(seconds=10),
+        )
+
+        status = self.status(job)
+
+        self.assertEqual(status["progress"], 0.25)
+        self.assertAlmostEqual(status["eta_seconds"], 30, delta=2)
+        self.assertAlmostEqual(status["rows_per_second"], 30, delta=2)
@@ -0,0 +1,241 @@
+import csv
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from finance.models import BankTransaction, ImportJob, ImportWatermark
+from finance.utils.importer import CONFLICT_REASON, REJECT_REASON_COLUMN, TransactionImporter
+
+from .helpers import export_csv, export_row
+
+
+class ImportValuesTests(TestCase):
+    def test_large_trx_ids_survive_a_chunk_with_invalid_ids(self):
+        rows = [export_row(12345678901234567), export_row("", TEXT_SHORT_CREDITOR="no id")]
+
+        result = TransactionImporter().import_file(export_csv(rows))
+
+        self.assertEqual(result.inserted, 1)
+        self.assertEqual(result.rejected, 1)
+        self.assertEqual(BankTransaction.objects.get().trx_id, 12345678901234567)
+
+
+    def test_dates_do_not_depend_on_the_chunk_they_are_in(self):
+        dates = ["01.02.2025", "2025-01-16", "15.01.2025", "2025-01-17 00:00:00", "01.02.2025", "2025-01-18"]
+        rows = [export_row(trx_id, VAL_DATE=value, TRX_DATE=value) for trx_id, value in enumerate(dates, start=1)]
+
+        for chunksize in (1, 2, 3, 6):
+            with self.subTest(chunksize=chunksize):
+                BankTransaction.objects.all().delete()
+                result = TransactionImporter().import_file(export_csv(rows), chunksize=chunksize)
+
+                self.assertEqual((result.inserted, result.rejected), (6, 0))
+                self.assertEqual(
+                    list(BankTransaction.objects.order_by("trx_id").values_list("val_date", flat=True)),
+                    [date(2025, 2, 1), date(2025, 1, 16), date(2025, 1, 15), date(2025, 1, 17), date(2025, 2, 1), date(2025, 1, 18)],
+                )
+
+
+class ImportModeTests(TestCase):
+    def import_rows(self, rows, mode, **options):
+        return TransactionImporter(mode=mode, **options).import_file(export_csv(rows))
+
+    def test_insert_mode_skips_rows_already_stored(self):
+        rows = [export_row(1), export_row(2)]
+        self.import_rows(rows, ImportJob.MODE_INSERT)
+
+        result = self.import_rows(rows + [export_row(3)], ImportJob.MODE_INSERT)
+
+        self.assertEqual((result.inserted, result.skipped), (1, 2))
+        self.assertEqual(BankTransaction.objects.count(), 3)
+
+    def test_skip_mode_reimport_is_a_no_op(self):
+        rows = [export_row(1), export_row(2)]
+        self.import_rows(rows, ImportJob.MODE_SKIP)
+
+        result = self.import_rows(rows, ImportJob.MODE_SKIP)
+
+        self.assertEqual((result.inserted, result.skipped, result.rejected), (0, 2, 0))
+        self.assertEqual(BankTransaction.objects.count(), 2)
+
+    def test_skip_mode_rejects_corrections(self):
+        self.import_rows([export_row(1)], ImportJob.MODE_SKIP)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "rejects.csv"
+            result = self.import_rows([export_row(1, AMOUNT="12.00")], ImportJob.MODE_SKIP, rejects_path=path)
+            with path.open() as handle:
+                rejects = list(csv.DictReader(handle))
+
+        self.assertEqual((result.inserted, result.rejected), (0, 1))
+        self.assertEqual(BankTransaction.objects.get().amount, Decimal("10.50"))
+        self.assertEqual(rejects[0]["TRX_ID"], "1")
+        self.assertEqual(rejects[0][REJECT_REASON_COLUMN], CONFLICT_REASON)
+
+    def test_update_mode_overwrites_corrections(self):
+        self.import_rows([export_row(1)], ImportJob.MODE_SKIP)
+
+        result = self.import_rows([export_row(1, AMOUNT="12.00")], ImportJob.MODE_UPDATE)
+
+        self.assertEqual((result.inserted, result.updated), (0, 1))
+        self.assertEqual(BankTransaction.objects.get().amount, Decimal("12.00"))
+
+
+class BackfillRowHashesTests(TestCase):
+    def test_backfilled_hashes_match_the_importer(self):
+        TransactionImporter().import_file(export_csv([
+            export_row(1, category="Groceries"),
+            export_row(2, TRX_TYPE_ID="", AMOUNT="-3.2"),
+        ]))
+        imported = dict(BankTransaction.objects.values_list("trx_id", "row_hash"))
+        BankTransaction.objects.update(row_hash=None)
+
+        call_command("backfill_row_hashes", stdout=StringIO())
+
+        self.assertEqual(dict(BankTransaction.objects.values_list("trx_id", "row_hash")), imported)
+
+    def test_duplicates_keep_an_empty_hash(self):
+        TransactionImporter().import_file(export_csv([export_row(1)]))
+        stored = BankTransaction.objects.get()
+        stored.pk = None
+        stored.row_hash = None
+        stored.save()
+
+        call_command("backfill_row_hashes", stdout=StringIO())
+
+        self.assertEqual(BankTransaction.objects.filter(row_hash__isnull=True).count(), 1)
+
+
+class RejectTests(TestCase):
+    def test_invalid_rows_go_to_the_rejects_file(self):
+        rows = [
+            export_row(1),
+            export_row(2, AMOUNT="inf"),
+            export_row(3, AMOUNT="Infinity"),
+            export_row(4, AMOUNT="1e30"),
+            export_row(5, DIRECTION="3"),
+            export_row(6, VAL_DATE="not a date"),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "rejects.csv"
+            result = TransactionImporter(rejects_path=path).import_file(export_csv(rows))
+            with path.open() as handle:
+                reasons = {row["TRX_ID"]: row[REJECT_REASON_COLUMN] for row in csv.DictReader(handle)}
+
+        self.assertEqual((result.inserted, result.rejected), (1, 5))
+        self.assertEqual(reasons, {
+            "2": "AMOUNT is not numeric",
+            "3": "AMOUNT is not numeric",
+            "4": "AMOUNT out of range",
+            "5": "DIRECTION must be 1 or 2",
+            "6": "VAL_DATE missing or invalid",
+        })
+
+    def import_parquet(self, **columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({
+            "TRX_ID": [1, 2, 3],
+            "VAL_DATE": ["2025-01-15"] * 3,
+            "TRX_DATE": ["2025-01-15"] * 3,
+            "DIRECTION": [2, 2, 2],
+            "AMOUNT": [10.5, 1.0, 2.0],
+            **columns,
+        })
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "export.parquet"
+            pq.write_table(table, path, row_group_size=2)
+            return TransactionImporter(rejects_path=Path(directory) / "rejects.csv").import_file(path)
+
+    def test_non_finite_arrow_amounts_are_rejected(self):
+        result = self.import_parquet(AMOUNT=[10.5, float("inf"), 1e30])
+
+        self.assertEqual((result.inserted, result.rejected), (1, 2))
+        self.assertEqual(BankTransaction.objects.get().amount, Decimal("10.50"))
+
+    def test_bad_arrow_dates_are_rejected(self):
+        result = self.import_parquet(VAL_DATE=["2025-01-15", "15.01.2025", "not a date"])
+
+        self.assertEqual((result.inserted, result.rejected), (2, 1))
+        self.assertEqual(set(BankTransaction.objects.values_list("val_date", flat=True)), {date(2025, 1, 15)})
+
+    def test_bad_arrow_integers_are_rejected(self):
+        result = self.import_parquet(TRX_ID=["1", "x", "3"])
+
+        self.assertEqual((result.inserted, result.rejected), (2, 1))
+        self.assertEqual(sorted(BankTransaction.objects.values_list("trx_id", flat=True)), [1, 3])
+
+    def test_fractional_arrow_directions_are_rejected(self):
+        result = self.import_parquet(DIRECTION=[2.0, 2.5, 1.0])
+
+        self.assertEqual((result.inserted, result.rejected), (2, 1))
+        self.assertEqual(sorted(BankTransaction.objects.values_list("direction", flat=True)), [1, 2])
+
+
+class IncrementalImportTests(TestCase):
+    def import_rows(self, rows, source="daily"):
+        importer = TransactionImporter(mode=ImportJob.MODE_SKIP, incremental=True, source=source)
+        return importer.import_file(export_csv(rows))
+
+    def test_rows_at_or_below_the_watermark_are_dropped(self):
+        self.import_rows([export_row(1, TRX_DATE="2025-01-10"), export_row(2, TRX_DATE="2025-01-15")])
+
+        result = self.import_rows([
+            export_row(1, TRX_DATE="2025-01-10"),
+            export_row(2, TRX_DATE="2025-01-15"),
+            export_row(3, TRX_DATE="2025-01-15"),
+            export_row(4, TRX_DATE="2025-01-16"),
+        ])
+
+        self.assertEqual((result.inserted, result.skipped), (2, 2))
+        mark = ImportWatermark.objects.get(source="daily", account_name="Privatkonto")
+        self.assertEqual((mark.max_trx_date, mark.max_trx_id), (date(2025, 1, 16), 4))
+
+    def test_watermarks_are_kept_per_account_and_source(self):
+        self.import_rows([export_row(5, TRX_DATE="2025-01-15")])
+
+        result = self.import_rows([
+            export_row(1, TRX_DATE="2025-01-15", AMOUNT="1.00"),
+            export_row(2, TRX_DATE="2025-01-15", MONEY_ACCOUNT_NAME="Sparkonto"),
+        ])
+        other_source = self.import_rows([export_row(3, TRX_DATE="2025-01-01")], source="archive")
+
+        self.assertEqual((result.inserted, result.skipped), (1, 1))
+        self.assertEqual(other_source.inserted, 1)
+        self.assertEqual(ImportWatermark.objects.count(), 3)
+
+
+class ImportCommandTests(TestCase):
+    def write_export(self, directory, rows):
+        path = Path(directory) / "export.csv"
+        path.write_bytes(export_csv(rows).getvalue())
+        return path
+
+    def test_blocks_split_inside_quoted_multiline_fields(self):
+        # About 2.5 MB: three 1 MB blocks, whose boundaries fall inside the long quoted texts
+        text = "Zahlung, \"Referenz\"\n" + "x" * 5000 + "\nEnde"
+        rows = [export_row(trx_id, TEXT_CREDITOR=f"{trx_id}: {text}") for trx_id in range(1, 501)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_export(directory, rows)
+            output = StringIO()
+            call_command("import_transactions", str(path), "--workers", "2", "--block-size", "1", stdout=output)
+
+        self.assertEqual(BankTransaction.objects.count(), 500)
+        self.assertEqual(BankTransaction.objects.get(trx_id=250).text_creditor, f"250: {text}")
+        self.assertIn("500 of 500 rows imported", output.getvalue())
+
+    def test_block_size_must_be_positive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_export(directory, [export_row(1)])
+            with self.assertRaises(CommandError):
+                call_command("import_transactions", str(path), "--block-size", "0", stdout=StringIO())
+
+        self.assertFalse(BankTransaction.objects.exists())
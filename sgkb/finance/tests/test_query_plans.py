@@ -0,0 +1,10 @@
+from django.test import TestCase
+
+from finance.utils.query_plans import check_query_plans
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        full_scans = {plan.name: plan.full_scans for plan in check_query_plans() if not plan.ok}
+
+        self.assertEqual(full_scans, {})
@@ -0,0 +1,59 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from finance.models import BankTransaction
+from finance.utils import TransactionFilter
+from finance.utils.search import FTS_TABLE
+
+from .helpers import create_transaction
+
+
+def search(text):
+    return sorted(TransactionFilter.apply(BankTransaction.objects.all(), search=text).values_list("trx_id", flat=True))
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        create_transaction(1, text_short_creditor="MIGROS BAHNHOFSTRASSE ZUERICH")
+        create_transaction(2, text_short_creditor="Coop", cred_info="Rechnung Zürich Nord")
+        create_transaction(3, text_short_creditor="SBB", cred_iban="CH9300762011623852957")
+
+    def test_every_word_must_match_as_a_prefix(self):
+        self.assertEqual(search("migros bahnhof"), [1])
+        self.assertEqual(search("migros nord"), [])
+        self.assertEqual(search("ch93007"), [3])
+
+    def test_diacritics_are_ignored(self):
+        self.assertEqual(search("zurich"), [2])
+
+    def test_text_without_words_does_not_filter(self):
+        self.assertEqual(search(" -- "), [1, 2, 3])
+
+    def test_index_follows_updates_and_deletes(self):
+        BankTransaction.objects.filter(trx_id=1).update(text_short_creditor="DENNER")
+        BankTransaction.objects.filter(trx_id=2).delete()
+
+        self.assertEqual(search("migros"), [])
+        self.assertEqual(search("denner"), [1])
+        self.assertEqual(search("rechnung"), [])
+
+
+class SearchMigrationTests(TransactionTestCase):
+    def search_objects(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE %s", [f"{FTS_TABLE}%"])
+            return {name for name, in cursor.fetchall()}
+
+    def test_migration_installs_and_removes_the_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("checks the SQLite FTS5 objects")
+        create_transaction(1, text_short_creditor="MIGROS")
+
+        call_command("migrate", "finance", "0016", verbosity=0)
+        self.assertEqual(self.search_objects(), set())
+
+        call_command("migrate", "finance", verbosity=0)
+        self.assertTrue({FTS_TABLE, f"{FTS_TABLE}_insert", f"{FTS_TABLE}_delete", f"{FTS_TABLE}_update"} <= self.search_objects())
+        # The rebuild indexed rows stored before the migration
+        self.assertEqual(search("migros"), [1])
@@ -1,5 +1,16 @@
 from django.urls import path
-from .views import current_datetime, ChatBotView, DashboardView, PartnersView, ExportTransactionsCSV, ExportTransactionsExcel
+from .views import (
+    current_datetime,
+    ChatBotView,
+    DashboardView,
+    PartnersView,
+    ExportTransactionsCSV,
+    ExportTransactionsArrow,
+    ExportTransactionsExcel,
+    ExportJobView,
+    ExportJobStatusView,
+    ExportJobDownloadView,
+)
 
 urlpatterns = [
     path('', current_datetime),
@@ -7,6 +18,11 @@ urlpatterns = [
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
     path("partners/", PartnersView.as_view(), name="partners"),
     path("export/csv/", ExportTransactionsCSV.as_view(), name="export_csv"),
+    path("export/parquet/", ExportTransactionsArrow.as_view(fmt="parquet"), name="export_parquet"),
+    path("export/arrow/", ExportTransactionsArrow.as_view(fmt="arrow"), name="export_arrow"),
     path("export/excel/", ExportTransactionsExcel.as_view(), name="export_excel"),
+    path("export/jobs/<int:job_id>/", ExportJobView.as_view(), name="export_job"),
+    path("export/jobs/<int:job_id>/status/", ExportJobStatusView.as_view(), name="export_job_status"),
+    path("export/jobs/<int:job_id>/download/", ExportJobDownloadView.as_view(), name="export_job_download"),
 ]
 
@@ -0,0 +1,69 @@
+"""
+Grouped aggregation over transactions, compiled into a single GROUP BY.
+
+Dimensions are the columns to group by, measures are aggregates of the
+amount. ``aggregate_transactions`` returns one dict per group, keyed by the
+dimension and measure names; it runs on Django's async ORM.
+"""
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+DIMENSIONS = {
+    "country": F("acquirer_country_name"),
+    "country_code": F("acquirer_country_code"),
+    "category": F("catagory__name"),
+    "month": TruncMonth("val_date"),
+    "week": TruncWeek("val_date"),
+    "merchant": F("text_short_creditor"),
+    "direction": F("direction"),
+    "currency": F("trx_curry_name"),
+}
+
+MEASURES = {
+    "sum": Sum("amount"),
+    "count": Count("id"),
+    "avg": Avg("amount"),
+    "min": Min("amount"),
+    "max": Max("amount"),
+}
+
+
+def _check_names(dimensions, measures):
+    unknown = (set(dimensions) - DIMENSIONS.keys()) | (set(measures) - MEASURES.keys())
+    if unknown:
+        raise ValueError(f"Unknown dimensions or measures: {', '.join(sorted(unknown))}")
+
+
+def grouped_queryset(queryset, dimensions, measures):
+    """The GROUP BY query behind ``aggregate_transactions``, for one or more dimensions."""
+    _check_names(dimensions, measures)
+
+    # Aliases keep group keys apart from model fields of the same name (direction)
+    group_by = {f"group_{name}": DIMENSIONS[name] for name in dimensions}
+    return (
+        queryset
+        .annotate(**group_by)
+        .values(*group_by)
+        .annotate(**{f"measure_{name}": MEASURES[name] for name in measures})
+        .order_by(*group_by)
+    )
+
+
+async def aggregate_transactions(queryset, dimensions=(), measures=("sum",)):
+    """
+    Group ``queryset`` by ``dimensions`` and compute ``measures`` per group.
+    Without dimensions the result is a single row over the whole queryset.
+    """
+    if not dimensions:
+        _check_names(dimensions, measures)
+        row = await queryset.aaggregate(**{f"measure_{name}": MEASURES[name] for name in measures})
+        return [{name: row[f"measure_{name}"] for name in measures}]
+
+    rows = grouped_queryset(queryset, dimensions, measures)
+    return [
+        {
+            **{name: row[f"group_{name}"] for name in dimensions},
+            **{name: row[f"measure_{name}"] for name in measures},
+        }
+        async for row in rows
+    ]
@@ -0,0 +1,89 @@
+"""
+Versioned result cache for the aggregate resolvers.
+
+Every cached result is stored under the current data version, a stamp kept
+in Django's cache. Anything that writes transactions, categories or logos
+bumps the stamp once its transaction commits, which orphans all results
+computed before it: nothing is ever served stale, and the old entries
+simply expire.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+DATA_VERSION_KEY = "finance:data-version"
+
+
+def data_version():
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        # A fresh stamp can never collide with versions from before an eviction
+        version = time.time_ns()
+        if not cache.add(DATA_VERSION_KEY, version, timeout=None):
+            version = cache.get(DATA_VERSION_KEY, version)
+    return version
+
+
+async def adata_version():
+    """``data_version`` for coroutines; does not block the event loop on a network cache."""
+    version = await cache.aget(DATA_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(DATA_VERSION_KEY, version, timeout=None):
+            version = await cache.aget(DATA_VERSION_KEY, version)
+    return version
+
+
+def bump_data_version(**kwargs):
+    """Invalidate every cached result. Accepts (and ignores) signal arguments."""
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        cache.set(DATA_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _result_key(name, version, kwargs):
+    args = json.dumps(kwargs, sort_keys=True, cls=DjangoJSONEncoder)
+    digest = hashlib.sha1(args.encode("utf-8")).hexdigest()
+    return f"finance:result:{name}:{version}:{digest}"
+
+
+def versioned_cache(name):
+    """
+    Cache a function's return value per data version and keyword arguments.
+    The value must be picklable, so return plain rows rather than graphene objects.
+    Coroutine functions are wrapped in a coroutine function that uses the
+    cache's async API, so a network cache never blocks the event loop.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(**kwargs):
+                key = _result_key(name, await adata_version(), kwargs)
+                result = await cache.aget(key)
+                if result is None:
+                    result = await func(**kwargs)
+                    await cache.aset(key, result, settings.AGGREGATE_CACHE_TIMEOUT)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            key = _result_key(name, data_version(), kwargs)
+            result = cache.get(key)
+            if result is None:
+                result = func(**kwargs)
+                cache.set(key, result, settings.AGGREGATE_CACHE_TIMEOUT)
+            return result
+
+        return wrapper
+
+    return decorator
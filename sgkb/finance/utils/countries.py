@@ -0,0 +1,373 @@
+"""
+ISO 3166-1 country lookup for the free-text ``ACQUIRER_COUNTRY_NAME`` column.
+
+``country_code`` maps German and English names, common variants and the
+alpha-2 and alpha-3 codes to the alpha-2 code stored in
+``acquirer_country_code``. Names are compared case-insensitively and without
+accents or punctuation, so "Österreich", "OESTERREICH" and "osterreich" all match.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+# (alpha-2, alpha-3, English name, German name)
+COUNTRIES = (
+    ("AD", "AND", "Andorra", "Andorra"),
+    ("AE", "ARE", "United Arab Emirates", "Vereinigte Arabische Emirate"),
+    ("AF", "AFG", "Afghanistan", "Afghanistan"),
+    ("AG", "ATG", "Antigua and Barbuda", "Antigua und Barbuda"),
+    ("AI", "AIA", "Anguilla", "Anguilla"),
+    ("AL", "ALB", "Albania", "Albanien"),
+    ("AM", "ARM", "Armenia", "Armenien"),
+    ("AO", "AGO", "Angola", "Angola"),
+    ("AQ", "ATA", "Antarctica", "Antarktis"),
+    ("AR", "ARG", "Argentina", "Argentinien"),
+    ("AS", "ASM", "American Samoa", "Amerikanisch-Samoa"),
+    ("AT", "AUT", "Austria", "Österreich"),
+    ("AU", "AUS", "Australia", "Australien"),
+    ("AW", "ABW", "Aruba", "Aruba"),
+    ("AX", "ALA", "Åland Islands", "Ålandinseln"),
+    ("AZ", "AZE", "Azerbaijan", "Aserbaidschan"),
+    ("BA", "BIH", "Bosnia and Herzegovina", "Bosnien und Herzegowina"),
+    ("BB", "BRB", "Barbados", "Barbados"),
+    ("BD", "BGD", "Bangladesh", "Bangladesch"),
+    ("BE", "BEL", "Belgium", "Belgien"),
+    ("BF", "BFA", "Burkina Faso", "Burkina Faso"),
+    ("BG", "BGR", "Bulgaria", "Bulgarien"),
+    ("BH", "BHR", "Bahrain", "Bahrain"),
+    ("BI", "BDI", "Burundi", "Burundi"),
+    ("BJ", "BEN", "Benin", "Benin"),
+    ("BL", "BLM", "Saint Barthélemy", "Saint-Barthélemy"),
+    ("BM", "BMU", "Bermuda", "Bermuda"),
+    ("BN", "BRN", "Brunei Darussalam", "Brunei"),
+    ("BO", "BOL", "Bolivia", "Bolivien"),
+    ("BQ", "BES", "Bonaire, Sint Eustatius and Saba", "Bonaire, Sint Eustatius und Saba"),
+    ("BR", "BRA", "Brazil", "Brasilien"),
+    ("BS", "BHS", "Bahamas", "Bahamas"),
+    ("BT", "BTN", "Bhutan", "Bhutan"),
+    ("BV", "BVT", "Bouvet Island", "Bouvetinsel"),
+    ("BW", "BWA", "Botswana", "Botswana"),
+    ("BY", "BLR", "Belarus", "Belarus"),
+    ("BZ", "BLZ", "Belize", "Belize"),
+    ("CA", "CAN", "Canada", "Kanada"),
+    ("CC", "CCK", "Cocos (Keeling) Islands", "Kokosinseln"),
+    ("CD", "COD", "Democratic Republic of the Congo", "Demokratische Republik Kongo"),
+    ("CF", "CAF", "Central African Republic", "Zentralafrikanische Republik"),
+    ("CG", "COG", "Congo", "Republik Kongo"),
+    ("CH", "CHE", "Switzerland", "Schweiz"),
+    ("CI", "CIV", "Côte d'Ivoire", "Elfenbeinküste"),
+    ("CK", "COK", "Cook Islands", "Cookinseln"),
+    ("CL", "CHL", "Chile", "Chile"),
+    ("CM", "CMR", "Cameroon", "Kamerun"),
+    ("CN", "CHN", "China", "China"),
+    ("CO", "COL", "Colombia", "Kolumbien"),
+    ("CR", "CRI", "Costa Rica", "Costa Rica"),
+    ("CU", "CUB", "Cuba", "Kuba"),
+    ("CV", "CPV", "Cabo Verde", "Kap Verde"),
+    ("CW", "CUW", "Curaçao", "Curaçao"),
+    ("CX", "CXR", "Christmas Island", "Weihnachtsinsel"),
+    ("CY", "CYP", "Cyprus", "Zypern"),
+    ("CZ", "CZE", "Czechia", "Tschechien"),
+    ("DE", "DEU", "Germany", "Deutschland"),
+    ("DJ", "DJI", "Djibouti", "Dschibuti"),
+    ("DK", "DNK", "Denmark", "Dänemark"),
+    ("DM", "DMA", "Dominica", "Dominica"),
+    ("DO", "DOM", "Dominican Republic", "Dominikanische Republik"),
+    ("DZ", "DZA", "Algeria", "Algerien"),
+    ("EC", "ECU", "Ecuador", "Ecuador"),
+    ("EE", "EST", "Estonia", "Estland"),
+    ("EG", "EGY", "Egypt", "Ägypten"),
+    ("EH", "ESH", "Western Sahara", "Westsahara"),
+    ("ER", "ERI", "Eritrea", "Eritrea"),
+    ("ES", "ESP", "Spain", "Spanien"),
+    ("ET", "ETH", "Ethiopia", "Äthiopien"),
+    ("FI", "FIN", "Finland", "Finnland"),
+    ("FJ", "FJI", "Fiji", "Fidschi"),
+    ("FK", "FLK", "Falkland Islands", "Falklandinseln"),
+    ("FM", "FSM", "Micronesia", "Mikronesien"),
+    ("FO", "FRO", "Faroe Islands", "Färöer"),
+    ("FR", "FRA", "France", "Frankreich"),
+    ("GA", "GAB", "Gabon", "Gabun"),
+    ("GB", "GBR", "United Kingdom", "Vereinigtes Königreich"),
+    ("GD", "GRD", "Grenada", "Grenada"),
+    ("GE", "GEO", "Georgia", "Georgien"),
+    ("GF", "GUF", "French Guiana", "Französisch-Guayana"),
+    ("GG", "GGY", "Guernsey", "Guernsey"),
+    ("GH", "GHA", "Ghana", "Ghana"),
+    ("GI", "GIB", "Gibraltar", "Gibraltar"),
+    ("GL", "GRL", "Greenland", "Grönland"),
+    ("GM", "GMB", "Gambia", "Gambia"),
+    ("GN", "GIN", "Guinea", "Guinea"),
+    ("GP", "GLP", "Guadeloupe", "Guadeloupe"),
+    ("GQ", "GNQ", "Equatorial Guinea", "Äquatorialguinea"),
+    ("GR", "GRC", "Greece", "Griechenland"),
+    ("GS", "SGS", "South Georgia and the South Sandwich Islands", "Südgeorgien und die Südlichen Sandwichinseln"),
+    ("GT", "GTM", "Guatemala", "Guatemala"),
+    ("GU", "GUM", "Guam", "Guam"),
+    ("GW", "GNB", "Guinea-Bissau", "Guinea-Bissau"),
+    ("GY", "GUY", "Guyana", "Guyana"),
+    ("HK", "HKG", "Hong Kong", "Hongkong"),
+    ("HM", "HMD", "Heard Island and McDonald Islands", "Heard und McDonaldinseln"),
+    ("HN", "HND", "Honduras", "Honduras"),
+    ("HR", "HRV", "Croatia", "Kroatien"),
+    ("HT", "HTI", "Haiti", "Haiti"),
+    ("HU", "HUN", "Hungary", "Ungarn"),
+    ("ID", "IDN", "Indonesia", "Indonesien"),
+    ("IE", "IRL", "Ireland", "Irland"),
+    ("IL", "ISR", "Israel", "Israel"),
+    ("IM", "IMN", "Isle of Man", "Isle of Man"),
+    ("IN", "IND", "India", "Indien"),
+    ("IO", "IOT", "British Indian Ocean Territory", "Britisches Territorium im Indischen Ozean"),
+    ("IQ", "IRQ", "Iraq", "Irak"),
+    ("IR", "IRN", "Iran", "Iran"),
+    ("IS", "ISL", "Iceland", "Island"),
+    ("IT", "ITA", "Italy", "Italien"),
+    ("JE", "JEY", "Jersey", "Jersey"),
+    ("JM", "JAM", "Jamaica", "Jamaika"),
+    ("JO", "JOR", "Jordan", "Jordanien"),
+    ("JP", "JPN", "Japan", "Japan"),
+    ("KE", "KEN", "Kenya", "Kenia"),
+    ("KG", "KGZ", "Kyrgyzstan", "Kirgisistan"),
+    ("KH", "KHM", "Cambodia", "Kambodscha"),
+    ("KI", "KIR", "Kiribati", "Kiribati"),
+    ("KM", "COM", "Comoros", "Komoren"),
+    ("KN", "KNA", "Saint Kitts and Nevis", "St. Kitts und Nevis"),
+    ("KP", "PRK", "North Korea", "Nordkorea"),
+    ("KR", "KOR", "South Korea", "Südkorea"),
+    ("KW", "KWT", "Kuwait", "Kuwait"),
+    ("KY", "CYM", "Cayman Islands", "Kaimaninseln"),
+    ("KZ", "KAZ", "Kazakhstan", "Kasachstan"),
+    ("LA", "LAO", "Laos", "Laos"),
+    ("LB", "LBN", "Lebanon", "Libanon"),
+    ("LC", "LCA", "Saint Lucia", "St. Lucia"),
+    ("LI", "LIE", "Liechtenstein", "Liechtenstein"),
+    ("LK", "LKA", "Sri Lanka", "Sri Lanka"),
+    ("LR", "LBR", "Liberia", "Liberia"),
+    ("LS", "LSO", "Lesotho", "Lesotho"),
+    ("LT", "LTU", "Lithuania", "Litauen"),
+    ("LU", "LUX", "Luxembourg", "Luxemburg"),
+    ("LV", "LVA", "Latvia", "Lettland"),
+    ("LY", "LBY", "Libya", "Libyen"),
+    ("MA", "MAR", "Morocco", "Marokko"),
+    ("MC", "MCO", "Monaco", "Monaco"),
+    ("MD", "MDA", "Moldova", "Moldau"),
+    ("ME", "MNE", "Montenegro", "Montenegro"),
+    ("MF", "MAF", "Saint Martin", "Saint-Martin"),
+    ("MG", "MDG", "Madagascar", "Madagaskar"),
+    ("MH", "MHL", "Marshall Islands", "Marshallinseln"),
+    ("MK", "MKD", "North Macedonia", "Nordmazedonien"),
+    ("ML", "MLI", "Mali", "Mali"),
+    ("MM", "MMR", "Myanmar", "Myanmar"),
+    ("MN", "MNG", "Mongolia", "Mongolei"),
+    ("MO", "MAC", "Macao", "Macau"),
+    ("MP", "MNP", "Northern Mariana Islands", "Nördliche Marianen"),
+    ("MQ", "MTQ", "Martinique", "Martinique"),
+    ("MR", "MRT", "Mauritania", "Mauretanien"),
+    ("MS", "MSR", "Montserrat", "Montserrat"),
+    ("MT", "MLT", "Malta", "Malta"),
+    ("MU", "MUS", "Mauritius", "Mauritius"),
+    ("MV", "MDV", "Maldives", "Malediven"),
+    ("MW", "MWI", "Malawi", "Malawi"),
+    ("MX", "MEX", "Mexico", "Mexiko"),
+    ("MY", "MYS", "Malaysia", "Malaysia"),
+    ("MZ", "MOZ", "Mozambique", "Mosambik"),
+    ("NA", "NAM", "Namibia", "Namibia"),
+    ("NC", "NCL", "New Caledonia", "Neukaledonien"),
+    ("NE", "NER", "Niger", "Niger"),
+    ("NF", "NFK", "Norfolk Island", "Norfolkinsel"),
+    ("NG", "NGA", "Nigeria", "Nigeria"),
+    ("NI", "NIC", "Nicaragua", "Nicaragua"),
+    ("NL", "NLD", "Netherlands", "Niederlande"),
+    ("NO", "NOR", "Norway", "Norwegen"),
+    ("NP", "NPL", "Nepal", "Nepal"),
+    ("NR", "NRU", "Nauru", "Nauru"),
+    ("NU", "NIU", "Niue", "Niue"),
+    ("NZ", "NZL", "New Zealand", "Neuseeland"),
+    ("OM", "OMN", "Oman", "Oman"),
+    ("PA", "PAN", "Panama", "Panama"),
+    ("PE", "PER", "Peru", "Peru"),
+    ("PF", "PYF", "French Polynesia", "Französisch-Polynesien"),
+    ("PG", "PNG", "Papua New Guinea", "Papua-Neuguinea"),
+    ("PH", "PHL", "Philippines", "Philippinen"),
+    ("PK", "PAK", "Pakistan", "Pakistan"),
+    ("PL", "POL", "Poland", "Polen"),
+    ("PM", "SPM", "Saint Pierre and Miquelon", "Saint-Pierre und Miquelon"),
+    ("PN", "PCN", "Pitcairn", "Pitcairninseln"),
+    ("PR", "PRI", "Puerto Rico", "Puerto Rico"),
+    ("PS", "PSE", "Palestine", "Palästina"),
+    ("PT", "PRT", "Portugal", "Portugal"),
+    ("PW", "PLW", "Palau", "Palau"),
+    ("PY", "PRY", "Paraguay", "Paraguay"),
+    ("QA", "QAT", "Qatar", "Katar"),
+    ("RE", "REU", "Réunion", "Réunion"),
+    ("RO", "ROU", "Romania", "Rumänien"),
+    ("RS", "SRB", "Serbia", "Serbien"),
+    ("RU", "RUS", "Russia", "Russland"),
+    ("RW", "RWA", "Rwanda", "Ruanda"),
+    ("SA", "SAU", "Saudi Arabia", "Saudi-Arabien"),
+    ("SB", "SLB", "Solomon Islands", "Salomonen"),
+    ("SC", "SYC", "Seychelles", "Seychellen"),
+    ("SD", "SDN", "Sudan", "Sudan"),
+    ("SE", "SWE", "Sweden", "Schweden"),
+    ("SG", "SGP", "Singapore", "Singapur"),
+    ("SH", "SHN", "Saint Helena, Ascension and Tristan da Cunha", "St. Helena, Ascension und Tristan da Cunha"),
+    ("SI", "SVN", "Slovenia", "Slowenien"),
+    ("SJ", "SJM", "Svalbard and Jan Mayen", "Svalbard und Jan Mayen"),
+    ("SK", "SVK", "Slovakia", "Slowakei"),
+    ("SL", "SLE", "Sierra Leone", "Sierra Leone"),
+    ("SM", "SMR", "San Marino", "San Marino"),
+    ("SN", "SEN", "Senegal", "Senegal"),
+    ("SO", "SOM", "Somalia", "Somalia"),
+    ("SR", "SUR", "Suriname", "Suriname"),
+    ("SS", "SSD", "South Sudan", "Südsudan"),
+    ("ST", "STP", "Sao Tome and Principe", "São Tomé und Príncipe"),
+    ("SV", "SLV", "El Salvador", "El Salvador"),
+    ("SX", "SXM", "Sint Maarten", "Sint Maarten"),
+    ("SY", "SYR", "Syria", "Syrien"),
+    ("SZ", "SWZ", "Eswatini", "Eswatini"),
+    ("TC", "TCA", "Turks and Caicos Islands", "Turks- und Caicosinseln"),
+    ("TD", "TCD", "Chad", "Tschad"),
+    ("TF", "ATF", "French Southern Territories", "Französische Süd- und Antarktisgebiete"),
+    ("TG", "TGO", "Togo", "Togo"),
+    ("TH", "THA", "Thailand", "Thailand"),
+    ("TJ", "TJK", "Tajikistan", "Tadschikistan"),
+    ("TK", "TKL", "Tokelau", "Tokelau"),
+    ("TL", "TLS", "Timor-Leste", "Osttimor"),
+    ("TM", "TKM", "Turkmenistan", "Turkmenistan"),
+    ("TN", "TUN", "Tunisia", "Tunesien"),
+    ("TO", "TON", "Tonga", "Tonga"),
+    ("TR", "TUR", "Türkiye", "Türkei"),
+    ("TT", "TTO", "Trinidad and Tobago", "Trinidad und Tobago"),
+    ("TV", "TUV", "Tuvalu", "Tuvalu"),
+    ("TW", "TWN", "Taiwan", "Taiwan"),
+    ("TZ", "TZA", "Tanzania", "Tansania"),
+    ("UA", "UKR", "Ukraine", "Ukraine"),
+    ("UG", "UGA", "Uganda", "Uganda"),
+    ("UM", "UMI", "United States Minor Outlying Islands", "Kleinere Amerikanische Überseeinseln"),
+    ("US", "USA", "United States", "Vereinigte Staaten"),
+    ("UY", "URY", "Uruguay", "Uruguay"),
+    ("UZ", "UZB", "Uzbekistan", "Usbekistan"),
+    ("VA", "VAT", "Holy See", "Vatikanstadt"),
+    ("VC", "VCT", "Saint Vincent and the Grenadines", "St. Vincent und die Grenadinen"),
+    ("VE", "VEN", "Venezuela", "Venezuela"),
+    ("VG", "VGB", "British Virgin Islands", "Britische Jungferninseln"),
+    ("VI", "VIR", "U.S. Virgin Islands", "Amerikanische Jungferninseln"),
+    ("VN", "VNM", "Viet Nam", "Vietnam"),
+    ("VU", "VUT", "Vanuatu", "Vanuatu"),
+    ("WF", "WLF", "Wallis and Futuna", "Wallis und Futuna"),
+    ("WS", "WSM", "Samoa", "Samoa"),
+    ("XK", "XKX", "Kosovo", "Kosovo"),  # user-assigned code, used by banks and card networks
+    ("YE", "YEM", "Yemen", "Jemen"),
+    ("YT", "MYT", "Mayotte", "Mayotte"),
+    ("ZA", "ZAF", "South Africa", "Südafrika"),
+    ("ZM", "ZMB", "Zambia", "Sambia"),
+    ("ZW", "ZWE", "Zimbabwe", "Simbabwe"),
+)
+
+# Other spellings seen in bank and card exports
+ALIASES = {
+    "Grossbritannien": "GB",
+    "Great Britain": "GB",
+    "United Kingdom of Great Britain and Northern Ireland": "GB",
+    "Vereinigtes Königreich Grossbritannien und Nordirland": "GB",
+    "UK": "GB",
+    "England": "GB",
+    "Schottland": "GB",
+    "Scotland": "GB",
+    "Wales": "GB",
+    "Nordirland": "GB",
+    "Northern Ireland": "GB",
+    "United States of America": "US",
+    "Vereinigte Staaten von Amerika": "US",
+    "Amerika": "US",
+    "Holland": "NL",
+    "Tschechische Republik": "CZ",
+    "Czech Republic": "CZ",
+    "Russische Föderation": "RU",
+    "Russian Federation": "RU",
+    "Korea": "KR",
+    "Republik Korea": "KR",
+    "Korea, Republic of": "KR",
+    "Turkey": "TR",
+    "Vatikan": "VA",
+    "Vatican City": "VA",
+    "Ivory Coast": "CI",
+    "Cape Verde": "CV",
+    "Swaziland": "SZ",
+    "Swasiland": "SZ",
+    "Mazedonien": "MK",
+    "Macedonia": "MK",
+    "Burma": "MM",
+    "Birma": "MM",
+    "East Timor": "TL",
+    "Weissrussland": "BY",
+    "Moldawien": "MD",
+    "Republik Moldau": "MD",
+    "Kirgistan": "KG",
+    "Bosnien-Herzegowina": "BA",
+    "Kongo": "CG",
+    "DR Kongo": "CD",
+    "Syrian Arab Republic": "SY",
+    "Iran, Islamic Republic of": "IR",
+    "Lao People's Democratic Republic": "LA",
+    "Tanzania, United Republic of": "TZ",
+    "Bolivia, Plurinational State of": "BO",
+    "Venezuela, Bolivarian Republic of": "VE",
+    "Vietnam": "VN",
+    "Brunei": "BN",
+    "Macau": "MO",
+    "Hong Kong SAR": "HK",
+    "Fürstentum Liechtenstein": "LI",
+    "Schweizerische Eidgenossenschaft": "CH",
+    "Suisse": "CH",
+    "Svizzera": "CH",
+    "Svizra": "CH",
+    "Italia": "IT",
+    "España": "ES",
+    "Nederland": "NL",
+    "Danmark": "DK",
+    "Norge": "NO",
+    "Sverige": "SE",
+    "Polska": "PL",
+    "Hrvatska": "HR",
+    "Magyarország": "HU",
+    "Česko": "CZ",
+}
+
+
+def _normalize(name):
+    """Case-, accent- and punctuation-insensitive form of a country name."""
+    text = unicodedata.normalize("NFKD", name.replace("ß", "ss").replace("ẞ", "SS"))
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "Ä": "Ae", "Ö": "Oe", "Ü": "Ue"})
+
+
+def _lookup():
+    lookup = {}
+    names = [(key, alpha2) for alpha2, alpha3, english, german in COUNTRIES for key in (alpha2, alpha3, english, german)]
+    for name, alpha2 in names + list(ALIASES.items()):
+        # "Österreich" also matches the transliterated "Oesterreich"
+        lookup[_normalize(name)] = alpha2
+        lookup.setdefault(_normalize(name.translate(UMLAUTS)), alpha2)
+    return lookup
+
+
+CODE_BY_NAME = _lookup()
+NAMES_BY_CODE = {alpha2: {"en": english, "de": german} for alpha2, _, english, german in COUNTRIES}
+
+
+@lru_cache(maxsize=4096)
+def country_code(name):
+    """ISO 3166-1 alpha-2 code for a country name or code, or None if unknown."""
+    if not name:
+        return None
+    return CODE_BY_NAME.get(_normalize(name))
+
+
+def country_name(code, language="de"):
+    """Name of the country with alpha-2 ``code`` in ``language`` ("de" or "en")."""
+    names = NAMES_BY_CODE.get(code)
+    return names[language] if names else None
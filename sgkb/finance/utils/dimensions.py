@@ -0,0 +1,45 @@
+class DimensionCache:
+    """
+    In-memory lookup for small dimension tables (Catagory, Logo, Partners, ...)
+    keyed by a unique text column.
+
+    ``resolve`` takes all distinct keys of a chunk at once: cached keys cost
+    nothing, unknown keys are fetched with one ``IN`` query and, if ``create``
+    is set, the still-missing ones are inserted with one ``bulk_create``.
+    """
+
+    def __init__(self, model, key="name", create=True):
+        self.model = model
+        self.key = key
+        self.create = create
+        self._cache = {}
+
+    def preload(self):
+        """Load the whole table, for dimensions that are small enough."""
+        for obj in self.model.objects.all():
+            self._cache[getattr(obj, self.key)] = obj
+        return self
+
+    def _fetch(self, keys):
+        for obj in self.model.objects.filter(**{f"{self.key}__in": keys}):
+            self._cache[getattr(obj, self.key)] = obj
+
+    def resolve(self, keys):
+        """Make sure every non-empty key in ``keys`` is cached; returns the cache."""
+        missing = {key for key in keys if key} - self._cache.keys()
+        if missing:
+            self._fetch(missing)
+            missing -= self._cache.keys()
+
+        if missing and self.create:
+            # ignore_conflicts: a concurrent import may have created the same rows
+            self.model.objects.bulk_create(
+                [self.model(**{self.key: key}) for key in missing],
+                ignore_conflicts=True,
+            )
+            self._fetch(missing)
+
+        return self._cache
+
+    def get(self, key):
+        return self._cache.get(key)
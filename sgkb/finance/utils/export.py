@@ -0,0 +1,191 @@
+"""
+Row sources for the transaction exports.
+
+Rows are read with ``values_list(...).iterator()`` so no model instances are
+built and the queryset result cache stays empty, whatever the table size.
+"""
+import csv
+import io
+from itertools import islice
+
+import openpyxl
+
+from finance.models import BankTransaction
+
+
+# SGKB export header -> BankTransaction field (None: column kept empty)
+EXPORT_COLUMNS = [
+    ("MONEY_ACCOUNT_NAME", "account_name"),
+    ("MAC_CURRY_ID", None),
+    ("MAC_CURRY_NAME", "currency_type"),
+    ("MACC_TYPE", "macc_type"),
+    ("PRODUKT", "produkt"),
+    ("KUNDEN_NAME", "customer_name"),
+    ("TRX_ID", "trx_id"),
+    ("TRX_TYPE_ID", "trx_type_id"),
+    ("TRX_TYPE_SHORT", "trx_type_short"),
+    ("TRX_TYPE_NAME", "trx_type_name"),
+    ("BUCHUNGS_ART_SHORT", "buchungs_art_short"),
+    ("BUCHUNGS_ART_NAME", "buchungs_art_name"),
+    ("VAL_DATE", "val_date"),
+    ("TRX_DATE", "trx_date"),
+    ("DIRECTION", "direction"),
+    ("AMOUNT", "amount"),
+    ("TRX_CURRY_ID", "trx_curry_id"),
+    ("TRX_CURRY_NAME", "trx_curry_name"),
+    ("TEXT_SHORT_CREDITOR", "text_short_creditor"),
+    ("TEXT_CREDITOR", "text_creditor"),
+    ("TEXT_SHORT_DEBITOR", "text_short_debitor"),
+    ("TEXT_DEBITOR", "text_debitor"),
+    ("POINT_OF_SALE_AND_LOCATION", "point_of_sale_and_location"),
+    ("ACQUIRER_COUNTRY_ID", "acquirer_country_id"),
+    ("ACQUIRER_COUNTRY_NAME", "acquirer_country_name"),
+    ("CARD_ID", "card_id"),
+    ("CRED_ACC_TEXT", "cred_acc_text"),
+    ("CRED_IBAN", "cred_iban"),
+    ("CRED_ADDR_TEXT", "cred_addr_text"),
+    ("CRED_REF_NR", "cred_ref_nr"),
+    ("CRED_INFO", "cred_info"),
+]
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Rows per worksheet including the header row
+EXCEL_MAX_ROWS = 1_048_576
+
+# Rows per Parquet row group / Arrow record batch
+ARROW_BATCH_ROWS = 64_000
+
+ARROW_FORMATS = {
+    "parquet": ("transactions.parquet", "application/vnd.apache.parquet"),
+    "arrow": ("transactions.arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def select_columns(headers=None):
+    """
+    (header, field) pairs for the requested headers, in export order.
+    ZEILEN_NR is always written first and needs no entry; no headers means all columns.
+    """
+    if not headers:
+        return EXPORT_COLUMNS
+    wanted = set(headers)
+    return [(header, field) for header, field in EXPORT_COLUMNS if header in wanted]
+
+
+def export_headers(columns=EXPORT_COLUMNS):
+    return ["ZEILEN_NR"] + [header for header, _ in columns]
+
+
+def export_rows(queryset, columns=EXPORT_COLUMNS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield export rows (with ZEILEN_NR first) straight from a database cursor."""
+    fields = [field for _, field in columns if field] or ["pk"]
+    # Only the selected columns are fetched
+    for idx, values in enumerate(queryset.values_list(*fields).iterator(chunk_size=chunk_size), start=1):
+        values = iter(values)
+        yield [idx] + [next(values) if field else None for _, field in columns]
+
+
+def iter_csv(rows, columns=EXPORT_COLUMNS, flush_every=500):
+    """Encode rows as CSV text, yielding a piece every ``flush_every`` rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(export_headers(columns))
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % flush_every == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_xlsx(rows, target, columns=EXPORT_COLUMNS, sheet_rows=EXCEL_MAX_ROWS - 1, on_progress=None, progress_every=10_000):
+    """
+    Write rows into a write-only workbook, starting a new sheet (with its own
+    header) every ``sheet_rows`` rows. ``target`` is a path or a binary file.
+    Returns the number of rows written.
+    """
+    headers = export_headers(columns)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = None
+    count = 0
+    for row in rows:
+        if count % sheet_rows == 0:
+            sheet_no = count // sheet_rows + 1
+            ws = wb.create_sheet("Transactions" if sheet_no == 1 else f"Transactions ({sheet_no})")
+            ws.append(headers)
+        # None cells are skipped entirely by the write-only writer, "" is not
+        ws.append([None if value == "" else value for value in row])
+        count += 1
+        if on_progress and count % progress_every == 0:
+            on_progress(count)
+
+    if ws is None:
+        wb.create_sheet("Transactions").append(headers)
+    wb.save(target)
+    return count
+
+
+def arrow_schema(columns=EXPORT_COLUMNS):
+    """
+    Arrow schema for the export, typed after the model fields:
+    decimals keep their precision, dates are date32 and integers keep their width.
+    """
+    import pyarrow as pa
+
+    integer_types = {
+        "SmallIntegerField": pa.int16(),
+        "IntegerField": pa.int32(),
+        "BigIntegerField": pa.int64(),
+    }
+
+    def arrow_type(field):
+        if not field:
+            return pa.string()
+        model_field = BankTransaction._meta.get_field(field)
+        internal = model_field.get_internal_type()
+        if internal == "DecimalField":
+            return pa.decimal128(model_field.max_digits, model_field.decimal_places)
+        if internal == "DateField":
+            return pa.date32()
+        return integer_types.get(internal, pa.string())
+
+    return pa.schema(
+        [pa.field("ZEILEN_NR", pa.int64(), nullable=False)]
+        + [pa.field(header, arrow_type(field)) for header, field in columns]
+    )
+
+
+def iter_record_batches(rows, schema, batch_rows=ARROW_BATCH_ROWS):
+    """Turn export rows into Arrow record batches of at most ``batch_rows`` rows."""
+    import pyarrow as pa
+
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_rows)):
+        arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_arrow(rows, target, columns=EXPORT_COLUMNS, fmt="parquet", batch_rows=ARROW_BATCH_ROWS):
+    """
+    Write rows as Parquet (one row group per batch) or as an Arrow IPC file.
+    ``target`` is a path or a binary file. Returns the number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(columns)
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(target, schema, compression="zstd")
+    elif fmt == "arrow":
+        writer = pa.ipc.new_file(target, schema)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    count = 0
+    with writer:
+        for batch in iter_record_batches(rows, schema, batch_rows):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
@@ -1,3 +1,6 @@
+from .search import search_q
+
+
 class TransactionFilter:
     @staticmethod
     def apply(
@@ -8,6 +11,7 @@ class TransactionFilter:
         min_amount=None,
         max_amount=None,
         country=None,
+        country_code=None,
         direction=None,
         produkt=None,
         account_name=None,
@@ -23,9 +27,10 @@ class TransactionFilter:
         cred_ref_nr=None,
         cred_info=None,
         category=None,
+        search=None,
     ):
         if category:
-            queryset = queryset.filter(category=category)
+            queryset = queryset.filter(catagory__name=category)
         # Dates
         if start_date:
             queryset = queryset.filter(val_date__gte=start_date)
@@ -42,9 +47,17 @@ class TransactionFilter:
         if direction:
             queryset = queryset.filter(direction=direction)
 
-        # Country
+        # Country: a substring of the name; country_code matches the indexed ISO code
         if country:
             queryset = queryset.filter(acquirer_country_name__icontains=country)
+        if country_code:
+            queryset = queryset.filter(acquirer_country_code=country_code.upper())
+
+        # Full-text search over all text columns, through the search index
+        if search:
+            q = search_q(search)
+            if q is not None:
+                queryset = queryset.filter(q)
 
         # Strings (LIKE searches)
         if produkt:
@@ -76,9 +89,5 @@ class TransactionFilter:
 
         # Example for payment_method (if you map it to a field in the model)
         if payment_method:
-            print(len(queryset))
-            print(payment_method)
             queryset = queryset.filter(trx_type_name__icontains=payment_method)
-
-            print(len(queryset))
         return queryset
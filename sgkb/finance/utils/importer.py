@@ -0,0 +1,665 @@
+"""
+Bulk import of SGKB transaction exports into ``BankTransaction``.
+
+The importer works on whole pandas columns instead of single rows: every
+date, integer and decimal column is coerced once per frame and the result is
+written with batched ``bulk_create`` calls. Files are read in fixed-size
+chunks so memory stays constant regardless of the export size.
+"""
+import hashlib
+import io
+import time
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.db import models, transaction
+
+from finance.models import BankTransaction, Catagory, ImportJob, ImportWatermark
+
+from .cache import bump_data_version
+from .countries import country_code
+from .dimensions import DimensionCache
+
+
+# SGKB export header -> BankTransaction field
+COLUMN_MAP = {
+    "MONEY_ACCOUNT_NAME": "account_name",
+    "MAC_CURRY_NAME": "currency_type",
+    "MACC_TYPE": "macc_type",
+    "PRODUKT": "produkt",
+    "KUNDEN_NAME": "customer_name",
+    "TRX_ID": "trx_id",
+    "TRX_TYPE_ID": "trx_type_id",
+    "TRX_TYPE_SHORT": "trx_type_short",
+    "TRX_TYPE_NAME": "trx_type_name",
+    "BUCHUNGS_ART_SHORT": "buchungs_art_short",
+    "BUCHUNGS_ART_NAME": "buchungs_art_name",
+    "VAL_DATE": "val_date",
+    "TRX_DATE": "trx_date",
+    "DIRECTION": "direction",
+    "AMOUNT": "amount",
+    "TRX_CURRY_ID": "trx_curry_id",
+    "TRX_CURRY_NAME": "trx_curry_name",
+    "TEXT_SHORT_CREDITOR": "text_short_creditor",
+    "TEXT_CREDITOR": "text_creditor",
+    "TEXT_SHORT_DEBITOR": "text_short_debitor",
+    "TEXT_DEBITOR": "text_debitor",
+    "POINT_OF_SALE_AND_LOCATION": "point_of_sale_and_location",
+    "ACQUIRER_COUNTRY_ID": "acquirer_country_id",
+    "ACQUIRER_COUNTRY_NAME": "acquirer_country_name",
+    "CARD_ID": "card_id",
+    "CRED_ACC_TEXT": "cred_acc_text",
+    "CRED_IBAN": "cred_iban",
+    "CRED_ADDR_TEXT": "cred_addr_text",
+    "CRED_REF_NR": "cred_ref_nr",
+    "CRED_INFO": "cred_info",
+}
+
+CATEGORY_COLUMN = "category"
+HASH_COLUMN = "row_hash"
+COUNTRY_CODE_COLUMN = "acquirer_country_code"  # derived from ACQUIRER_COUNTRY_NAME, not part of the row hash
+
+DATE_FIELDS = ("val_date", "trx_date")
+INT_FIELDS = ("trx_id", "trx_type_id", "direction", "trx_curry_id", "acquirer_country_id")
+DECIMAL_FIELDS = ("amount",)
+REQUIRED_FIELDS = ("trx_id", "val_date", "trx_date", "direction")  # NOT NULL columns
+FIELD_HEADERS = {field: header for header, field in COLUMN_MAP.items()}
+MAX_LENGTHS = {
+    field.name: field.max_length
+    for field in BankTransaction._meta.get_fields()
+    if isinstance(field, models.CharField) and field.name in FIELD_HEADERS
+}
+
+VALID_DIRECTIONS = (1, 2)
+IBAN_MIN_LENGTH, IBAN_MAX_LENGTH = 15, 34
+AMOUNT_LIMIT = 10 ** 10  # DecimalField(max_digits=12, decimal_places=2)
+REJECT_REASON_COLUMN = "REJECT_REASON"
+CONFLICT_REASON = "TRX_ID already stored with different content; import in update mode to overwrite it"
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def read_csv(source, **kwargs):
+    """
+    Read an export with every column as plain text.
+    Type coercion is left to ``normalize_frame`` so it happens once per column.
+    """
+    return pd.read_csv(source, sep=",", dtype=str, keep_default_na=False, **kwargs)
+
+
+def spool_upload(upload):
+    """
+    Copy an uploaded file to ``IMPORT_SPOOL_DIR`` chunk by chunk.
+    Returns the path so a background worker can stream it later.
+    """
+    spool_dir = Path(settings.IMPORT_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    path = spool_dir / f"{uuid.uuid4().hex}-{Path(upload.name).name}"
+    with open(path, "wb") as fh:
+        for chunk in upload.chunks():
+            fh.write(chunk)
+    return path
+
+
+def _record_end(block):
+    """
+    Offset just past the last complete CSV record in ``block``, or None.
+    A newline only ends a record if the quotes before it are balanced.
+    """
+    quotes = block.count(b'"')
+    end = block.rfind(b"\n")
+    while end != -1:
+        if (quotes - block.count(b'"', end)) % 2 == 0:
+            return end + 1
+        end = block.rfind(b"\n", 0, end)
+    return None
+
+
+def iter_csv_blocks(path, block_size):
+    """
+    Split a CSV file into ``(header, block)`` byte pairs of roughly ``block_size``.
+    Blocks always end on a record boundary so they can be parsed independently.
+    """
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        carry = b""
+        while data := fh.read(block_size):
+            block = carry + data
+            end = _record_end(block)
+            if end is None:
+                carry = block
+                continue
+            yield header, block[:end]
+            carry = block[end:]
+        if carry.strip():
+            yield header, carry
+
+
+def parse_block(header, block):
+    """
+    Parse, normalize and validate one block from ``iter_csv_blocks``.
+    Runs in worker processes; returns the valid frame, the rejects and the
+    parse and coerce seconds.
+    """
+    started = time.perf_counter()
+    df = read_csv(io.BytesIO(header + block))
+    parsed = time.perf_counter()
+    frame, rejects = prepare_frame(df)
+    return frame, rejects, parsed - started, time.perf_counter() - parsed
+
+
+# Date formats of SGKB exports, tried in order on every value. Without an explicit
+# format pandas infers one from the first value of the chunk and coerces the
+# values that do not match it, so results would depend on chunk boundaries.
+DATE_FORMATS = ("ISO8601", "%d.%m.%Y", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M")
+
+
+def _to_dates(series):
+    cleaned = series.str.strip().where(series.str.strip() != "")
+    parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    for date_format in DATE_FORMATS:
+        missing = parsed.isna() & cleaned.notna()
+        if not missing.any():
+            break
+        parsed = parsed.combine_first(pd.to_datetime(cleaned[missing], format=date_format, errors="coerce"))
+    # Anything else is parsed value by value, as the row-by-row importer did
+    missing = parsed.isna() & cleaned.notna()
+    if missing.any():
+        parsed = parsed.combine_first(pd.to_datetime(cleaned[missing], format="mixed", errors="coerce"))
+    return [value.date() if not pd.isna(value) else None for value in parsed]
+
+
+def _to_ints(series):
+    # to_numeric only validates: one blank value turns its result into float64,
+    # which rounds IDs above 2**53, so the values come from the strings themselves
+    cleaned = series.str.strip()
+    valid = pd.to_numeric(cleaned, errors="coerce").notna()
+    return [_to_int(value) if ok else None for value, ok in zip(cleaned, valid)]
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        number = Decimal(value)  # "12.0", "1e3"
+        # "2.5" is not an integer; int() would truncate it to a valid-looking value
+        return int(number) if number.is_finite() and number == number.to_integral_value() else None
+
+
+CENT = Decimal("0.01")
+
+
+def _to_decimals(series):
+    cleaned = series.str.strip().str.replace(",", ".", regex=False)  # handle comma decimals
+    valid = pd.to_numeric(cleaned, errors="coerce").notna()
+    return [_to_decimal(value) if ok else None for value, ok in zip(cleaned, valid)]
+
+
+def _to_decimal(value):
+    number = Decimal(value)
+    if not number.is_finite():  # "inf", "Infinity"
+        return None
+    # quantize fails beyond the context precision ("1e30"); validate_frame rejects those as out of range
+    return number.quantize(CENT) if abs(number) < AMOUNT_LIMIT else number
+
+
+def row_hashes(frame):
+    """
+    Content hash per row over the normalized values.
+    Identical transactions hash identically no matter how the source formatted them.
+    """
+    columns = [frame[field].fillna("").astype(str) for field in list(COLUMN_MAP.values()) + [CATEGORY_COLUMN]]
+    joined = columns[0].str.cat(columns[1:], sep="\x1f")
+    return [hashlib.blake2b(value.encode(), digest_size=16).hexdigest() for value in joined]
+
+
+def country_codes(names):
+    """ISO alpha-2 code per country name; each distinct name is looked up once."""
+    codes = {name: country_code(name) for name in names.unique()}
+    return pd.Series([codes[name] for name in names], index=names.index, dtype=object)
+
+
+def normalize_frame(df):
+    """
+    Map SGKB headers to model fields and coerce the typed columns.
+    Missing text columns become empty strings, missing typed columns ``None``.
+    """
+    df = df.rename(columns=COLUMN_MAP)
+    out = pd.DataFrame(index=df.index)
+
+    for field in COLUMN_MAP.values():
+        column = df[field].fillna("").astype(str) if field in df else pd.Series("", index=df.index)
+        if field in DATE_FIELDS:
+            out[field] = pd.Series(_to_dates(column), index=df.index, dtype=object)
+        elif field in INT_FIELDS:
+            out[field] = pd.Series(_to_ints(column), index=df.index, dtype=object)
+        elif field in DECIMAL_FIELDS:
+            out[field] = pd.Series(_to_decimals(column), index=df.index, dtype=object)
+        else:
+            out[field] = column
+
+    if CATEGORY_COLUMN in df:
+        out[CATEGORY_COLUMN] = df[CATEGORY_COLUMN].fillna("").astype(str).str.strip()
+    else:
+        out[CATEGORY_COLUMN] = ""
+
+    out[HASH_COLUMN] = row_hashes(out) if len(out) else []
+    out[COUNTRY_CODE_COLUMN] = country_codes(out["acquirer_country_name"])
+    return out
+
+
+def validate_frame(frame):
+    """
+    Check a normalized frame with whole-column operations.
+    Returns the reject reason for every row, an empty string for valid rows.
+    """
+    reasons = pd.Series("", index=frame.index, dtype=object)
+
+    def flag(mask, message):
+        nonlocal reasons
+        reasons = reasons.mask(mask, reasons + message + "; ")
+
+    for field in REQUIRED_FIELDS:
+        flag(frame[field].isna(), f"{FIELD_HEADERS[field]} missing or invalid")
+    flag(frame["direction"].notna() & ~frame["direction"].isin(VALID_DIRECTIONS), "DIRECTION must be 1 or 2")
+
+    amount = pd.to_numeric(frame["amount"], errors="coerce")
+    flag(amount.isna(), "AMOUNT is not numeric")
+    flag(amount.abs() >= AMOUNT_LIMIT, "AMOUNT out of range")
+
+    iban_length = frame["cred_iban"].str.replace(" ", "", regex=False).str.len()
+    flag((iban_length > 0) & ~iban_length.between(IBAN_MIN_LENGTH, IBAN_MAX_LENGTH), "CRED_IBAN has an invalid length")
+
+    for field, max_length in MAX_LENGTHS.items():
+        flag(frame[field].str.len() > max_length, f"{FIELD_HEADERS[field]} longer than {max_length} characters")
+
+    return reasons.str.removesuffix("; ")
+
+
+def prepare_frame(df):
+    """
+    Normalize and validate a raw chunk.
+    Returns (valid rows, rejected source rows with a REJECT_REASON column).
+    """
+    frame = normalize_frame(df)
+    reasons = validate_frame(frame)
+    invalid = reasons != ""
+    rejects = df[invalid].assign(**{REJECT_REASON_COLUMN: reasons[invalid]})
+    return frame[~invalid], rejects
+
+
+class RejectsWriter:
+    """Append rejected rows to a CSV file, chunk by chunk."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.rows = 0
+
+    def write(self, rejects):
+        if rejects.empty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rejects.to_csv(self.path, mode="a" if self.rows else "w", header=not self.rows, index=False)
+        self.rows += len(rejects)
+
+
+ARROW_SUFFIXES = (".parquet", ".pq", ".arrow", ".feather", ".ipc")
+
+
+def is_arrow_source(source):
+    name = str(getattr(source, "name", source))
+    return name.lower().endswith(ARROW_SUFFIXES)
+
+
+def _arrow_types():
+    import pyarrow as pa
+
+    types = {field: pa.date32() for field in DATE_FIELDS}
+    types.update({field: pa.int64() for field in INT_FIELDS})
+    types.update({field: pa.decimal128(12, 2) for field in DECIMAL_FIELDS})
+    return types
+
+
+def _cast_column(column, field, arrow_type):
+    """
+    Python values of a date or integer column. A single value the cast cannot
+    take ("x", "15.01.2025", 2.5) fails the whole cast; the column is then
+    parsed from its text like a CSV column, so only those rows are rejected.
+    """
+    try:
+        return column.cast(arrow_type).to_pylist()
+    except (ValueError, NotImplementedError):  # ArrowInvalid, ArrowNotImplementedError
+        text = column.cast("string").fill_null("").to_pandas()
+        return _to_dates(text) if field in DATE_FIELDS else _to_ints(text)
+
+
+def normalize_table(table):
+    """
+    Arrow counterpart of ``normalize_frame``.
+    Date and integer columns are cast by Arrow and converted straight to
+    Python values, or parsed from their text when the cast fails; amounts
+    always go through the CSV parser so that non-finite or oversized values
+    become rejects. The result has the same layout and row hashes.
+    """
+    types = _arrow_types()
+    table = table.rename_columns([COLUMN_MAP.get(name, name) for name in table.column_names])
+    present = set(table.column_names)
+    out = pd.DataFrame(index=pd.RangeIndex(table.num_rows))
+
+    for field in COLUMN_MAP.values():
+        if field not in present:
+            out[field] = pd.Series([None] * table.num_rows if field in types else "", index=out.index, dtype=object)
+        elif field in DECIMAL_FIELDS:
+            # Parsed like CSV text: a float or wide decimal column may hold values the cast would fail on
+            amounts = table[field].cast("string").fill_null("").to_pandas()
+            out[field] = pd.Series(_to_decimals(amounts), index=out.index, dtype=object)
+        elif field in types:
+            out[field] = pd.Series(_cast_column(table[field], field, types[field]), index=out.index, dtype=object)
+        else:
+            out[field] = pd.Series(table[field].cast("string").fill_null("").to_pylist(), index=out.index, dtype=object)
+
+    if CATEGORY_COLUMN in present:
+        out[CATEGORY_COLUMN] = table[CATEGORY_COLUMN].cast("string").fill_null("").to_pandas().str.strip()
+    else:
+        out[CATEGORY_COLUMN] = ""
+
+    out[HASH_COLUMN] = row_hashes(out) if len(out) else []
+    out[COUNTRY_CODE_COLUMN] = country_codes(out["acquirer_country_name"])
+    return out
+
+
+def prepare_table(table):
+    """
+    Arrow counterpart of ``prepare_frame``.
+    Rejected rows are written back with their SGKB headers.
+    """
+    frame = normalize_table(table)
+    reasons = validate_frame(frame)
+    invalid = reasons != ""
+    rejects = (
+        frame[invalid]
+        .drop(columns=[HASH_COLUMN, COUNTRY_CODE_COLUMN])
+        .rename(columns=FIELD_HEADERS)
+        .assign(**{REJECT_REASON_COLUMN: reasons[invalid]})
+    )
+    return frame[~invalid], rejects
+
+
+def iter_arrow_frames(source):
+    """
+    Yield prepared (frame, rejects) pairs from a Parquet file (one per row group)
+    or an Arrow IPC file/stream (one per record batch), keeping memory bounded.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if str(getattr(source, "name", source)).lower().endswith((".parquet", ".pq")):
+        parquet = pq.ParquetFile(source)
+        for index in range(parquet.num_row_groups):
+            yield prepare_table(parquet.read_row_group(index))
+        return
+
+    try:
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        batches = pa.ipc.open_stream(source)
+    for batch in batches:
+        yield prepare_table(pa.Table.from_batches([batch]))
+
+
+@dataclass(slots=True)
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        summary = f"{self.inserted} of {self.rows} rows imported in {self.seconds:.1f}s ({self.rows_per_second:,.0f} rows/s)"
+        if self.updated:
+            summary += f", {self.updated} updated"
+        if self.skipped:
+            summary += f", {self.skipped} already known"
+        if self.rejected:
+            summary += f", {self.rejected} rejected"
+        return summary
+
+
+class TransactionImporter:
+    """
+    Write normalized frames to the database in batches.
+    Every batch is committed in its own transaction.
+
+    Modes (see ``ImportJob.MODE_CHOICES``):
+    - ``insert``: append every row without a lookup; rows already stored with
+      the same ``(trx_id, row_hash)`` are left out by the unique constraint
+      and counted as skipped.
+    - ``skip``: skip rows already stored with the same ``(trx_id, row_hash)``.
+      A row whose ``trx_id`` is stored with other content is a correction
+      and is rejected, so it is not stored as a second transaction.
+    - ``update``: like ``skip``, but a row whose ``trx_id`` matches exactly one
+      stored transaction with a different hash overwrites that transaction.
+
+    With ``incremental`` set, rows at or below the ``ImportWatermark`` of their
+    account for ``source`` are dropped before any database lookup, and the
+    watermarks advance after each written chunk. Meant for cumulative extracts
+    where older rows are never corrected.
+    """
+
+    UPDATE_FIELDS = list(COLUMN_MAP.values()) + ["catagory", HASH_COLUMN, COUNTRY_CODE_COLUMN]
+
+    def __init__(
+        self,
+        batch_size=DEFAULT_BATCH_SIZE,
+        mode=ImportJob.MODE_INSERT,
+        rejects_path=None,
+        incremental=False,
+        source="default",
+    ):
+        self.batch_size = batch_size
+        self.mode = mode
+        self.rejects = RejectsWriter(rejects_path) if rejects_path else None
+        self.incremental = incremental
+        self.source = source
+        # Filtering uses the watermarks as they were when the import started;
+        # rows of later chunks are compared against those, not each other.
+        self._start_marks = {}
+        if incremental:
+            self._start_marks = {
+                wm.account_name: (pd.Timestamp(wm.max_trx_date), wm.max_trx_id)
+                for wm in ImportWatermark.objects.filter(source=source)
+            }
+        self.watermarks = dict(self._start_marks)
+        self.result = ImportResult()
+        self.categories = DimensionCache(Catagory)
+
+    def import_file(self, source, chunksize=DEFAULT_CHUNK_SIZE, on_chunk=None):
+        """
+        Stream ``source`` through the importer ``chunksize`` rows at a time,
+        or one row group / record batch at a time for Parquet and Arrow files.
+        ``on_chunk`` is called with the running result after every chunk.
+        """
+        if is_arrow_source(source):
+            started = time.perf_counter()
+            for frame, rejects in iter_arrow_frames(source):
+                self.result.seconds += time.perf_counter() - started
+                self.write_frame(frame, rejects)
+                if on_chunk:
+                    on_chunk(self.result)
+                started = time.perf_counter()
+            return self.result
+
+        with read_csv(source, chunksize=chunksize) as reader:
+            for df in reader:
+                self.import_frame(df)
+                if on_chunk:
+                    on_chunk(self.result)
+        return self.result
+
+    def import_frame(self, df):
+        started = time.perf_counter()
+        frame, rejects = prepare_frame(df)
+        self.result.seconds += time.perf_counter() - started
+        return self.write_frame(frame, rejects)
+
+    def write_frame(self, frame, rejects=None):
+        """
+        Write valid rows from ``prepare_frame`` and stream the rejects to
+        ``rejects_path``; invalid rows never abort the rest of the import.
+        """
+        started = time.perf_counter()
+        rejected = len(rejects) if rejects is not None else 0
+        self.result.rows += len(frame) + rejected
+        self.result.rejected += rejected
+        if self.rejects and rejected:
+            self.rejects.write(rejects)
+
+        if self.incremental:
+            fresh = self._above_watermark(frame)
+            self.result.skipped += int((~fresh).sum())
+            frame = frame[fresh]
+
+        unique = ~frame.duplicated(["trx_id", HASH_COLUMN])
+        self.result.skipped += int((~unique).sum())
+        frame = frame[unique]
+
+        self.categories.resolve(frame[CATEGORY_COLUMN].unique())
+
+        for start in range(0, len(frame), self.batch_size):
+            self._write(frame.iloc[start:start + self.batch_size])
+
+        if self.incremental:
+            self._advance_watermarks(frame)
+
+        self.result.seconds += time.perf_counter() - started
+        return self.result
+
+    def _above_watermark(self, frame):
+        """Mask of rows newer than their account's (trx_date, trx_id) watermark."""
+        if not self._start_marks:
+            return pd.Series(True, index=frame.index)
+
+        accounts = frame["account_name"]
+        mark_date = pd.to_datetime(accounts.map({account: date for account, (date, _) in self._start_marks.items()}))
+        mark_id = pd.to_numeric(accounts.map({account: trx_id for account, (_, trx_id) in self._start_marks.items()}))
+        trx_date = pd.to_datetime(frame["trx_date"])
+        trx_id = pd.to_numeric(frame["trx_id"])
+        newer = (trx_date > mark_date) | ((trx_date == mark_date) & (trx_id > mark_id))
+        return mark_date.isna() | newer
+
+    def _advance_watermarks(self, frame):
+        """Persist the highest (trx_date, trx_id) per account of a written chunk."""
+        if frame.empty:
+            return
+        latest = frame.sort_values(["trx_date", "trx_id"]).groupby("account_name").tail(1)
+
+        updates = []
+        for account_name, trx_date, trx_id in zip(latest["account_name"], latest["trx_date"], latest["trx_id"]):
+            mark = (pd.Timestamp(trx_date), trx_id)
+            if account_name in self.watermarks and self.watermarks[account_name] >= mark:
+                continue
+            self.watermarks[account_name] = mark
+            updates.append(ImportWatermark(
+                source=self.source,
+                account_name=account_name,
+                max_trx_date=trx_date,
+                max_trx_id=trx_id,
+            ))
+
+        ImportWatermark.objects.bulk_create(
+            updates,
+            update_conflicts=True,
+            unique_fields=["source", "account_name"],
+            update_fields=["max_trx_date", "max_trx_id", "updated_at"],
+        )
+
+    def _split_known(self, objs):
+        """
+        Look up the batch's trx_ids in one query. Returns (new, changed,
+        conflicts): rows to insert, known rows to rewrite and the positions
+        of corrections that skip mode rejects.
+        """
+        known = {}
+        existing = BankTransaction.objects.filter(trx_id__in={obj.trx_id for obj in objs})
+        for trx_id, row_hash, pk in existing.values_list("trx_id", HASH_COLUMN, "pk"):
+            known.setdefault(trx_id, []).append((row_hash, pk))
+
+        new, changed, conflicts, claimed = [], [], [], set()
+        for position, obj in enumerate(objs):
+            entries = known.get(obj.trx_id, [])
+            if any(row_hash == obj.row_hash for row_hash, _ in entries):
+                self.result.skipped += 1
+            elif self.mode == ImportJob.MODE_UPDATE and len(entries) == 1 and entries[0][1] not in claimed:
+                obj.pk = entries[0][1]
+                claimed.add(obj.pk)
+                changed.append(obj)
+            elif self.mode == ImportJob.MODE_SKIP and entries:
+                conflicts.append(position)
+            else:
+                new.append(obj)
+        return new, changed, conflicts
+
+    def _reject(self, frame, reason):
+        """Count rows rejected at write time and add them to the rejects file."""
+        self.result.rejected += len(frame)
+        if self.rejects:
+            self.rejects.write(
+                frame
+                .drop(columns=[HASH_COLUMN, COUNTRY_CODE_COLUMN])
+                .rename(columns=FIELD_HEADERS)
+                .assign(**{REJECT_REASON_COLUMN: reason})
+            )
+
+    def _write(self, frame):
+        objs = []
+        for row in frame.to_dict("records"):
+            category_name = row.pop(CATEGORY_COLUMN)
+            objs.append(BankTransaction(**row, catagory=self.categories.get(category_name)))
+
+        if self.mode == ImportJob.MODE_INSERT:
+            self._insert_all(objs)
+            return
+
+        objs, changed, conflicts = self._split_known(objs)
+        if conflicts:
+            self._reject(frame.iloc[conflicts], CONFLICT_REASON)
+
+        with transaction.atomic():
+            BankTransaction.objects.bulk_create(objs, batch_size=self.batch_size)
+            BankTransaction.objects.bulk_update(changed, self.UPDATE_FIELDS, batch_size=self.batch_size)
+            if objs or changed:
+                transaction.on_commit(bump_data_version)
+
+        self.result.inserted += len(objs)
+        self.result.updated += len(changed)
+
+    def _insert_all(self, objs):
+        """
+        Insert mode: no lookup before writing. Rows already stored are left
+        out by the (trx_id, row_hash) constraint instead of failing the batch;
+        two counts on the constraint's index tell how many were new.
+        """
+        stored = BankTransaction.objects.filter(trx_id__in={obj.trx_id for obj in objs})
+        with transaction.atomic():
+            before = stored.count()
+            BankTransaction.objects.bulk_create(objs, batch_size=self.batch_size, ignore_conflicts=True)
+            inserted = stored.count() - before
+            if inserted:
+                transaction.on_commit(bump_data_version)
+
+        self.result.inserted += inserted
+        self.result.skipped += len(objs) - inserted
@@ -0,0 +1,146 @@
+"""
+Registry of hot transaction queries and a check of their query plans.
+
+Each entry builds the queryset of one frequent access path (a filter of
+``TransactionFilter.apply``, an aggregate resolver, an agent tool) with
+representative arguments. ``check_query_plans`` runs ``EXPLAIN`` on all of
+them and reports the tables they read with a full scan, so a dropped or
+mismatched index shows up in CI instead of in production.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date
+from importlib import import_module
+
+from django.db import connection, transaction
+
+from finance.models import BankTransaction
+
+from .aggregate import grouped_queryset
+from .filter import TransactionFilter
+from .timeseries import time_series_queryset
+
+# Modules that register hot queries of their own when imported
+HOT_QUERY_MODULES = (
+    "finance.graphql.query",
+    "ai_manager.utils.tools",
+)
+
+HOT_QUERIES = {}
+
+# Sample filter values; plans depend on which columns are compared, not on the values
+SAMPLE_START, SAMPLE_END = date(2025, 1, 1), date(2025, 3, 31)
+
+# "SCAN finance_banktransaction [USING INDEX ...]" visits every row, "SEARCH" a range (SQLite);
+# "SCAN <fts table> VIRTUAL TABLE INDEX" is a lookup in the full-text index
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (?:TABLE )?(\w+)\b(?! VIRTUAL TABLE)")
+# "Seq Scan on finance_banktransaction" (PostgreSQL)
+POSTGRES_FULL_SCAN = re.compile(r"\bSeq Scan on (\w+)")
+
+
+def hot_query(name):
+    """Register a function returning the queryset of a hot access path."""
+
+    def register(build):
+        HOT_QUERIES[name] = build
+        return build
+
+    return register
+
+
+def _filtered(**filters):
+    return TransactionFilter.apply(BankTransaction.objects.all(), **filters)
+
+
+@hot_query("transactions by date range")
+def _date_range():
+    return _filtered(start_date=SAMPLE_START, end_date=SAMPLE_END)
+
+
+@hot_query("transactions by direction and date range")
+def _direction_date_range():
+    return _filtered(direction=2, start_date=SAMPLE_START, end_date=SAMPLE_END)
+
+
+@hot_query("transactions by category")
+def _category():
+    return _filtered(category="Groceries")
+
+
+@hot_query("transactions by country code")
+def _country_code():
+    return _filtered(country_code="CH")
+
+
+@hot_query("full-text search")
+def _search():
+    return _filtered(search="migros bahnhof")
+
+
+@hot_query("transactions without a logo")
+def _without_logo():
+    # enrich_transaction_logos works through these, newest first
+    return BankTransaction.objects.filter(logo__isnull=True)[:10]
+
+
+@hot_query("aggregate by category for a direction and date range")
+def _aggregate_category():
+    return grouped_queryset(
+        _filtered(direction=2, start_date=SAMPLE_START, end_date=SAMPLE_END), ["category"], ["sum", "count"]
+    )
+
+
+@hot_query("time series for a date range")
+def _time_series():
+    return time_series_queryset(_filtered(start_date=SAMPLE_START, end_date=SAMPLE_END), "month", True)
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    plan: str
+    full_scans: list
+
+    @property
+    def ok(self):
+        return not self.full_scans
+
+
+def load_hot_queries():
+    for module in HOT_QUERY_MODULES:
+        import_module(module)
+    return HOT_QUERIES
+
+
+def full_scans(plan, vendor=None):
+    """Tables a query plan reads with a full scan."""
+    pattern = POSTGRES_FULL_SCAN if (vendor or connection.vendor) == "postgresql" else SQLITE_FULL_SCAN
+    return sorted(set(pattern.findall(plan)))
+
+
+def explain(queryset):
+    """
+    The plan of ``queryset``. PostgreSQL prefers sequential scans on small
+    tables, so they are disabled for the check and only chosen when no
+    index applies.
+    """
+    if connection.vendor != "postgresql":
+        return queryset.explain()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+
+def check_query_plans(names=None):
+    """A QueryPlan for every registered hot query, or for ``names`` only."""
+    queries = load_hot_queries()
+    unknown = set(names or ()) - queries.keys()
+    if unknown:
+        raise ValueError(f"Unknown hot queries: {', '.join(sorted(unknown))}")
+
+    results = []
+    for name in names or queries:
+        plan = explain(queries[name]())
+        results.append(QueryPlan(name=name, plan=plan, full_scans=full_scans(plan)))
+    return results
@@ -0,0 +1,151 @@
+"""
+Full-text search over the free-text columns of ``BankTransaction``.
+
+On SQLite the columns are indexed in an FTS5 table that shares its rowids
+with ``finance_banktransaction`` and is kept in sync by triggers. On
+PostgreSQL a GIN index over a ``tsvector`` of the same columns serves the
+search, and trigram indexes keep the per-column ``icontains`` filters off
+sequential scans. Every word of a search must appear in the transaction,
+as a whole word or as the start of one ("migros bahnhof" finds
+"MIGROS BAHNHOFSTRASSE ZUERICH").
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+TABLE = "finance_banktransaction"
+FTS_TABLE = "finance_banktransaction_fts"
+
+SEARCH_FIELDS = (
+    "text_short_creditor",
+    "text_creditor",
+    "text_short_debitor",
+    "text_debitor",
+    "point_of_sale_and_location",
+    "customer_name",
+    "account_name",
+    "cred_acc_text",
+    "cred_iban",
+    "cred_addr_text",
+    "cred_ref_nr",
+    "cred_info",
+)
+
+# Columns whose icontains filters get a trigram index on PostgreSQL
+TRIGRAM_FIELDS = ("text_short_creditor", "text_creditor", "text_debitor", "cred_addr_text", "cred_info")
+
+WORD = re.compile(r"\w+")
+
+_columns = ", ".join(SEARCH_FIELDS)
+_new = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+_old = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, {_columns}) VALUES (new.id, {_new});
+        END""",
+    f"{FTS_TABLE}_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+        END""",
+    f"{FTS_TABLE}_update": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF {_columns} ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+            INSERT INTO {FTS_TABLE} (rowid, {_columns}) VALUES (new.id, {_new});
+        END""",
+}
+
+# The query must repeat this expression exactly for PostgreSQL to use the index
+POSTGRES_DOCUMENT = "to_tsvector('simple', {})".format(
+    " || ' ' || ".join(f"coalesce({field}, '')" for field in SEARCH_FIELDS)
+)
+
+
+def _install_sqlite(cursor):
+    # External content: the FTS table stores only the index, the text stays in the transactions table
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({_columns}, "
+        f"content='{TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    for sql in SQLITE_TRIGGERS.values():
+        cursor.execute(sql)
+    cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _install_postgresql(cursor):
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS finance_bt_search_idx ON {TABLE} USING gin (({POSTGRES_DOCUMENT}))")
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in TRIGRAM_FIELDS:
+        # Same expression as Django's icontains: UPPER(column::text) LIKE UPPER('%…%')
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS finance_bt_{field}_trgm ON {TABLE} USING gin ((UPPER({field}::text)) gin_trgm_ops)"
+        )
+
+
+def install(connection):
+    """Create the search index for ``connection``'s database and fill it."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            _install_sqlite(cursor)
+        elif connection.vendor == "postgresql":
+            _install_postgresql(cursor)
+
+
+def uninstall(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        elif connection.vendor == "postgresql":
+            cursor.execute("DROP INDEX IF EXISTS finance_bt_search_idx")
+            for field in TRIGRAM_FIELDS:
+                cursor.execute(f"DROP INDEX IF EXISTS finance_bt_{field}_trgm")
+
+
+def repair(connection):
+    """
+    Restore the SQLite triggers after a migration rebuilt the transactions
+    table (SQLite drops triggers with the old table), then refill the index.
+    Does nothing while the search table does not exist yet.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s", [f"{FTS_TABLE}%"])
+        existing = {name for name, in cursor.fetchall()}
+        if FTS_TABLE in existing and not SQLITE_TRIGGERS.keys() <= existing:
+            _install_sqlite(cursor)
+
+
+def search_terms(text):
+    return WORD.findall(text or "")
+
+
+def search_q(text):
+    """
+    A Q matching transactions that contain every word of ``text``; None
+    when ``text`` has no words. Databases without a search index fall back
+    to ``icontains`` over the search columns.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    if connection.vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        return Q(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    if connection.vendor == "postgresql":
+        query = " & ".join(f"{term}:*" for term in terms)
+        return Q(id__in=RawSQL(
+            f"SELECT id FROM {TABLE} WHERE {POSTGRES_DOCUMENT} @@ to_tsquery('simple', %s)", [query]
+        ))
+    q = Q()
+    for term in terms:
+        any_field = Q()
+        for field in SEARCH_FIELDS:
+            any_field |= Q(**{f"{field}__icontains": term})
+        q &= any_field
+    return q
@@ -0,0 +1,146 @@
+"""
+Zero-filled time series of transaction amounts.
+
+Transactions are grouped per period (and per direction when split), and each
+period's share of its series and the running total are computed by window
+functions over the grouped rows, all in one query. Periods without
+transactions are then filled in, so charts get one point per period.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Count, F, FloatField, ExpressionWrapper, Func, Sum, Value, Window
+from django.db.models.functions import NullIf, TruncDay, TruncMonth, TruncQuarter, TruncWeek, TruncYear
+
+from finance.models import BankTransaction
+
+GRANULARITIES = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+    "quarter": TruncQuarter,
+    "year": TruncYear,
+}
+
+DIRECTIONS = [value for value, _ in BankTransaction._meta.get_field("direction").choices]
+
+
+class _SumOver(Func):
+    """SUM() of an aggregate, for use inside a window over grouped rows."""
+    function = "SUM"
+    window_compatible = True
+
+
+class _GroupWindow(Window):
+    """
+    A window over the rows of a GROUP BY. Django would add a plain Window to
+    the GROUP BY clause; this one only groups on its partition and ordering.
+    """
+    contains_aggregate = True
+
+
+def period_index(day, granularity):
+    """Number of the period containing ``day``; consecutive periods differ by one."""
+    if granularity == "day":
+        return day.toordinal()
+    if granularity == "week":
+        # date.min is a Monday, like the weeks of TruncWeek
+        return (day.toordinal() - 1) // 7
+    if granularity == "month":
+        return day.year * 12 + day.month - 1
+    if granularity == "quarter":
+        return day.year * 4 + (day.month - 1) // 3
+    return day.year
+
+
+def period_start(index, granularity):
+    """First day of the period numbered ``index``."""
+    if granularity == "day":
+        return date.fromordinal(index)
+    if granularity == "week":
+        return date.fromordinal(index * 7 + 1)
+    if granularity == "month":
+        return date(index // 12, index % 12 + 1, 1)
+    if granularity == "quarter":
+        return date(index // 4, index % 4 * 3 + 1, 1)
+    return date(index, 1, 1)
+
+
+def series_length(start, end, granularity):
+    """Points in a zero-filled series from ``start`` to ``end``."""
+    return max(period_index(end, granularity) - period_index(start, granularity) + 1, 0)
+
+
+def time_series_queryset(queryset, granularity="month", split_direction=False):
+    """The grouped rows behind ``time_series``, before zero-filling."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    group_by = ["period", "direction"] if split_direction else ["period"]
+    partition = [F("direction")] if split_direction else None
+    return (
+        queryset
+        .annotate(period=GRANULARITIES[granularity]("val_date"))
+        .values(*group_by)
+        .annotate(
+            total=Sum("amount"),
+            count=Count("id"),
+            share=ExpressionWrapper(
+                Sum("amount") * Value(100.0)
+                / NullIf(_GroupWindow(_SumOver(Sum("amount")), partition_by=partition), Value(Decimal(0))),
+                output_field=FloatField(),
+            ),
+            running_total=_GroupWindow(
+                _SumOver(Sum("amount")), partition_by=partition, order_by=F("period").asc()
+            ),
+        )
+        .order_by(*reversed(group_by))
+    )
+
+
+async def time_series(queryset, granularity="month", split_direction=False, start=None, end=None, max_points=None):
+    """
+    One row per period from ``start`` to ``end`` (by default the first and
+    last period with transactions) with ``period``, ``total``, ``count``,
+    ``share`` (percent of the series total) and ``running_total``. With
+    ``split_direction`` there is a separate series per direction, and each
+    row also carries its ``direction``. Series longer than ``max_points``
+    raise ValueError.
+    """
+    rows = time_series_queryset(queryset, granularity, split_direction)
+    found = {
+        (row["period"], row.get("direction")): row
+        async for row in rows
+    }
+    if not found and (start is None or end is None):
+        return []
+
+    periods = [period for period, _ in found]
+    start, end = start or min(periods), end or max(periods)
+    if max_points is not None and series_length(start, end, granularity) > max_points:
+        raise ValueError(f"The series would have more than {max_points} points; use a coarser granularity.")
+    first, last = period_index(start, granularity), period_index(end, granularity)
+    directions = DIRECTIONS if split_direction else [None]
+
+    series = []
+    for direction in directions:
+        running_total = Decimal(0)
+        for index in range(first, last + 1):
+            period = period_start(index, granularity)
+            row = found.get((period, direction))
+            if row is None:
+                # Gaps keep the running total of the period before them
+                point = {"period": period, "total": Decimal(0), "count": 0, "share": 0.0}
+            else:
+                running_total = row["running_total"] or Decimal(0)
+                point = {
+                    "period": period,
+                    "total": row["total"] or Decimal(0),
+                    "count": row["count"],
+                    "share": row["share"] or 0.0,
+                }
+            point["running_total"] = running_total
+            if split_direction:
+                point["direction"] = direction
+            series.append(point)
+    return series
@@ -1,18 +1,23 @@
-import csv
 import datetime
-import io
 import json
-import openpyxl
+import tempfile
 
-from django.http import HttpResponse, JsonResponse
-from django.shortcuts import render
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import TemplateView
 
 from ai_manager.utils import ClankyMultiAgentSystem, NormalizedResponse
-from finance.models import BankTransaction
+from finance.forms import ExportFilterForm
+from finance.models import ExportJob
+from finance.tasks import export_transactions_excel
+from finance.utils.export import ARROW_FORMATS, export_rows, iter_csv, write_arrow, write_xlsx
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 def current_datetime(request):
@@ -161,120 +166,110 @@ class PartnersView(TemplateView):
     template_name = "partners.html"
 
 
+def _export_form(request):
+    form = ExportFilterForm(request.GET)
+    if not form.is_valid():
+        return form, JsonResponse({"errors": form.errors}, status=400)
+    return form, None
+
+
 class ExportTransactionsCSV(View):
     def get(self, request, *args, **kwargs):
-        response = HttpResponse(content_type="text/csv")
+        form, error = _export_form(request)
+        if error:
+            return error
+
+        columns = form.cleaned_data["columns"]
+        rows = export_rows(form.queryset(), columns)
+        response = StreamingHttpResponse(iter_csv(rows, columns), content_type="text/csv")
         response["Content-Disposition"] = 'attachment; filename="transactions.csv"'
+        return response
 
-        writer = csv.writer(response)
-        writer.writerow([
-            "ZEILEN_NR", "MONEY_ACCOUNT_NAME", "MAC_CURRY_ID", "MAC_CURRY_NAME",
-            "MACC_TYPE", "PRODUKT", "KUNDEN_NAME", "TRX_ID", "TRX_TYPE_ID",
-            "TRX_TYPE_SHORT", "TRX_TYPE_NAME", "BUCHUNGS_ART_SHORT", "BUCHUNGS_ART_NAME",
-            "VAL_DATE", "TRX_DATE", "DIRECTION", "AMOUNT", "TRX_CURRY_ID", "TRX_CURRY_NAME",
-            "TEXT_SHORT_CREDITOR", "TEXT_CREDITOR", "TEXT_SHORT_DEBITOR", "TEXT_DEBITOR",
-            "POINT_OF_SALE_AND_LOCATION", "ACQUIRER_COUNTRY_ID", "ACQUIRER_COUNTRY_NAME",
-            "CARD_ID", "CRED_ACC_TEXT", "CRED_IBAN", "CRED_ADDR_TEXT", "CRED_REF_NR", "CRED_INFO"
-        ])
-
-        for idx, tx in enumerate(BankTransaction.objects.all(), start=1):
-            writer.writerow([
-                idx,
-                tx.account_name,
-                "",
-                tx.currency_type,
-                tx.macc_type,
-                tx.produkt,
-                tx.customer_name,
-                tx.trx_id,
-                tx.trx_type_id,
-                tx.trx_type_short,
-                tx.trx_type_name,
-                tx.buchungs_art_short,
-                tx.buchungs_art_name,
-                tx.val_date,
-                tx.trx_date,
-                tx.direction,
-                tx.amount,
-                tx.trx_curry_id,
-                tx.trx_curry_name,
-                tx.text_short_creditor,
-                tx.text_creditor,
-                tx.text_short_debitor,
-                tx.text_debitor,
-                tx.point_of_sale_and_location,
-                tx.acquirer_country_id,
-                tx.acquirer_country_name,
-                tx.card_id,
-                tx.cred_acc_text,
-                tx.cred_iban,
-                tx.cred_addr_text,
-                tx.cred_ref_nr,
-                tx.cred_info,
-            ])
 
-        return response
+class ExportTransactionsArrow(View):
+    """
+    Typed columnar export for analysts, Parquet by default or Arrow IPC with
+    ``fmt="arrow"``. Takes the same query-string filters as the CSV export and
+    is written one row group per cursor chunk into a temporary file.
+    """
+
+    fmt = "parquet"
+
+    def get(self, request, *args, **kwargs):
+        form, error = _export_form(request)
+        if error:
+            return error
+
+        columns = form.cleaned_data["columns"]
+        file_name, content_type = ARROW_FORMATS[self.fmt]
+        fh = tempfile.TemporaryFile()
+        write_arrow(export_rows(form.queryset(), columns), fh, columns, fmt=self.fmt)
+        fh.seek(0)
+        return FileResponse(fh, as_attachment=True, filename=file_name, content_type=content_type)
 
 
 class ExportTransactionsExcel(View):
+    """
+    Takes the same query-string filters as the CSV export. Small results
+    are written into a temporary file and returned directly;
+    above EXCEL_EXPORT_SYNC_LIMIT rows the export runs as a Celery job and
+    the browser is sent to its status page.
+    """
+
     def get(self, request, *args, **kwargs):
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Transactions"
-
-        ws.append([
-            "ZEILEN_NR", "MONEY_ACCOUNT_NAME", "MAC_CURRY_ID", "MAC_CURRY_NAME",
-            "MACC_TYPE", "PRODUKT", "KUNDEN_NAME", "TRX_ID", "TRX_TYPE_ID",
-            "TRX_TYPE_SHORT", "TRX_TYPE_NAME", "BUCHUNGS_ART_SHORT", "BUCHUNGS_ART_NAME",
-            "VAL_DATE", "TRX_DATE", "DIRECTION", "AMOUNT", "TRX_CURRY_ID", "TRX_CURRY_NAME",
-            "TEXT_SHORT_CREDITOR", "TEXT_CREDITOR", "TEXT_SHORT_DEBITOR", "TEXT_DEBITOR",
-            "POINT_OF_SALE_AND_LOCATION", "ACQUIRER_COUNTRY_ID", "ACQUIRER_COUNTRY_NAME",
-            "CARD_ID", "CRED_ACC_TEXT", "CRED_IBAN", "CRED_ADDR_TEXT", "CRED_REF_NR", "CRED_INFO"
-        ])
-
-        for idx, tx in enumerate(BankTransaction.objects.all(), start=1):
-            ws.append([
-                idx,
-                tx.account_name,
-                "",
-                tx.currency_type,
-                tx.macc_type,
-                tx.produkt,
-                tx.customer_name,
-                tx.trx_id,
-                tx.trx_type_id,
-                tx.trx_type_short,
-                tx.trx_type_name,
-                tx.buchungs_art_short,
-                tx.buchungs_art_name,
-                tx.val_date,
-                tx.trx_date,
-                tx.direction,
-                tx.amount,
-                tx.trx_curry_id,
-                tx.trx_curry_name,
-                tx.text_short_creditor,
-                tx.text_creditor,
-                tx.text_short_debitor,
-                tx.text_debitor,
-                tx.point_of_sale_and_location,
-                tx.acquirer_country_id,
-                tx.acquirer_country_name,
-                tx.card_id,
-                tx.cred_acc_text,
-                tx.cred_iban,
-                tx.cred_addr_text,
-                tx.cred_ref_nr,
-                tx.cred_info,
-            ])
-
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-
-        response = HttpResponse(
-            buffer,
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        form, error = _export_form(request)
+        if error:
+            return error
+
+        queryset = form.queryset()
+        total = queryset.count()
+
+        if total > settings.EXCEL_EXPORT_SYNC_LIMIT:
+            job = ExportJob.objects.create(file_name="transactions.xlsx", params=request.GET.dict(), rows_total=total)
+            export_transactions_excel.delay(job.pk)
+            return redirect("export_job", job_id=job.pk)
+
+        columns = form.cleaned_data["columns"]
+        fh = tempfile.TemporaryFile()
+        write_xlsx(export_rows(queryset, columns), fh, columns)
+        fh.seek(0)
+        return FileResponse(
+            fh,
+            as_attachment=True,
+            filename="transactions.xlsx",
+            content_type=XLSX_CONTENT_TYPE,
+        )
+
+
+class ExportJobView(TemplateView):
+    template_name = "export_job.html"
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = get_object_or_404(ExportJob, pk=job_id)
+        return render(request, self.template_name, {"job": job})
+
+
+class ExportJobStatusView(View):
+    def get(self, request, job_id, *args, **kwargs):
+        job = get_object_or_404(ExportJob, pk=job_id)
+        return JsonResponse({
+            "status": job.status,
+            "progress": round(job.progress, 4),
+            "rows_done": job.rows_done,
+            "rows_total": job.rows_total,
+            "error": job.error,
+            "download_url": reverse("export_job_download", args=[job.pk]) if job.is_ready else None,
+        })
+
+
+class ExportJobDownloadView(View):
+    def get(self, request, job_id, *args, **kwargs):
+        job = get_object_or_404(ExportJob, pk=job_id)
+        if not job.is_ready:
+            raise Http404("This export is not ready.")
+        return FileResponse(
+            open(job.file_path, "rb"),
+            as_attachment=True,
+            filename=job.file_name,
+            content_type=XLSX_CONTENT_TYPE,
         )
-        response["Content-Disposition"] = 'attachment; filename="transactions.xlsx"'
-        return response
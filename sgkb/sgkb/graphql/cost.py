@@ -0,0 +1,108 @@
+'''
+Static cost analysis of GraphQL operations.
+
+The cost of an operation is the estimated number of rows each selected
+field is resolved for, summed over all fields: a list of N rows with five
+fields costs 5 * N. Row counts come from per-field estimators, which see the
+coerced arguments (variables included); lists without an estimator are
+assumed to hold ``default_list_size`` rows. Operations over the budget are
+rejected before anything is executed.
+'''
+
+__all__ = (
+    'CostAnalyzer',
+)
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+from graphql.execution.values import get_argument_values, get_variable_values
+
+
+class CostAnalyzer:
+
+    def __init__(self, schema, row_estimators=None, default_list_size=100):
+        '''
+        ``row_estimators`` maps ``(type name, field name)`` to a callable that
+        takes the field's arguments and returns how many rows the field yields
+        per parent row (for lists) or the multiplier for its children (for
+        connections).
+        '''
+        self.schema = schema
+        self.row_estimators = row_estimators or {}
+        self.default_list_size = default_list_size
+
+    def estimate(self, document, operation_name=None, variables=None):
+        '''Estimated cost of the operation, or None when its variables do not coerce.'''
+        schema = self.schema.graphql_schema
+        operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+        if operation_name:
+            operations = [op for op in operations if op.name and op.name.value == operation_name]
+        if len(operations) != 1:
+            return None
+        operation = operations[0]
+
+        coerced = get_variable_values(schema, operation.variable_definitions or (), variables or {})
+        if isinstance(coerced, list):
+            return None
+
+        fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if not isinstance(definition, OperationDefinitionNode)
+        }
+        root_type = schema.get_root_type(operation.operation)
+        return self._selection_cost(root_type, operation.selection_set, 1, fragments, coerced)
+
+    def _field_nodes(self, parent_type, selection_set, fragments):
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                yield parent_type, selection
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = fragments[selection.name.value]
+                fragment_type = self.schema.graphql_schema.get_type(fragment.type_condition.name.value)
+                yield from self._field_nodes(fragment_type, fragment.selection_set, fragments)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = self.schema.graphql_schema.get_type(selection.type_condition.name.value)
+                yield from self._field_nodes(fragment_type, selection.selection_set, fragments)
+
+    def _selection_cost(self, parent_type, selection_set, rows, fragments, variables):
+        cost = 0
+        for field_type, node in self._field_nodes(parent_type, selection_set, fragments):
+            name = node.name.value
+            if name.startswith('__'):
+                continue
+            field_def = field_type.fields[name]
+            cost += rows
+            if node.selection_set is None:
+                continue
+
+            estimator = self.row_estimators.get((field_type.name, name))
+            if estimator is not None:
+                args = get_argument_values(field_def, node, variables)
+                child_rows = rows * max(estimator(args), 1)
+            elif is_list_type(get_nullable_type(field_def.type)):
+                child_rows = rows * self.default_list_size
+            else:
+                child_rows = rows
+            cost += self._selection_cost(
+                get_named_type(field_def.type), node.selection_set, child_rows, fragments, variables
+            )
+        return cost
+
+    def check(self, cost, budget):
+        if cost is not None and cost > budget:
+            raise GraphQLError(
+                f'Query cost {cost} exceeds the budget of {budget}. '
+                'Narrow the filters, select fewer fields or page through a connection.',
+                extensions={'code': 'QUERY_TOO_EXPENSIVE', 'cost': cost, 'budget': budget},
+            )
@@ -0,0 +1,110 @@
+'''
+Per-request batching of foreign-key lookups.
+
+The GraphQL view executes asynchronously: the field resolvers of every row
+in a list are started together before any of them is awaited. A ``load``
+only records its id and waits for the loader's next dispatch, which runs
+on the following turn of the event loop and fetches every recorded id in
+one ``id__in`` query. Later loads in the same request come from the
+loader's cache. Reverse relations (the rows pointing at an object) are
+batched the same way, with one ``<foreign key>__in`` query per dispatch.
+'''
+
+__all__ = (
+    'ForeignKeyLoader',
+    'ReverseRelationLoader',
+    'get_loader',
+    'load_related',
+    'related_resolver',
+    'reverse_resolver',
+)
+
+import asyncio
+
+
+class ForeignKeyLoader:
+    def __init__(self, model):
+        self.model = model
+        self.cache = {}
+        self.pending = set()
+        self.batch = None
+
+    async def load(self, pk):
+        if pk is None:
+            return None
+        if pk not in self.cache:
+            self.pending.add(pk)
+            if self.batch is None:
+                self.batch = asyncio.ensure_future(self.dispatch())
+            await self.batch
+        return self.cache[pk]
+
+    async def load_many(self, ids):
+        return await asyncio.gather(*(self.load(pk) for pk in ids))
+
+    async def dispatch(self):
+        # Let the other resolvers started in this turn record their ids first
+        await asyncio.sleep(0)
+        keys, self.pending, self.batch = self.pending, set(), None
+        self.cache.update(await self.fetch(keys))
+
+    async def fetch(self, keys):
+        found = await self.model._default_manager.ain_bulk(keys)
+        return {key: found.get(key) for key in keys}
+
+
+class ReverseRelationLoader(ForeignKeyLoader):
+    '''Loads the list of ``model`` rows whose foreign key ``field_name`` points at each id.'''
+
+    def __init__(self, model, field_name):
+        super().__init__(model)
+        self.attname = model._meta.get_field(field_name).attname
+
+    async def fetch(self, keys):
+        rows = {key: [] for key in keys}
+        async for obj in self.model._default_manager.filter(**{f'{self.attname}__in': keys}):
+            rows[getattr(obj, self.attname)].append(obj)
+        return rows
+
+
+def get_loader(info, model, field_name=None):
+    '''
+    The request's loader for ``model``, or for the rows of ``model`` pointing
+    at an object through ``field_name``; without a context every call gets a fresh one.
+    '''
+    context = info.context
+    loaders = getattr(context, 'loaders', None)
+    if loaders is None:
+        loaders = {}
+        if context is not None:
+            context.loaders = loaders
+    key = (model, field_name)
+    if key not in loaders:
+        loaders[key] = ReverseRelationLoader(model, field_name) if field_name else ForeignKeyLoader(model)
+    return loaders[key]
+
+
+async def load_related(info, root, name):
+    '''The object behind foreign key ``name`` of ``root``, through the request's loader.'''
+    field = root._meta.get_field(name)
+    if field.is_cached(root):
+        return getattr(root, name)
+    return await get_loader(info, field.related_model).load(getattr(root, field.attname))
+
+
+def related_resolver(name):
+    '''A field resolver for foreign key ``name`` that goes through the loader.'''
+
+    async def resolve(root, info):
+        return await load_related(info, root, name)
+
+    return resolve
+
+
+def reverse_resolver(model, field_name):
+    '''A field resolver for the ``model`` rows whose foreign key ``field_name`` points at the parent.'''
+
+    async def resolve(root, info):
+        return await get_loader(info, model, field_name).load(root.pk)
+
+    return resolve
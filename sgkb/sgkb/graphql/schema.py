@@ -4,10 +4,15 @@ The root GraphQL schema.
 
 __all__ = (
     'SCHEMA',
+    'cost_analyzer',
 )
 
+from django.conf import settings
 from graphene import Schema
 
+from finance.graphql.query import ROW_ESTIMATORS
+
+from .cost import CostAnalyzer
 from .mutation import Mutation
 from .query import Query
 
@@ -15,3 +20,9 @@ schema = Schema(
     query=Query,
     # mutation=Mutation,
 )
+
+cost_analyzer = CostAnalyzer(
+    schema,
+    row_estimators=ROW_ESTIMATORS,
+    default_list_size=settings.GRAPHQL_DEFAULT_LIST_SIZE,
+)
@@ -0,0 +1,311 @@
+'''
+Asynchronous GraphQL view with a document cache, persisted queries and batching.
+
+Operations are executed with graphql-core's async executor, so resolvers
+may be coroutines that await Django's async ORM. Under ASGI the view runs on
+the server's event loop and one process keeps serving other clients while
+queries are in flight; under WSGI Django runs it in an event loop per request.
+
+Parsed and validated documents are kept in a bounded LRU cache keyed by the
+SHA-256 of the query text, so the dashboard's fixed queries are parsed and
+validated once per process. Clients may also send only that hash in
+``extensions.persistedQuery`` (the Apollo "automatic persisted queries"
+protocol): an unknown hash is answered with ``PersistedQueryNotFound``,
+after which the client resends the query together with its hash once.
+'''
+
+__all__ = (
+    'CachedGraphQLView',
+    'DocumentCache',
+)
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Manager, QuerySet
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import ensure_csrf_cookie
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
+from graphql import ExecutionResult, GraphQLError, OperationType, execute, get_operation_ast, parse, validate, validate_schema
+
+from .schema import cost_analyzer
+
+PERSISTED_QUERY_PREFIX = 'graphql:persisted:'
+
+
+class DocumentCache:
+    '''Thread-safe LRU of (document, validation errors) pairs.'''
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+document_cache = DocumentCache(settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+def _persisted_query_error(message, code):
+    return ExecutionResult(errors=[GraphQLError(message, extensions={'code': code})])
+
+
+def evaluate_querysets(next, root, info, **args):
+    '''
+    Middleware for resolvers that are still synchronous, such as
+    graphene-django's reverse-relation lists: querysets they return are
+    evaluated through the async ORM instead of on the event loop.
+    '''
+    result = next(root, info, **args)
+    if isinstance(result, Manager):
+        result = result.all()
+    if isinstance(result, QuerySet):
+        return sync_to_async(list)(result)
+    return result
+
+
+class CachedGraphQLView(GraphQLView):
+    '''
+    Also accepts a JSON array of operations in one request (as sent by
+    Apollo's batch link); they run concurrently and are answered with an
+    array of results.
+    '''
+
+    # dispatch() is a coroutine, so Django awaits this view instead of running it in a thread
+    view_is_async = True
+
+    @method_decorator(ensure_csrf_cookie)
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            if request.method.lower() not in ('get', 'post'):
+                raise HttpError(
+                    HttpResponseNotAllowed(['GET', 'POST'], 'GraphQL only supports GET and POST requests.')
+                )
+
+            data = self.parse_body(request)
+            show_graphiql = self.graphiql and self.can_display_graphiql(request, data)
+
+            if show_graphiql:
+                return self.render_graphiql(
+                    request,
+                    # Dependency parameters.
+                    whatwg_fetch_version=self.whatwg_fetch_version,
+                    whatwg_fetch_sri=self.whatwg_fetch_sri,
+                    react_version=self.react_version,
+                    react_sri=self.react_sri,
+                    react_dom_sri=self.react_dom_sri,
+                    graphiql_version=self.graphiql_version,
+                    graphiql_sri=self.graphiql_sri,
+                    graphiql_css_sri=self.graphiql_css_sri,
+                    subscriptions_transport_ws_version=self.subscriptions_transport_ws_version,
+                    subscriptions_transport_ws_sri=self.subscriptions_transport_ws_sri,
+                    graphiql_plugin_explorer_version=self.graphiql_plugin_explorer_version,
+                    graphiql_plugin_explorer_sri=self.graphiql_plugin_explorer_sri,
+                    graphiql_plugin_explorer_css_sri=self.graphiql_plugin_explorer_css_sri,
+                    # The SUBSCRIPTION_PATH setting.
+                    subscription_path=self.subscription_path,
+                    # GraphiQL headers tab,
+                    graphiql_header_editor_enabled=graphene_settings.GRAPHIQL_HEADER_EDITOR_ENABLED,
+                    graphiql_should_persist_headers=graphene_settings.GRAPHIQL_SHOULD_PERSIST_HEADERS,
+                    graphiql_input_value_deprecation=graphene_settings.GRAPHIQL_INPUT_VALUE_DEPRECATION,
+                )
+
+            if self.batch:
+                responses = await asyncio.gather(*(self.get_response(request, entry) for entry in data))
+                result = '[{}]'.format(','.join(response[0] for response in responses))
+                status_code = max(status for _, status in responses)
+            else:
+                result, status_code = await self.get_response(request, data, show_graphiql)
+
+            return HttpResponse(status=status_code, content=result, content_type='application/json')
+
+        except HttpError as e:
+            response = e.response
+            response['Content-Type'] = 'application/json'
+            response.content = self.json_encode(request, {'errors': [self.format_error(e)]})
+            return response
+
+    async def get_response(self, request, data, show_graphiql=False):
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+
+        execution_result = await self.execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+        if not execution_result:
+            return None, 200
+
+        status_code = 200
+        response = {}
+        if execution_result.errors:
+            response['errors'] = [self.format_error(e) for e in execution_result.errors]
+
+        if execution_result.errors and any(not getattr(e, 'path', None) for e in execution_result.errors):
+            status_code = 400
+        else:
+            response['data'] = execution_result.data
+
+        if execution_result.extensions:
+            response['extensions'] = execution_result.extensions
+
+        if self.batch:
+            response['id'] = id
+            response['status'] = status_code
+
+        return self.json_encode(request, response, pretty=show_graphiql), status_code
+
+    def get_middleware(self, request):
+        return [*(super().get_middleware(request) or ()), evaluate_querysets]
+
+    def parse_body(self, request):
+        # as_view() builds a view instance per request, so switching to batch mode here is safe
+        if self.get_content_type(request) == 'application/json' and request.body.lstrip()[:1] == b'[':
+            self.batch = True
+        data = super().parse_body(request)
+        if self.batch and len(data) > settings.GRAPHQL_MAX_BATCH_SIZE:
+            raise HttpError(HttpResponseBadRequest(
+                f'Batches are limited to {settings.GRAPHQL_MAX_BATCH_SIZE} operations.'
+            ))
+        return data
+
+    def get_persisted_hash(self, request, data):
+        extensions = request.GET.get('extensions') or data.get('extensions') or {}
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                raise HttpError(HttpResponseBadRequest('Extensions are invalid JSON.'))
+        return (extensions.get('persistedQuery') or {}).get('sha256Hash')
+
+    async def resolve_query(self, request, data, query):
+        '''(query, hash, error): looks up or registers a persisted query.'''
+        sha256 = self.get_persisted_hash(request, data)
+        if sha256 is None:
+            return query, query and query_hash(query), None
+        if not query:
+            query = await cache.aget(PERSISTED_QUERY_PREFIX + sha256)
+            if query is None:
+                return None, None, _persisted_query_error('PersistedQueryNotFound', 'PERSISTED_QUERY_NOT_FOUND')
+            return query, sha256, None
+        if query_hash(query) != sha256:
+            return None, None, _persisted_query_error('provided sha does not match query', 'INVALID_PERSISTED_QUERY')
+        await cache.aset(PERSISTED_QUERY_PREFIX + sha256, query, settings.GRAPHQL_PERSISTED_QUERY_TIMEOUT)
+        return query, sha256, None
+
+    def parse_and_validate(self, query, sha256):
+        '''The parsed document and its validation errors, from the cache when possible.'''
+        key = (sha256, tuple(self.validation_rules or ()))
+        entry = document_cache.get(key)
+        if entry is None:
+            document = parse(query)
+            errors = validate(
+                self.schema.graphql_schema,
+                document,
+                self.validation_rules,
+                graphene_settings.MAX_VALIDATION_ERRORS,
+            )
+            entry = (document, errors)
+            document_cache.set(key, entry)
+        return entry
+
+    def check_cost(self, document, operation_name, variables):
+        '''
+        The response extensions reporting the operation's estimated cost;
+        raises for operations over GRAPHQL_MAX_COST. Row estimators may query
+        the database, so this runs through ``sync_to_async``.
+        '''
+        cost = cost_analyzer.estimate(document, operation_name, variables)
+        cost_analyzer.check(cost, settings.GRAPHQL_MAX_COST)
+        return {'cost': {'estimated': cost, 'budget': settings.GRAPHQL_MAX_COST}}
+
+    async def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        query, sha256, error = await self.resolve_query(request, data, query)
+        if error:
+            return error
+
+        if not query:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest('Must provide query string.'))
+
+        schema = self.schema.graphql_schema
+
+        schema_validation_errors = validate_schema(schema)
+        if schema_validation_errors:
+            return ExecutionResult(data=None, errors=schema_validation_errors)
+
+        try:
+            document, validation_errors = self.parse_and_validate(query, sha256)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+        operation_ast = get_operation_ast(document, operation_name)
+
+        if (
+            request.method.lower() == 'get'
+            and operation_ast is not None
+            and operation_ast.operation != OperationType.QUERY
+        ):
+            if show_graphiql:
+                return None
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ['POST'],
+                    f'Can only perform a {operation_ast.operation.value} operation from a POST request.',
+                )
+            )
+
+        if validation_errors:
+            return ExecutionResult(data=None, errors=validation_errors)
+
+        try:
+            extensions = await sync_to_async(self.check_cost)(document, operation_name, variables)
+        except GraphQLError as e:
+            return ExecutionResult(errors=[e])
+
+        # Mutations are not mounted; Django runs async views outside ATOMIC_REQUESTS anyway
+        try:
+            execute_options = {
+                'root_value': self.get_root_value(request),
+                'context_value': self.get_context(request),
+                'variable_values': variables,
+                'operation_name': operation_name,
+                'middleware': self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                execute_options['execution_context_class'] = self.execution_context_class
+
+            result = execute(schema, document, **execute_options)
+            if isawaitable(result):
+                result = await result
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+        result.extensions = extensions
+        return result
@@ -108,6 +108,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'sgkb.wsgi.application'
 
+# Served by an ASGI server (uvicorn sgkb.asgi:application) so GraphQL runs on the event loop
+ASGI_APPLICATION = 'sgkb.asgi.application'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -184,6 +187,41 @@ CELERY_TIMEZONE = "UTC"
 LOGO_API_KEY = os.environ.get("LOGO_DEV_API_KEY")
 
 
+# Uploaded transaction exports are spooled here before the Celery import picks them up
+IMPORT_SPOOL_DIR = os.environ.get("IMPORT_SPOOL_DIR", BASE_DIR / "var" / "imports")
+
+# Excel exports above this many rows are written by a Celery job into EXPORT_DIR
+EXPORT_DIR = os.environ.get("EXPORT_DIR", BASE_DIR / "var" / "exports")
+EXCEL_EXPORT_SYNC_LIMIT = int(os.environ.get("EXCEL_EXPORT_SYNC_LIMIT", 50_000))
+
+# Parsed and validated GraphQL documents kept per process, and how long
+# persisted query texts stay in the cache (seconds, None = until evicted)
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 256))
+GRAPHQL_PERSISTED_QUERY_TIMEOUT = None
+
+# Operations whose estimated cost (rows x selected fields) exceeds this are rejected;
+# lists without a row estimator are assumed to hold GRAPHQL_DEFAULT_LIST_SIZE rows
+GRAPHQL_MAX_COST = int(os.environ.get("GRAPHQL_MAX_COST", 500_000))
+GRAPHQL_DEFAULT_LIST_SIZE = 100
+
+# Operations accepted in one batched (JSON array) GraphQL request
+GRAPHQL_MAX_BATCH_SIZE = int(os.environ.get("GRAPHQL_MAX_BATCH_SIZE", 20))
+
+# Shared cache for aggregate results and persisted queries; Redis when
+# CACHE_REDIS_URL is set, otherwise a per-process memory cache
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_REDIS_URL}
+        if CACHE_REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    ),
+}
+
+# Cached aggregates are invalidated by a data-version bump; this only bounds their lifetime
+AGGREGATE_CACHE_TIMEOUT = int(os.environ.get("AGGREGATE_CACHE_TIMEOUT", 24 * 60 * 60))
+
+
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 
 # CORS settings
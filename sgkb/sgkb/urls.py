@@ -16,11 +16,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from graphene_django.views import GraphQLView
 from django.views.decorators.csrf import csrf_exempt
+from sgkb.graphql.view import CachedGraphQLView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('finance.urls')),
-    path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path("graphql/", csrf_exempt(CachedGraphQLView.as_view(graphiql=True))),
 ]